@@ -0,0 +1,65 @@
+"""Benchmarks loading many saved configurations, as a worker serving many institutions does at boot.
+
+The Alma test configuration is saved under CONFIGURATION_COUNT names, both as a JSON file of
+get_configuration() dicts (loaded with json.load and SRUConfiguration(from_dict)) and as a
+ConfigurationBundle. The 'all' column loads every configuration (with ConfigurationBundle.load_all
+for the bundle); 'one' opens the file and loads a single configuration, which is all a bundle has
+to decode.
+
+Run from the root of the repository:
+    python -m benchmarks.bench_configuration_snapshot
+"""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+
+from src.sru_queryer._base._configuration_snapshot import ConfigurationBundle
+from src.sru_queryer._base._sru_configuration import SRUConfiguration
+from tests.testData.test_data import get_alma_sru_configuration
+
+CONFIGURATION_COUNT = 600
+REPEATS = 5
+
+def best_time(load) -> float:
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        load()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    configuration = get_alma_sru_configuration()
+    names = [f"institution{i}" for i in range(CONFIGURATION_COUNT)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "configurations.json")
+        with open(json_path, "w") as f:
+            json.dump({name: configuration.to_dict() for name in names}, f)
+        bundle_path = os.path.join(directory, "configurations.bundle")
+        ConfigurationBundle.save(bundle_path, {name: configuration for name in names})
+
+        def load_json(loaded_names):
+            with open(json_path, "r") as f:
+                saved = json.load(f)
+            return [SRUConfiguration(saved[name]) for name in loaded_names]
+
+        def load_bundle(loaded_names):
+            with ConfigurationBundle(bundle_path) as bundle:
+                if loaded_names is names:
+                    return list(bundle.load_all().values())
+                return [bundle[name] for name in loaded_names]
+
+        print(f"{CONFIGURATION_COUNT} configurations: JSON {os.path.getsize(json_path) / 1024:.0f}KiB, bundle {os.path.getsize(bundle_path) / 1024:.0f}KiB")
+        print(f"{'format':>8} {'all':>11} {'one':>11}")
+        for label, load in [("json", load_json), ("bundle", load_bundle)]:
+            all_time = best_time(lambda: load(names))
+            one_time = best_time(lambda: load(names[:1]))
+            print(f"{label:>8} {all_time * 1000:>9.1f}ms {one_time * 1000:>9.1f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Benchmarks SRUExplainAutoParser on explainResponses with many indexes.
+
+The indexes of tests/testData/loc_explain_response.xml are repeated (with unique names) to build
+explainResponses of increasing size. Each is parsed with the current parser, with the current
+parser but scanning keys on every lookup instead of using PropertyPathResolver, and with a copy of
+the previous implementation that re-scanned every index for sort information once per index.
+
+The 'xmltodict + current' and 'stream' columns compare the whole job - from the XML to the
+configuration - with the default backend and with SRUExplainStreamParser, along with the peak
+memory each allocates while doing it.
+
+Run from the root of the repository:
+    python -m benchmarks.bench_explain_parser
+"""
+from __future__ import annotations
+
+import re
+import time
+import tracemalloc
+
+import xmltodict
+
+from src.sru_queryer._base._sru_explain_auto_parser import SRUExplainAutoParser, generic_driver
+from src.sru_queryer._base._sru_explain_stream_parser import SRUExplainStreamParser
+from tests.testData.test_data import TestFiles
+
+INDEX_COUNTS = [13, 500, 1000, 2000, 4000]
+REPEATS = 3
+
+class ScanningPropertyPathResolver():
+    find_property_value = staticmethod(SRUExplainAutoParser._find_property_value)
+
+class ScanningSRUExplainAutoParser(SRUExplainAutoParser):
+    """The current parser, but scanning every key on every lookup."""
+
+    def __init__(self, sru_explain_dict: dict):
+        super().__init__(sru_explain_dict)
+        self._resolver = ScanningPropertyPathResolver()
+
+class QuadraticSRUExplainAutoParser(ScanningSRUExplainAutoParser):
+    """The index parsing from before the single-pass rewrite, kept for comparison."""
+
+    def _parse_context_set_and_index_info(self):
+        index_information = self._find_property_value(self.sru_explain_dict, generic_driver["index"]["location"])
+        self.sru_config.available_context_sets_and_indexes = {}
+        for index in index_information:
+            id = self._find_property_value(index, generic_driver["index"]["idLocation"])
+            title = self._find_property_value(index, generic_driver["index"]["titleLocation"])
+            empty_term_supported, supported_relations = self._get_supported_relations_for_index(index)
+
+            sortable = None
+            if self._evaluate_if_sort_info_included_in_index_info():
+                sortable = self._find_property_value(index, generic_driver["index"]["sortLocation"]) == "true"
+
+            context_sets_that_include_this_index = self._find_property_value(index, ["map"])
+            if isinstance(context_sets_that_include_this_index, dict):
+                context_sets_that_include_this_index = [context_sets_that_include_this_index]
+
+            for context_set in context_sets_that_include_this_index:
+                name = self._remove_set_from_index_name(self._find_property_value(context_set, ["name", "#text"]))
+                set = self._find_property_value(context_set, ["name", "@set"])
+                if set not in self.sru_config.available_context_sets_and_indexes:
+                    self.sru_config.available_context_sets_and_indexes[set] = {}
+                index_config = self._generate_index_config(title, id=id, sort=sortable, supported_relations=supported_relations, empty_term_supported=empty_term_supported)
+                self.sru_config.available_context_sets_and_indexes[set][name] = index_config
+
+    def _evaluate_if_sort_info_included_in_index_info(self) -> bool:
+        for index in self._find_property_value(self.sru_explain_dict, generic_driver["index"]["location"]):
+            if self._find_property_value(index, generic_driver["index"]["sortLocation"]) != None:
+                return True
+        return False
+
+def build_explain_response(loc_explain_response: str, index_count: int) -> str:
+    """Repeats the LOC indexes until there are index_count of them."""
+    indexes = re.findall(r"<index\b.*?</index>", loc_explain_response, re.DOTALL)
+    generated_indexes = []
+    for i in range(index_count):
+        index = indexes[i % len(indexes)]
+        if i >= len(indexes):
+            index = re.sub(r"(<name set=\"[^\"]+\">)([^<]+)", rf"\g<1>\g<2>{i}", index)
+        generated_indexes.append(index)
+
+    start = loc_explain_response.index(indexes[0])
+    end = loc_explain_response.index(indexes[-1]) + len(indexes[-1])
+    return loc_explain_response[:start] + "\n".join(generated_indexes) + loc_explain_response[end:]
+
+def time_parser(parser_class: type[SRUExplainAutoParser], explain_dict: dict) -> float:
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        parser_class(explain_dict).get_sru_configuration_from_explain_response()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def parse_with_xmltodict(explain_response: bytes):
+    SRUExplainAutoParser(xmltodict.parse(explain_response)).get_sru_configuration_from_explain_response()
+
+def parse_with_stream_parser(explain_response: bytes):
+    SRUExplainStreamParser(explain_response).get_sru_configuration_from_explain_response()
+
+def time_backend(parse, explain_response: bytes) -> tuple[float, int]:
+    """Returns the best time and the peak memory allocated of parsing the explainResponse with a backend."""
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        parse(explain_response)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    parse(explain_response)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+def main():
+    with open(TestFiles.explain_response_loc, "r") as f:
+        loc_explain_response = f.read()
+
+    print(f"{'indexes':>8} {'xmltodict':>11} {'current':>11} {'scanning':>11} {'quadratic':>11} {'xmltodict + current':>25} {'stream':>25}")
+    for index_count in INDEX_COUNTS:
+        explain_response = build_explain_response(loc_explain_response, index_count)
+
+        start = time.perf_counter()
+        explain_dict = xmltodict.parse(explain_response)
+        decode_time = time.perf_counter() - start
+
+        current_time = time_parser(SRUExplainAutoParser, explain_dict)
+        scanning_time = time_parser(ScanningSRUExplainAutoParser, explain_dict)
+        quadratic_time = time_parser(QuadraticSRUExplainAutoParser, explain_dict)
+
+        explain_response_bytes = explain_response.encode("utf-8")
+        dict_backend_time, dict_backend_peak = time_backend(parse_with_xmltodict, explain_response_bytes)
+        stream_backend_time, stream_backend_peak = time_backend(parse_with_stream_parser, explain_response_bytes)
+
+        print(f"{index_count:>8} {decode_time * 1000:>9.1f}ms {current_time * 1000:>9.1f}ms {scanning_time * 1000:>9.1f}ms {quadratic_time * 1000:>9.1f}ms"
+              f" {dict_backend_time * 1000:>9.1f}ms {dict_backend_peak / 1024:>9.0f}KiB peak {stream_backend_time * 1000:>9.1f}ms {stream_backend_peak / 1024:>9.0f}KiB peak")
+
+if __name__ == "__main__":
+    main()
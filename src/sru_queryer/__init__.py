@@ -1,4 +1,5 @@
 from ._base._sru_queryer import SRUQueryer
+from ._base._async_sru_queryer import AsyncSRUQueryer
 from ._base._search_clause import SearchClause
 
-__all__ = ["SRUQueryer", "SearchClause"]
\ No newline at end of file
+__all__ = ["SRUQueryer", "AsyncSRUQueryer", "SearchClause"]
\ No newline at end of file
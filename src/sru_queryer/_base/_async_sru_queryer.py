@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from requests import Request
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from ._sru_aux_formatter import SRUAuxiliaryFormatter
+from ._sru_configuration import SRUConfiguration
+from ._index_catalog import IndexCatalog
+from ._explain_cache import ExplainCache
+from ._search_clause import SearchClause
+from ._raw_cql import RawCQL
+from ._cql_boolean_operators import CQLBooleanOperatorBase
+from ._sort_key import SortKey
+from ._search_retrieve import SearchRetrieve
+from ._sru_queryer import SRUQueryer
+from ._single_flight import AsyncSingleFlight
+from ._rate_limiter import RateLimiter
+
+class AsyncSRUQueryer():
+    """An asyncio version of SRUQueryer.
+
+    It builds, validates, and formats queries exactly like SRUQueryer, but sends the explain and
+    searchRetrieve requests with aiohttp. All requests share one connection pool, and at most
+    max_concurrency requests are in flight at a time.
+
+    Because the explain request is asynchronous, it is sent by load_configuration() rather than the
+    constructor. The usual way to create a queryer is:\n
+        async with AsyncSRUQueryer("https://path-to-sru-server-base") as queryer:\n
+            response_content = await queryer.search_retrieve(SearchClause("alma", "title", "=", "Frog"))\n
+
+    Cancelling a task that is awaiting a request aborts the request and releases its connection.
+
+    If coalesce_requests is True, tasks that send the same searchRetrieve request while it's
+    already in flight await it and share its response (or exception) instead of sending it again.
+    The request is only aborted once every task awaiting it has been cancelled.
+
+    If rate_limiter is set, requests wait for it (with asyncio.sleep) before taking one of the
+    max_concurrency slots.
+
+    Requires the 'async' extra: pip install sru-queryer[async]"""
+
+    def __init__(self, server_url: str = None, sru_version: str = None, username: str | None = None, password: str | None = None, default_cql_context_set: str | None = None, default_cql_index: str | None = None, default_cql_relation: str | None = None, disable_validation_for_cql_defaults: bool = False, max_records_supported: int | None = None, default_records_returned: int | None = None , default_record_schema: str | None = None, default_sort_schema: str | None = None, from_dict: dict | None = None, max_concurrency: int = 10, pool_maxsize: int = 10, pool_limit: int = 100, keep_alive: bool = True, explain_cache: ExplainCache | None = None, explain_parser: str = "xmltodict", compact_configuration: bool = False, coalesce_requests: bool = False, rate_limiter: RateLimiter | None = None):
+        if aiohttp is None:
+            raise ImportError("AsyncSRUQueryer requires aiohttp. Install it with 'pip install sru-queryer[async]'.")
+        if explain_parser not in SRUQueryer.explain_parsers:
+            raise ValueError(f"Explain parser {explain_parser} is not supported. Use one of: {", ".join(SRUQueryer.explain_parsers)}")
+
+        self.sru_configuration: SRUConfiguration | None = None
+        if from_dict:
+            self.sru_configuration = SRUConfiguration(from_dict)
+            if compact_configuration:
+                self.sru_configuration.compact()
+
+        self._user_settings = {
+            "server_url": server_url,
+            "username": username,
+            "password": password,
+            "default_cql_context_set": default_cql_context_set,
+            "default_cql_index": default_cql_index,
+            "default_cql_relation": default_cql_relation,
+            "disable_validation_for_cql_defaults": disable_validation_for_cql_defaults,
+            "max_records_supported": max_records_supported,
+            "default_records_returned": default_records_returned,
+            "default_record_schema": default_record_schema,
+            "default_sort_schema": default_sort_schema
+        }
+        self._sru_version = sru_version
+        self._explain_cache = explain_cache
+        self._explain_parser = explain_parser
+        self._compact_configuration = compact_configuration
+
+        self._max_concurrency = max_concurrency
+        self._pool_maxsize = pool_maxsize
+        self._pool_limit = pool_limit
+        self._keep_alive = keep_alive
+        self._session: aiohttp.ClientSession | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._load_lock: asyncio.Lock | None = None
+        self._single_flight = AsyncSingleFlight() if coalesce_requests else None
+        self.rate_limiter = rate_limiter
+
+    @classmethod
+    async def create(cls, *args, **kwargs) -> AsyncSRUQueryer:
+        """Creates an AsyncSRUQueryer and loads its configuration from the SRU server.
+
+        Takes the same arguments as the constructor."""
+        queryer = cls(*args, **kwargs)
+        await queryer.load_configuration()
+        return queryer
+
+    async def load_configuration(self) -> SRUConfiguration:
+        """Retrieves and parses the explainResponse, unless the configuration is already loaded.
+
+        Tasks that call it while the explainResponse is being loaded wait for it rather than
+        sending the explain request again. The explainResponse is parsed, and the explain cache
+        read and written, in a worker thread, so they don't block the event loop.
+
+        Raises ExplainResponseContentTypeException, NoExplainResponseException, ExplainResponseParserException, or PermissionError"""
+        if self.sru_configuration:
+            return self.sru_configuration
+
+        # Created on first use, so it is bound to the running event loop
+        if self._load_lock is None:
+            self._load_lock = asyncio.Lock()
+        async with self._load_lock:
+            if not self.sru_configuration:
+                self.sru_configuration = await self._load_configuration()
+        return self.sru_configuration
+
+    async def _load_configuration(self) -> SRUConfiguration:
+        sru_version_to_use = SRUQueryer._resolve_sru_version(self._sru_version)
+        formatted_explain_query = SRUAuxiliaryFormatter.format_base_explain_query(self._user_settings["server_url"], sru_version_to_use)
+
+        configuration = None
+        if self._explain_cache:
+            configuration = await asyncio.to_thread(self._explain_cache.get, self._user_settings["server_url"], sru_version_to_use)
+
+        if configuration is None:
+            explain_response_xml: bytes = None
+            try:
+                explain_response_xml = await self._get_request_contents(formatted_explain_query, self._user_settings["username"], self._user_settings["password"])
+                configuration = await asyncio.to_thread(SRUQueryer._parse_explain_response_content, explain_response_xml, self._explain_parser)
+            except Exception as e:
+                raise SRUQueryer._convert_explain_exception(e, explain_response_xml)
+
+            if self._explain_cache:
+                await asyncio.to_thread(SRUQueryer._store_in_explain_cache, self._explain_cache, self._user_settings["server_url"], sru_version_to_use, configuration)
+
+        configuration = SRUQueryer._merge_user_settings(configuration, self._sru_version, sru_version_to_use, **self._user_settings)
+        if self._compact_configuration:
+            configuration.compact()
+        return configuration
+
+    async def search_retrieve(self, cql_query: SearchClause | CQLBooleanOperatorBase | RawCQL | None = None, start_record: int | None = None, maximum_records: int | None = None, record_schema: str | None = None, sort_queries: list[dict] | list[SortKey] | None = None, record_packing: str | None = None, validate: bool = True, from_dict: dict | None = None) -> bytes:
+        """Conducts a searchRetrieve request and returns the response.
+
+        This will throw ValueErrors for any incorrect portion of the query.
+
+        This function does not handle any errors in the searchRetrieveResponse."""
+        await self.load_configuration()
+        request = self.construct_search_retrieve_request(cql_query, start_record, maximum_records, record_schema, sort_queries, record_packing, validate, from_dict)
+        if self._single_flight is not None:
+            return await self._single_flight.do(request.url, lambda: self._fetch_search_retrieve(request))
+        return await self._fetch_search_retrieve(request)
+
+    def construct_search_retrieve_request(self, cql_query: SearchClause | CQLBooleanOperatorBase | RawCQL | None = None, start_record: int | None = None, maximum_records: int | None = None, record_schema: str | None = None, sort_queries: list[dict] | list[SortKey] | None = None, record_packing: str | None = None, validate: bool = True, from_dict: dict | None = None) -> Request:
+        """Construct a requests.Request object. The configuration must already be loaded."""
+        if not self.sru_configuration:
+            raise RuntimeError("The SRU configuration has not been loaded. Call 'await load_configuration()' first.")
+        query = SearchRetrieve(self.sru_configuration, cql_query, start_record, maximum_records, record_schema, sort_queries, record_packing, from_dict)
+        if validate:
+            query.validate()
+        return query.construct_request()
+
+    def get_configuration(self):
+        """Returns the configuration as a dict, which can be passed back in as from_dict.
+
+        For a compact configuration, this is a copy with the indexes turned back into dicts.
+        Otherwise, it's the configuration's own __dict__, so changes to it change the queryer."""
+        configuration = self.sru_configuration
+        if isinstance(configuration.available_context_sets_and_indexes, IndexCatalog):
+            return configuration.to_dict()
+        return configuration.__dict__
+
+    async def close(self):
+        """Closes the pooled connections held by this queryer."""
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        await self.load_configuration()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Creates the session on first use, so it is bound to the running event loop."""
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self._pool_limit, limit_per_host=self._pool_maxsize, force_close=not self._keep_alive)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self._session
+
+    async def _fetch_search_retrieve(self, request: Request) -> bytes:
+        logging.info(f"Querying {request.url}")
+        return await self._fetch(request.url, request.headers)
+
+    async def _fetch(self, url: str, headers: dict) -> bytes:
+        """Sends a GET request over the pooled session and returns the response contents."""
+        _, content = await self._send(url, headers)
+        return content
+
+    async def _get_request_contents(self, url: str, username: str | None, password: str | None) -> bytes:
+        headers = {}
+        if username and password:
+            headers["Authorization"] = SRUAuxiliaryFormatter.format_basic_access_authentication_header_payload(username, password)
+
+        status, content = await self._send(url, headers)
+        if status == 401 or status == 403:
+            logging.exception(f"You are not authorized to access this SRU Explain server ({url})")
+            raise PermissionError(
+                "You are not authorized to access this SRU Explain server")
+        return content
+
+    async def _send(self, url: str, headers: dict) -> tuple[int, bytes]:
+        """Sends a GET request over the pooled session, within the concurrency limit and the rate
+        limiter, and returns the response's status and contents."""
+        session = self._get_session()
+        # Wait for the rate limiter first, so tasks that are only waiting for their turn don't
+        # hold concurrency slots that other requests could use
+        await self._wait_for_rate_limiter()
+        async with self._semaphore:
+            async with session.get(url, headers=headers) as response:
+                self._record_response(response)
+                return response.status, await response.read()
+
+    async def _wait_for_rate_limiter(self):
+        if self.rate_limiter is not None:
+            delay = self.rate_limiter.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    def _record_response(self, response: aiohttp.ClientResponse):
+        if self.rate_limiter is not None:
+            self.rate_limiter.record_response(response.status, response.headers.get("Retry-After"))
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+from ._exceptions import CircuitOpenException
+
+class CircuitBreaker():
+    """Stops requests from being sent to an SRU server that appears to be down, so that callers fail
+    fast instead of each waiting for it to time out.
+
+    The breaker starts "closed", letting every request through. After failure_threshold
+    consecutive failures (a connection error, a timeout, or a response with one of
+    failure_status_codes), it "opens": every request then raises CircuitOpenException without
+    being sent. After recovery_timeout seconds, it's "half-open": up to half_open_max_calls trial
+    requests are let through, and the first one to succeed closes the breaker again, while a
+    failure opens it for another recovery_timeout seconds.
+
+    Share one CircuitBreaker between every SRUQueryer (and thread) that sends requests to the same
+    server. 'opened' counts the times the breaker has opened, and 'rejected' the requests it has
+    refused."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30, half_open_max_calls: int = 1, failure_status_codes: tuple[int, ...] = (500, 502, 503, 504)):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1.")
+        if half_open_max_calls < 1:
+            raise ValueError("half_open_max_calls must be at least 1.")
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.failure_status_codes = failure_status_codes
+        self.opened = 0
+        self.rejected = 0
+
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """"closed", "open", or "half_open"."""
+        with self._lock:
+            return self._get_state(time.monotonic())
+
+    def before_request(self, url: str):
+        """Called before a request is sent. Raises CircuitOpenException if the breaker won't let it through."""
+        with self._lock:
+            now = time.monotonic()
+            state = self._get_state(now)
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._state = self.HALF_OPEN
+                self._half_open_calls += 1
+                return
+            self.rejected += 1
+            retry_in = max(self._opened_at + self.recovery_timeout - now, 0)
+        raise CircuitOpenException(f"The SRU server is unavailable after {self.failure_threshold} consecutive failures. Not sending the request (the next attempt is allowed in {retry_in:.1f} seconds).", url)
+
+    def record_response(self, status_code: int):
+        """Records a response from the server, which is a failure if its status is in failure_status_codes."""
+        if status_code in self.failure_status_codes:
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def record_success(self):
+        with self._lock:
+            if self._state != self.CLOSED:
+                logging.info("The SRU server has recovered. Closing the circuit breaker.")
+            self._state = self.CLOSED
+            self._consecutive_failures = 0
+            self._half_open_calls = 0
+
+    def record_failure(self):
+        with self._lock:
+            now = time.monotonic()
+            self._consecutive_failures += 1
+            if self._get_state(now) == self.HALF_OPEN or (self._state == self.CLOSED and self._consecutive_failures >= self.failure_threshold):
+                logging.warning(f"The SRU server failed {self._consecutive_failures} times in a row. Opening the circuit breaker for {self.recovery_timeout} seconds.")
+                self._state = self.OPEN
+                self._opened_at = now
+                self._half_open_calls = 0
+                self.opened += 1
+
+    def reset(self):
+        """Closes the breaker and forgets the failures."""
+        with self._lock:
+            self._state = self.CLOSED
+            self._consecutive_failures = 0
+            self._half_open_calls = 0
+
+    def _get_state(self, now: float) -> str:
+        if self._state == self.OPEN and now >= self._opened_at + self.recovery_timeout:
+            return self.HALF_OPEN
+        return self._state
+
+    def __repr__(self):
+        return f"CircuitBreaker(state={self.state!r}, opened={self.opened}, rejected={self.rejected})"
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import gc
+import marshal
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from collections.abc import Mapping
+from typing import Iterator
+
+from ._exceptions import ConfigurationSnapshotException
+from ._sru_configuration import SRUConfiguration
+
+# Bump SCHEMA_VERSION whenever the meaning of a stored value changes. Adding, removing, or renaming
+# an SRUConfiguration attribute changes the fields checksum instead, so it's rejected either way.
+MAGIC = b"SRUQCFG\x00"
+SCHEMA_VERSION = 1
+
+_KIND_SNAPSHOT = 1
+_KIND_BUNDLE = 2
+
+# magic, schema version, kind, marshal version, Python major and minor version, fields checksum,
+# number of entries, length and checksum of the entry table
+_HEADER = struct.Struct("<8sHBBBBIIQI")
+
+_FIELDS_CHECKSUM = zlib.crc32("\n".join(sorted(SRUConfiguration().__dict__)).encode("utf-8"))
+
+class ConfigurationBundle(Mapping):
+    """Many SRUConfigurations saved in one binary file, for processes that need to load a lot of
+    them quickly (for instance, a worker that serves hundreds of institutions).
+
+    The file is memory-mapped, and each configuration is only decoded (with marshal, which is much
+    faster than json) the first time it's looked up. Processes that open the same bundle share its
+    pages through the OS page cache, including workers forked after it was opened.
+
+    The header records the snapshot schema version, the SRUConfiguration fields, and the Python
+    and marshal versions the bundle was written with, and every entry has a CRC-32 checksum.
+    Opening a bundle written by an incompatible version, or reading a corrupt entry, raises
+    ConfigurationSnapshotException instead of returning a misread configuration. Snapshots are
+    meant to be rebuilt (from the SRU servers or saved dicts) when that happens, not migrated.
+
+    Use it like a read-only dict of names to SRUConfigurations. If compact is True, the
+    configurations are compacted (see SRUConfiguration.compact) as they're loaded."""
+
+    def __init__(self, path: str | os.PathLike, compact: bool = False):
+        self.path = path
+        self.compact = compact
+        self._mmap = None
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ConfigurationSnapshotException("The configuration bundle is empty.", path)
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._entries = _read_entry_table(self._mmap, _KIND_BUNDLE, path)
+        except BaseException:
+            self.close()
+            raise
+        self._configurations: dict[str, SRUConfiguration] = {}
+
+    @staticmethod
+    def save(path: str | os.PathLike, configurations: Mapping[str, SRUConfiguration]):
+        """Writes the configurations to a bundle, replacing any existing file.
+
+        The bundle is written to a temporary file which is then renamed over the path, so
+        processes that have the old bundle open can keep using it."""
+        _write_atomically(path, ConfigurationBundle.dumps(configurations))
+
+    @staticmethod
+    def dumps(configurations: Mapping[str, SRUConfiguration]) -> bytes:
+        """Returns the configurations as a bundle."""
+        return _dumps(_KIND_BUNDLE, configurations)
+
+    def __getitem__(self, name: str) -> SRUConfiguration:
+        configuration = self._configurations.get(name)
+        if configuration is None:
+            offset, length, checksum = self._entries[name]
+            if self._mmap is None:
+                raise ValueError("The configuration bundle is closed.")
+            configuration = _load_entry(self._mmap, offset, length, checksum, self.path, self.compact)
+            self._configurations[name] = configuration
+        return configuration
+
+    def load_all(self) -> dict[str, SRUConfiguration]:
+        """Loads every configuration in the bundle, returning them by name.
+
+        Decoding thousands of configurations creates millions of objects, which would otherwise set
+        off the cyclic garbage collector again and again (marshal's output has no cycles for it to
+        find), so it's paused while they're decoded."""
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return {name: self[name] for name in self._entries}
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def close(self):
+        """Unmaps the file. Configurations that were already loaded can still be used."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> ConfigurationBundle:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __repr__(self):
+        return f"ConfigurationBundle({self.path!r}, {len(self._entries)} configurations)"
+
+class ConfigurationSnapshot():
+    """Saves and loads a single SRUConfiguration in the binary format used by ConfigurationBundle."""
+
+    @staticmethod
+    def dumps(configuration: SRUConfiguration) -> bytes:
+        """Returns the configuration as a snapshot."""
+        return _dumps(_KIND_SNAPSHOT, {"": configuration})
+
+    @staticmethod
+    def loads(snapshot: bytes, compact: bool = False) -> SRUConfiguration:
+        """Returns the configuration saved in a snapshot. Raises ConfigurationSnapshotException if it can't be loaded."""
+        return ConfigurationSnapshot._load(memoryview(snapshot), None, compact)
+
+    @staticmethod
+    def save(path: str | os.PathLike, configuration: SRUConfiguration):
+        """Writes the configuration to a snapshot file, replacing any existing file."""
+        _write_atomically(path, ConfigurationSnapshot.dumps(configuration))
+
+    @staticmethod
+    def load(path: str | os.PathLike, compact: bool = False) -> SRUConfiguration:
+        """Returns the configuration saved in a snapshot file. Raises ConfigurationSnapshotException if it can't be loaded."""
+        with open(path, "rb") as f:
+            snapshot = f.read()
+        return ConfigurationSnapshot._load(memoryview(snapshot), path, compact)
+
+    @staticmethod
+    def _load(buffer, path: str | os.PathLike | None, compact: bool) -> SRUConfiguration:
+        offset, length, checksum = _read_entry_table(buffer, _KIND_SNAPSHOT, path)[""]
+        return _load_entry(buffer, offset, length, checksum, path, compact)
+
+def _dumps(kind: int, configurations: Mapping[str, SRUConfiguration]) -> bytes:
+    payloads = [(name, marshal.dumps(configuration.to_dict())) for name, configuration in configurations.items()]
+
+    # Entry offsets are relative to the end of the entry table, so the table can be built first
+    entry_table = []
+    offset = 0
+    for name, payload in payloads:
+        entry_table.append((name, offset, len(payload), zlib.crc32(payload)))
+        offset += len(payload)
+    entry_table_bytes = marshal.dumps(entry_table)
+
+    header = _HEADER.pack(MAGIC, SCHEMA_VERSION, kind, marshal.version, sys.version_info.major, sys.version_info.minor,
+                          _FIELDS_CHECKSUM, len(payloads), len(entry_table_bytes), zlib.crc32(entry_table_bytes))
+    return b"".join([header, entry_table_bytes] + [payload for _, payload in payloads])
+
+def _read_entry_table(buffer, kind: int, path: str | os.PathLike | None) -> dict[str, tuple[int, int, int]]:
+    """Validates the header and returns the entries, with their absolute offsets, lengths, and checksums."""
+    if len(buffer) < _HEADER.size or buffer[:len(MAGIC)] != MAGIC:
+        raise ConfigurationSnapshotException("Not a configuration snapshot.", path)
+
+    magic, schema_version, snapshot_kind, marshal_version, python_major, python_minor, fields_checksum, entry_count, \
+        entry_table_length, entry_table_checksum = _HEADER.unpack_from(buffer)
+    if schema_version != SCHEMA_VERSION:
+        raise ConfigurationSnapshotException(f"The snapshot uses schema version {schema_version}, but this version of sru_queryer reads version {SCHEMA_VERSION}.", path)
+    if fields_checksum != _FIELDS_CHECKSUM:
+        raise ConfigurationSnapshotException("The snapshot was written for different SRUConfiguration fields.", path)
+    if (marshal_version, python_major, python_minor) != (marshal.version, sys.version_info.major, sys.version_info.minor):
+        raise ConfigurationSnapshotException(f"The snapshot was written by Python {python_major}.{python_minor} (marshal version {marshal_version}), which this interpreter can't safely read.", path)
+    if snapshot_kind != kind:
+        expected = "a snapshot" if kind == _KIND_SNAPSHOT else "a bundle"
+        raise ConfigurationSnapshotException(f"The file is not {expected}.", path)
+
+    entry_table_start = _HEADER.size
+    entry_table_end = entry_table_start + entry_table_length
+    entry_table_bytes = buffer[entry_table_start:entry_table_end]
+    if len(entry_table_bytes) != entry_table_length or zlib.crc32(entry_table_bytes) != entry_table_checksum:
+        raise ConfigurationSnapshotException("The snapshot's entry table is corrupt.", path)
+
+    entries = {name: (entry_table_end + offset, length, checksum) for name, offset, length, checksum in marshal.loads(entry_table_bytes)}
+    if len(entries) != entry_count:
+        raise ConfigurationSnapshotException("The snapshot's entry table is corrupt.", path)
+    return entries
+
+def _load_entry(buffer, offset: int, length: int, checksum: int, path: str | os.PathLike | None, compact: bool) -> SRUConfiguration:
+    payload = buffer[offset:offset + length]
+    if len(payload) != length or zlib.crc32(payload) != checksum:
+        raise ConfigurationSnapshotException("A configuration in the snapshot is corrupt.", path)
+
+    configuration = SRUConfiguration()
+    configuration.__dict__.update(marshal.loads(payload))
+    if compact:
+        configuration.compact()
+    return configuration
+
+def _write_atomically(path: str | os.PathLike, content: bytes):
+    directory = os.path.dirname(os.path.abspath(path))
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "wb") as f:
+            f.write(content)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import time
+
+from ._exceptions import DeadlineExceededException
+
+class Deadline():
+    """The time budget of one call, shared by every request (and retry) the call sends.
+
+    It starts when it's created. Each request's connect and read timeouts are cut down to the time
+    that's left, and once it has run out, DeadlineExceededException is raised instead of sending
+    anything else."""
+
+    def __init__(self, seconds: float):
+        if seconds <= 0:
+            raise ValueError("The deadline must be greater than 0.")
+        self.seconds = seconds
+        self.started_at = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def remaining(self) -> float:
+        return max(self.seconds - self.elapsed, 0)
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self, url: str | None = None):
+        """Raises DeadlineExceededException if the deadline has passed."""
+        if self.expired():
+            raise self.exceeded(url)
+
+    def exceeded(self, url: str | None = None) -> DeadlineExceededException:
+        elapsed = self.elapsed
+        return DeadlineExceededException(f"The deadline of {self.seconds} seconds was exceeded after {elapsed:.2f} seconds" + (f" while requesting {url}" if url else "") + ".", url, elapsed, self.seconds)
+
+    def limit_timeout(self, timeout: float | tuple[float | None, float | None] | None) -> float | tuple[float, float]:
+        """Returns a requests timeout (a number, or a (connect, read) tuple) cut down to the time that's left."""
+        remaining = self.remaining()
+        if timeout is None:
+            return remaining
+        if isinstance(timeout, tuple):
+            return tuple(remaining if part is None else min(part, remaining) for part in timeout)
+        return min(timeout, remaining)
+
+    def __repr__(self):
+        return f"Deadline({self.seconds}, remaining={self.remaining():.2f})"
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+class Endpoint():
+    """One base URL of an SRU server, and what has been observed about it.
+
+    'latency' is the moving average of the successful requests' response times (None until one
+    has succeeded), and 'error_rate' the moving average of failures (between 0 and 1)."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.latency: float | None = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+        self._error_rate_updated_at = 0.0
+
+    def __repr__(self):
+        latency = f"{self.latency:.3f}" if self.latency is not None else None
+        return f"Endpoint({self.url!r}, latency={latency}, error_rate={self.error_rate:.2f}, requests={self.requests})"
+
+class EndpointSelector():
+    """Chooses which of several equivalent base URLs of an SRU server (for instance, a primary and
+    its mirrors) each request is sent to.
+
+    Each endpoint's latency and error rate are tracked as exponentially weighted moving averages
+    (each new observation has a weight of 'smoothing'). Requests go to the healthy endpoint with the
+    lowest score, which is its average latency plus its error rate times error_penalty seconds.
+    Endpoints that haven't been used yet score 0, so each one is tried early on. Errors are
+    forgotten over time (the error rate halves every error_half_life seconds), so an endpoint that
+    failed a while ago gets another chance.
+
+    An endpoint that fails failure_threshold times in a row (a connection error, a timeout, or a
+    response with one of failure_status_codes) is unhealthy for cooldown seconds, and isn't chosen
+    unless every endpoint is unhealthy."""
+
+    def __init__(self, urls: list[str], smoothing: float = 0.3, error_penalty: float = 5, failure_threshold: int = 1, cooldown: float = 30, error_half_life: float = 60, failure_status_codes: tuple[int, ...] = (500, 502, 503, 504)):
+        if not urls:
+            raise ValueError("At least one endpoint is required.")
+        if len(set(urls)) != len(urls):
+            raise ValueError("The endpoints must be different.")
+        if not 0 < smoothing <= 1:
+            raise ValueError("smoothing must be greater than 0 and at most 1.")
+        self.endpoints = [Endpoint(url) for url in urls]
+        self.smoothing = smoothing
+        self.error_penalty = error_penalty
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.error_half_life = error_half_life
+        self.failure_status_codes = failure_status_codes
+        self._lock = threading.Lock()
+
+    def choose(self, exclude: list[Endpoint] | None = None) -> Endpoint | None:
+        """Returns the endpoint to send the next request to, ignoring any in 'exclude'. Returns None
+        if every endpoint is excluded."""
+        with self._lock:
+            now = time.monotonic()
+            candidates = [endpoint for endpoint in self.endpoints if not exclude or endpoint not in exclude]
+            if not candidates:
+                return None
+            healthy = [endpoint for endpoint in candidates if endpoint.unhealthy_until <= now]
+            if not healthy:
+                # Every endpoint is down, so try the one that has been resting longest
+                return min(candidates, key=lambda endpoint: endpoint.unhealthy_until)
+            # min() keeps the first of equal scores, so ties go to the endpoints given first
+            return min(healthy, key=lambda endpoint: self._get_score(endpoint, now))
+
+    def record(self, endpoint: Endpoint, latency: float, failed: bool):
+        """Records the outcome of a request sent to an endpoint, and how long it took."""
+        with self._lock:
+            now = time.monotonic()
+            endpoint.requests += 1
+            endpoint.error_rate = self._get_error_rate(endpoint, now) * (1 - self.smoothing) + (self.smoothing if failed else 0)
+            endpoint._error_rate_updated_at = now
+            if not failed:
+                endpoint.latency = latency if endpoint.latency is None else endpoint.latency * (1 - self.smoothing) + latency * self.smoothing
+                endpoint.consecutive_failures = 0
+                endpoint.unhealthy_until = 0.0
+                return
+
+            endpoint.failures += 1
+            endpoint.consecutive_failures += 1
+            if endpoint.consecutive_failures >= self.failure_threshold:
+                endpoint.unhealthy_until = now + self.cooldown
+                logging.warning(f"SRU endpoint {endpoint.url} failed {endpoint.consecutive_failures} times in a row. Not using it for {self.cooldown} seconds.")
+
+    def record_response(self, endpoint: Endpoint, latency: float, status_code: int):
+        """Records a response from an endpoint, which is a failure if its status is in failure_status_codes."""
+        self.record(endpoint, latency, self.is_failure_status(status_code))
+
+    def is_failure_status(self, status_code: int) -> bool:
+        return status_code in self.failure_status_codes
+
+    def find(self, url: str) -> Endpoint | None:
+        """Returns the endpoint a request URL was built from, or None if it isn't from any of them."""
+        matches = [endpoint for endpoint in self.endpoints if url.startswith(endpoint.url) and url[len(endpoint.url):len(endpoint.url) + 1] in ("", "/", "?")]
+        return max(matches, key=lambda endpoint: len(endpoint.url)) if matches else None
+
+    def rewrite_url(self, url: str, endpoint: Endpoint) -> str:
+        """Changes a request URL built from one of the endpoints to use another one instead."""
+        original = self.find(url)
+        if original is None:
+            return url
+        return endpoint.url + url[len(original.url):]
+
+    def _get_score(self, endpoint: Endpoint, now: float) -> float:
+        return (endpoint.latency or 0) + self._get_error_rate(endpoint, now) * self.error_penalty
+
+    def _get_error_rate(self, endpoint: Endpoint, now: float) -> float:
+        if endpoint.error_rate == 0:
+            return 0.0
+        return endpoint.error_rate * 0.5 ** ((now - endpoint._error_rate_updated_at) / self.error_half_life)
+
+    def __repr__(self):
+        return f"EndpointSelector({self.endpoints})"
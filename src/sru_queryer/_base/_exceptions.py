@@ -25,4 +25,33 @@ class ExplainResponseContentTypeException(Exception):
     def __init__(self, message, content):
         self.message = message
         self.content = content
-        super().__init__(self.message)
\ No newline at end of file
+        super().__init__(self.message)
+
+class ConfigurationSnapshotException(Exception):
+    """This exception is thrown when a configuration snapshot or bundle can't be loaded: it isn't a
+    snapshot, was written by an incompatible version of the library or of Python, or is corrupt.
+    'content' is the path of the file (or None if it was loaded from bytes)."""
+    def __init__(self, message, content):
+        self.message = message
+        self.content = content
+        super().__init__(self.message)
+
+class CircuitOpenException(Exception):
+    """This exception is thrown instead of sending a request while a CircuitBreaker is open, because
+    the SRU server has failed too many times in a row. 'content' is the URL of the request."""
+    def __init__(self, message, content):
+        self.message = message
+        self.content = content
+        super().__init__(self.message)
+
+class DeadlineExceededException(TimeoutError):
+    """This exception is thrown when a call runs out of the time it was given with 'deadline',
+    including any retries and pages. 'content' is the URL of the request that was being sent (or
+    None), 'elapsed' is the number of seconds the call had been running, and 'deadline' is the
+    number of seconds it was given."""
+    def __init__(self, message, content, elapsed: float | None = None, deadline: float | None = None):
+        self.message = message
+        self.content = content
+        self.elapsed = elapsed
+        self.deadline = deadline
+        super().__init__(self.message)
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+
+from ._sru_configuration import SRUConfiguration
+
+class ExplainCache():
+    """Stores the configurations parsed from explainResponses on disk, so that a new SRUQueryer
+    doesn't have to send an explain request every time it's created.
+
+    Entries are keyed by server URL and SRU version, and expire 'ttl' seconds after they were
+    written. The configuration is stored as parsed from the explainResponse, before the settings
+    passed to the SRUQueryer are applied, so queryers with different settings can share an entry
+    (and usernames and passwords are never written to disk).
+
+    Each entry also stores the ETag and Last-Modified headers of the explainResponse it was parsed
+    from, so that an expired entry can be revalidated with a conditional request instead of being
+    downloaded and parsed again.
+
+    Entries are written to a temporary file which is then renamed over the old entry, so other
+    processes never read a partially written entry. A missing, expired, or unreadable entry is
+    treated as a miss."""
+
+    def __init__(self, directory: str | None = None, ttl: float = 86400):
+        """'directory' defaults to sru_queryer in the user's cache directory ($XDG_CACHE_HOME or ~/.cache).
+
+        'ttl' is the number of seconds an entry is used for."""
+        if directory is None:
+            cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+            directory = os.path.join(cache_home, "sru_queryer")
+        self.directory = directory
+        self.ttl = ttl
+
+    def get(self, server_url: str, sru_version: str, allow_expired: bool = False) -> SRUConfiguration | None:
+        """Returns the cached configuration, or None if there isn't an unexpired entry.
+
+        If allow_expired is True, expired entries are returned too."""
+        entry = self._read_entry(server_url, sru_version)
+        if entry is None:
+            return None
+        if not allow_expired and time.time() - entry["stored_at"] > self.ttl:
+            logging.debug(f"Cached explain configuration for {server_url} has expired.")
+            return None
+
+        configuration = SRUConfiguration()
+        configuration.__dict__.update(entry["configuration"])
+        return configuration
+
+    def get_validators(self, server_url: str, sru_version: str) -> tuple[str | None, str | None]:
+        """Returns the ETag and Last-Modified values stored with an entry (expired or not), or (None, None)."""
+        entry = self._read_entry(server_url, sru_version)
+        if entry is None:
+            return None, None
+        return entry.get("etag"), entry.get("last_modified")
+
+    def set(self, server_url: str, sru_version: str, configuration: SRUConfiguration, etag: str | None = None, last_modified: str | None = None):
+        """Writes a configuration to the cache, replacing any existing entry.
+
+        etag and last_modified are the validators of the explainResponse the configuration was parsed from."""
+        entry = {
+            "server_url": server_url,
+            "sru_version": sru_version,
+            "stored_at": time.time(),
+            "etag": etag,
+            "last_modified": last_modified,
+            "configuration": configuration.to_dict()
+        }
+        os.makedirs(self.directory, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "w") as f:
+                json.dump(entry, f)
+            os.replace(temporary_path, self._get_path(server_url, sru_version))
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+    def invalidate(self, server_url: str, sru_version: str):
+        """Removes the entry for a server URL and SRU version, if there is one."""
+        try:
+            os.remove(self._get_path(server_url, sru_version))
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        """Removes every entry in the cache directory."""
+        if not os.path.isdir(self.directory):
+            return
+        for filename in os.listdir(self.directory):
+            if filename.endswith(".json"):
+                os.remove(os.path.join(self.directory, filename))
+
+    def _read_entry(self, server_url: str, sru_version: str) -> dict | None:
+        try:
+            with open(self._get_path(server_url, sru_version), "r") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logging.warning(f"Could not read the cached explain configuration for {server_url}: {e.__str__()}")
+            return None
+
+        # Guard against hash collisions and entries written by other programs
+        if not isinstance(entry, dict) or entry.get("server_url") != server_url or entry.get("sru_version") != sru_version \
+                or not isinstance(entry.get("stored_at"), (int, float)) or not isinstance(entry.get("configuration"), dict):
+            return None
+        return entry
+
+    def _get_path(self, server_url: str, sru_version: str) -> str:
+        key = hashlib.sha256(f"{sru_version}\n{server_url}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{key}.json")
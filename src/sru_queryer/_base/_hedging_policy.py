@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+from collections import deque
+
+class HedgingPolicy():
+    """Decides when SRUQueryer sends a second copy (a "hedge") of a slow searchRetrieve request.
+
+    The response times of recent requests (up to 'window' of them) are recorded, and a request
+    that hasn't completed after the given percentile of them (95th by default) is sent again - to
+    a mirror, if the queryer has one. Whichever copy finishes first is used. Until min_samples
+    response times have been recorded, requests aren't hedged, unless a fixed delay is set.
+
+    Hedges are limited to max_extra_load of the requests (0.05 means at most 5% extra requests):
+    each request adds max_extra_load to a budget, which each hedge takes 1 from, so a slow server
+    never gets a burst of duplicate requests. 'hedged' counts the hedges sent, and 'hedges_won'
+    those that finished first."""
+
+    def __init__(self, percentile: float = 95, max_extra_load: float = 0.05, min_samples: int = 20, window: int = 1000, delay: float | None = None, max_budget: float = 10):
+        if not 0 < percentile < 100:
+            raise ValueError("The percentile must be between 0 and 100.")
+        if max_extra_load < 0:
+            raise ValueError("max_extra_load must not be negative.")
+        self.percentile = percentile
+        self.max_extra_load = max_extra_load
+        self.min_samples = min_samples
+        self.delay = delay
+        self.max_budget = max_budget
+        self.requests = 0
+        self.hedged = 0
+        self.hedges_won = 0
+
+        # The recent response times in the order they were recorded, and the same ones sorted, so
+        # the percentile can be looked up without sorting them on every request
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._sorted_latencies: list[float] = []
+        self._budget = 0.0
+        self._lock = threading.Lock()
+
+    def get_delay(self) -> float | None:
+        """The number of seconds to wait for a request before hedging it, or None if it shouldn't be hedged.
+
+        Counts the request towards the hedging budget."""
+        with self._lock:
+            self.requests += 1
+            self._budget = min(self._budget + self.max_extra_load, self.max_budget)
+            if self.delay is not None:
+                return self.delay
+            if len(self._latencies) < self.min_samples:
+                return None
+            latencies = self._sorted_latencies
+            return latencies[min(math.ceil(len(latencies) * self.percentile / 100) - 1, len(latencies) - 1)]
+
+    def try_hedge(self) -> bool:
+        """Takes a hedge from the budget, returning False if there isn't one left."""
+        with self._lock:
+            # Allow for rounding errors, so that 10 requests at 0.1 each add up to a hedge
+            if self._budget < 1 - 1e-9:
+                return False
+            self._budget -= 1
+            self.hedged += 1
+            return True
+
+    def record_latency(self, latency: float):
+        """Records the response time of a request."""
+        with self._lock:
+            if len(self._latencies) == self._latencies.maxlen:
+                # The oldest response time is about to drop out of the window
+                del self._sorted_latencies[bisect.bisect_left(self._sorted_latencies, self._latencies[0])]
+            self._latencies.append(latency)
+            bisect.insort(self._sorted_latencies, latency)
+
+    def record_hedge_won(self):
+        with self._lock:
+            self.hedges_won += 1
+
+    def __repr__(self):
+        return f"HedgingPolicy(percentile={self.percentile}, max_extra_load={self.max_extra_load}, requests={self.requests}, hedged={self.hedged}, hedges_won={self.hedges_won})"
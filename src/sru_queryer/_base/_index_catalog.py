@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import sys
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Iterator
+
+class IndexRecord():
+    """The configuration of one CQL index, in a compact, immutable form.
+
+    Supports the same item access as the index dicts (record["supported_relations"] and so on),
+    so it can be validated and formatted in the same way. supported_relations is a frozenset, for
+    fast membership checks; relation_order keeps the relations in the order the server listed them."""
+    __slots__ = ("id", "title", "sort", "supported_relations", "relation_order", "empty_term_supported")
+
+    def __init__(self, id: str | None, title: str | None, sort: bool | None, supported_relations: frozenset[str] | None, relation_order: tuple[str, ...] | None, empty_term_supported: bool | None):
+        object.__setattr__(self, "id", id)
+        object.__setattr__(self, "title", title)
+        object.__setattr__(self, "sort", sort)
+        object.__setattr__(self, "supported_relations", supported_relations)
+        object.__setattr__(self, "relation_order", relation_order)
+        object.__setattr__(self, "empty_term_supported", empty_term_supported)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("IndexRecord is immutable")
+
+    def __getitem__(self, key: str):
+        if key not in ("id", "title", "sort", "supported_relations", "empty_term_supported"):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, IndexRecord):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __hash__(self) -> int:
+        # title can be a dict or list (xmltodict's version of a <title> with attributes, or of
+        # several), so it's left out; equal records still have equal hashes
+        return hash((self.id, self.sort, self.relation_order, self.empty_term_supported))
+
+    def to_dict(self) -> dict:
+        """Returns the index in the same format as SRUExplainAutoParser's index configs."""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "sort": self.sort,
+            "supported_relations": list(self.relation_order) if self.relation_order is not None else None,
+            "empty_term_supported": self.empty_term_supported
+        }
+
+    def __repr__(self):
+        return f"IndexRecord(id={self.id!r}, title={self.title!r}, sort={self.sort!r}, supported_relations={self.to_dict()["supported_relations"]!r}, empty_term_supported={self.empty_term_supported!r})"
+
+class IndexCatalog(Mapping):
+    """A read-only, compact version of SRUConfiguration.available_context_sets_and_indexes.
+
+    Maps each context set to a read-only mapping of its index names to IndexRecords. Context set,
+    index, and relation names are interned, and indexes that support the same relations share one
+    frozenset, so many configurations for similar servers take up much less memory than the dicts.
+    Use to_dict() to get the dict version back."""
+    __slots__ = ("_context_sets",)
+
+    def __init__(self, available_context_sets_and_indexes: dict):
+        """Builds the catalog from the dict version of available_context_sets_and_indexes."""
+        # Indexes that support the same relations (usually most of them) share one tuple and frozenset
+        shared_relations: dict[tuple[str, ...], tuple[tuple[str, ...], frozenset[str]]] = {}
+        context_sets = {}
+        for context_set, indexes in available_context_sets_and_indexes.items():
+            records = {}
+            for index_name, index_info in indexes.items():
+                if isinstance(index_info, IndexRecord):
+                    records[self._intern(index_name)] = index_info
+                    continue
+
+                relation_order, supported_relations = None, None
+                if index_info["supported_relations"] is not None:
+                    relation_order = tuple(self._intern(relation) for relation in index_info["supported_relations"])
+                    if relation_order not in shared_relations:
+                        shared_relations[relation_order] = (relation_order, frozenset(relation_order))
+                    relation_order, supported_relations = shared_relations[relation_order]
+
+                records[self._intern(index_name)] = IndexRecord(index_info["id"], index_info["title"], index_info["sort"], supported_relations, relation_order, index_info["empty_term_supported"])
+            context_sets[self._intern(context_set)] = MappingProxyType(records)
+        self._context_sets = context_sets
+
+    def __getitem__(self, context_set: str) -> Mapping[str, IndexRecord]:
+        return self._context_sets[context_set]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._context_sets)
+
+    def __len__(self) -> int:
+        return len(self._context_sets)
+
+    def to_dict(self) -> dict:
+        """Returns the catalog in the format of SRUConfiguration.available_context_sets_and_indexes."""
+        return {context_set: {index_name: record.to_dict() for index_name, record in indexes.items()} for context_set, indexes in self._context_sets.items()}
+
+    def __repr__(self):
+        return f"IndexCatalog({len(self._context_sets)} context sets, {sum(len(indexes) for indexes in self._context_sets.values())} indexes)"
+
+    @staticmethod
+    def _intern(name):
+        # Context set names can be None for indexes that aren't mapped to a set
+        return sys.intern(name) if isinstance(name, str) else name
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import email.utils
+import logging
+import threading
+import time
+
+class RateLimiter():
+    """A token bucket that limits the rate of requests sent to one SRU server, and slows down when
+    the server says it's being sent too many.
+
+    Up to 'burst' requests can be sent at once, after which requests are let through at 'rate' per
+    second. acquire() blocks until the next request may be sent. Share one RateLimiter between
+    every SRUQueryer (and thread) that sends requests to the same server.
+
+    When the server responds with a throttling status (429 or 503 by default), the rate is
+    multiplied by decrease_factor (at most once per second, so a burst of throttled responses only
+    counts once), down to min_rate. If the response has a Retry-After header, no requests are let
+    through until it has passed (up to max_retry_after seconds). Every other response adds
+    increase_step to the rate, up to the original rate, so throughput recovers once the server
+    stops throttling.
+
+    'rate' is the current rate, and 'throttled' counts the throttling responses."""
+
+    def __init__(self, rate: float, burst: int = 1, min_rate: float | None = None, decrease_factor: float = 0.5, increase_step: float | None = None, throttle_status_codes: tuple[int, ...] = (429, 503), max_retry_after: float = 300):
+        if rate <= 0:
+            raise ValueError("The rate must be greater than 0.")
+        if burst < 1:
+            raise ValueError("The burst must be at least 1.")
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate if min_rate is not None else rate / 20
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step if increase_step is not None else rate / 20
+        self.throttle_status_codes = throttle_status_codes
+        self.max_retry_after = max_retry_after
+        self.throttled = 0
+
+        # The time the bucket would next be full if no more requests were sent
+        self._full_at = 0.0
+        self._paused_until = 0.0
+        self._last_decrease = float("-inf")
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: float | None = None) -> bool:
+        """Blocks until a request may be sent, and takes a token for it.
+
+        If the request would have to wait more than timeout seconds, returns False straight away
+        without taking a token."""
+        delay = self.reserve(timeout)
+        if delay is None:
+            return False
+        if delay > 0:
+            time.sleep(delay)
+        return True
+
+    def reserve(self, max_wait: float | None = None) -> float | None:
+        """Takes a token for a request without blocking, and returns the number of seconds to wait
+        before sending it. Use this instead of acquire() to wait some other way (for instance, with
+        asyncio.sleep). If the wait would be longer than max_wait, returns None without taking a token."""
+        with self._lock:
+            now = time.monotonic()
+            interval = 1 / self.rate
+            # The bucket holds 'burst' tokens, so a request can be sent as soon as the bucket would
+            # have at least one token left after it.
+            send_at = max(now, self._paused_until, self._full_at - (self.burst - 1) * interval)
+            if max_wait is not None and send_at - now > max_wait:
+                return None
+            self._full_at = max(self._full_at, send_at) + interval
+            return send_at - now
+
+    def record_response(self, status_code: int, retry_after: str | None = None):
+        """Adjusts the rate for a response from the server. retry_after is the value of its Retry-After header, if any."""
+        with self._lock:
+            now = time.monotonic()
+            if status_code not in self.throttle_status_codes:
+                self.rate = min(self.max_rate, self.rate + self.increase_step)
+                return
+
+            self.throttled += 1
+            if now - self._last_decrease >= 1:
+                self._last_decrease = now
+                self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+                logging.info(f"The SRU server is throttling requests. Slowing down to {self.rate:.2f} requests per second.")
+
+            retry_after_seconds = self._parse_retry_after(retry_after)
+            if retry_after_seconds is not None:
+                self._paused_until = max(self._paused_until, now + min(retry_after_seconds, self.max_retry_after))
+
+    @staticmethod
+    def _parse_retry_after(retry_after: str | None) -> float | None:
+        """Returns the number of seconds in a Retry-After header (either a number of seconds or an HTTP date), or None."""
+        if not retry_after:
+            return None
+        try:
+            return max(float(retry_after), 0)
+        except ValueError:
+            pass
+        try:
+            retry_at = email.utils.parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        return max(retry_at.timestamp() - time.time(), 0)
+
+    def __repr__(self):
+        return f"RateLimiter(rate={self.rate:.2f}, max_rate={self.max_rate}, burst={self.burst}, throttled={self.throttled})"
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+class ResultCacheBase(ABC):
+    """The interface SRUQueryer uses to cache searchRetrieve responses, keyed by the full request URL
+    (followed by a hash of the credentials, for requests sent with them).
+
+    Subclass it to store responses somewhere else: implement get, set, invalidate, and clear (a
+    subclass that's missing one can't be instantiated), and count lookups in 'hits' and 'misses'
+    (and evicted entries in 'evictions'). A cache may be used from several threads at once, and
+    should treat its own failures as misses rather than raising, so a broken cache never fails a
+    search."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @abstractmethod
+    def get(self, url: str) -> bytes | None:
+        """Returns the cached response for a URL, or None if there isn't an unexpired one."""
+
+    @abstractmethod
+    def set(self, url: str, content: bytes):
+        """Stores a response."""
+
+    @abstractmethod
+    def invalidate(self, url: str):
+        """Removes the entry for a URL, if there is one."""
+
+    @abstractmethod
+    def clear(self):
+        """Removes every entry."""
+
+class ResultCache(ResultCacheBase):
+    """An in-memory cache of searchRetrieve responses, keyed by the full request URL.
+
+    Entries expire 'ttl' seconds after they were stored. Once the stored responses (and their
+    URLs) take up more than max_bytes, the least recently used entries are evicted until they fit.
+    A response larger than max_bytes is never stored.
+
+    'hits', 'misses', and 'evictions' count lookups that found an entry, lookups that didn't
+    (including expired entries), and entries evicted to make room. The cache can be shared between
+    SRUQueryers and threads."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl: float = 300):
+        super().__init__()
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.current_bytes = 0
+        # URL -> (content, expires_at), with the most recently used entries last
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> bytes | None:
+        """Returns the cached response for a URL, or None if there isn't an unexpired one."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None and entry[1] <= time.monotonic():
+                self._remove(url)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(url)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, url: str, content: bytes):
+        """Stores a response, evicting the least recently used entries if the cache is full."""
+        size = self._get_size(url, content)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if url in self._entries:
+                self._remove(url)
+            self._entries[url] = (content, time.monotonic() + self.ttl)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                oldest_url = next(iter(self._entries))
+                self._remove(oldest_url)
+                self.evictions += 1
+
+    def invalidate(self, url: str):
+        """Removes the entry for a URL, if there is one."""
+        with self._lock:
+            if url in self._entries:
+                self._remove(url)
+
+    def clear(self):
+        """Removes every entry. The counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self):
+        return f"ResultCache({len(self._entries)} entries, {self.current_bytes} bytes, hits={self.hits}, misses={self.misses}, evictions={self.evictions})"
+
+    def _remove(self, url: str):
+        content, _ = self._entries.pop(url)
+        self.current_bytes -= self._get_size(url, content)
+
+    @staticmethod
+    def _get_size(url: str, content: bytes) -> int:
+        return len(url) + len(content)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import random
+
+import requests
+
+from ._rate_limiter import RateLimiter
+
+class RetryPolicy():
+    """Decides whether, and after how long, SRUQueryer retries a failed request.
+
+    A request is sent up to max_attempts times (so max_attempts=1 never retries). It's retried if
+    sending it raised one of retry_exceptions (by default, connection errors and timeouts), or the
+    server responded with one of retry_status_codes. Only requests whose method is in
+    retry_methods are retried - SRU requests are all GETs, which are safe to repeat.
+
+    Before each retry, SRUQueryer waits a random time between 0 and backoff * 2 ** (attempt - 1)
+    seconds ("full jitter"), so that many clients retrying at once don't all hit the server at the
+    same moment. If the response had a Retry-After header (and respect_retry_after is True), it
+    waits at least that long instead. Either way, it never waits more than max_backoff seconds.
+
+    If every attempt fails, the last response is returned (or the last exception is raised), just
+    as if the request had only been sent once."""
+
+    def __init__(self, max_attempts: int = 3, backoff: float = 0.5, max_backoff: float = 30, retry_status_codes: tuple[int, ...] = (429, 500, 502, 503, 504), retry_exceptions: tuple[type[Exception], ...] = (requests.ConnectionError, requests.Timeout), retry_methods: tuple[str, ...] = ("GET", "HEAD"), respect_retry_after: bool = True):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+        if backoff < 0 or max_backoff < 0:
+            raise ValueError("The backoff must not be negative.")
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_status_codes = retry_status_codes
+        self.retry_exceptions = retry_exceptions
+        self.retry_methods = retry_methods
+        self.respect_retry_after = respect_retry_after
+
+    def should_retry(self, method: str, attempt: int, status_code: int | None = None, exception: Exception | None = None) -> bool:
+        """Whether a request that has been sent 'attempt' times should be sent again, after it
+        either raised 'exception' or got a response with 'status_code'."""
+        if attempt >= self.max_attempts or method.upper() not in self.retry_methods:
+            return False
+        if exception is not None:
+            return isinstance(exception, self.retry_exceptions)
+        return status_code in self.retry_status_codes
+
+    def get_delay(self, attempt: int, retry_after: str | None = None) -> float:
+        """The number of seconds to wait before sending a request again, after 'attempt' attempts.
+        retry_after is the value of the last response's Retry-After header, if any."""
+        delay = random.uniform(0, self.backoff * 2 ** (attempt - 1))
+        if self.respect_retry_after:
+            retry_after_seconds = RateLimiter._parse_retry_after(retry_after)
+            if retry_after_seconds is not None:
+                delay = max(delay, retry_after_seconds)
+        return min(delay, self.max_backoff)
+
+    def __repr__(self):
+        return f"RetryPolicy(max_attempts={self.max_attempts}, backoff={self.backoff}, max_backoff={self.max_backoff})"
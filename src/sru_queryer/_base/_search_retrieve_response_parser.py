@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+from typing import BinaryIO, Iterable, Iterator
+from xml.etree import ElementTree
+from xml.etree.ElementTree import Element
+
+from ._xml_source import read_chunks
+
+class SRURecord():
+    """One record from a searchRetrieveResponse.
+
+    For records with 'xml' packing, 'element' is the root element of the record data and 'text' is
+    None. For 'string' packing, 'text' holds the escaped record and 'element' is None.
+
+    The parser frees each record's elements once the next record is requested, so use to_xml() (or
+    copy the element) if you need to keep a record around."""
+
+    def __init__(self, record_schema: str | None, record_packing: str | None, record_position: int | None, record_identifier: str | None, element: Element | None, text: str | None):
+        self.record_schema = record_schema
+        self.record_packing = record_packing
+        self.record_position = record_position
+        self.record_identifier = record_identifier
+        self.element = element
+        self.text = text
+
+    def to_xml(self) -> bytes:
+        """Returns the record data as XML bytes."""
+        if self.element is not None:
+            return ElementTree.tostring(self.element, encoding="utf-8")
+        if self.text is not None:
+            return self.text.encode("utf-8")
+        return b""
+
+    def __repr__(self):
+        return f"SRURecord(record_schema={self.record_schema!r}, record_position={self.record_position!r})"
+
+class SRUDiagnostic():
+    """A diagnostic returned in place of (or alongside) the results of a searchRetrieve request."""
+
+    def __init__(self, uri: str | None, details: str | None, message: str | None):
+        self.uri = uri
+        self.details = details
+        self.message = message
+
+    def __repr__(self):
+        return f"SRUDiagnostic(uri={self.uri!r}, details={self.details!r}, message={self.message!r})"
+
+class SearchRetrieveResponseParser():
+    """Reads a searchRetrieveResponse incrementally, yielding its records one at a time.
+
+    The source can be the response bytes, a binary file-like object, an iterable of byte chunks,
+    or a requests.Response sent with stream=True - in which case records are yielded while the
+    rest of the response is still being read off the socket. Only one record is held in memory
+    at a time.
+
+    number_of_records is set as soon as it has been read (before the first record), while
+    next_record_position and diagnostics are only complete once all the records have been read.
+
+    A streamed response (or a file) can only be read once, so the records can only be iterated
+    over once. Reading all the records releases a streamed response's connection; if you might
+    not, call close(), or use the parser as a context manager:\n
+        with queryer.stream_search_retrieve(query) as parser:\n
+            first_record = next(iter(parser))\n
+
+    SRU servers use different namespace prefixes (srw, zs, sru, or none at all), so elements are
+    matched on their local name only."""
+
+    def __init__(self, source: bytes | BinaryIO | Iterable[bytes], chunk_size: int = 65536):
+        self.source = source
+        self.chunk_size = chunk_size
+        self.version: str | None = None
+        self.number_of_records: int | None = None
+        self.next_record_position: int | None = None
+        self.diagnostics: list[SRUDiagnostic] = []
+
+    def __iter__(self) -> Iterator[SRURecord]:
+        return self.iter_records()
+
+    def iter_records(self) -> Iterator[SRURecord]:
+        """Yields each record in the response. Raises xml.etree.ElementTree.ParseError if the response isn't XML."""
+        parser = ElementTree.XMLPullParser(events=("start", "end"))
+        # The elements that are currently open, from the root down
+        open_elements: list[Element] = []
+
+        try:
+            for chunk in read_chunks(self.source, self.chunk_size):
+                parser.feed(chunk)
+                yield from self._handle_events(parser, open_elements)
+            parser.close()
+            yield from self._handle_events(parser, open_elements)
+        finally:
+            self.close()
+
+    def close(self):
+        """Releases the connection of a streamed requests.Response. Other sources are left open."""
+        if hasattr(self.source, "iter_content"):
+            self.source.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def read_all(self) -> list[SRURecord]:
+        """Reads the whole response, returning its records."""
+        return list(self.iter_records())
+
+    @staticmethod
+    def parse_pagination_info(content: bytes) -> tuple[int | None, int | None]:
+        """Returns the numberOfRecords and nextRecordPosition of a searchRetrieveResponse.
+
+        Either value is None if it's not in the response. Only direct children of the
+        searchRetrieveResponse are checked, so records containing elements with the same
+        names don't interfere."""
+        parser = SearchRetrieveResponseParser(content)
+        for _ in parser.iter_records():
+            pass
+        return parser.number_of_records, parser.next_record_position
+
+    def _handle_events(self, parser: ElementTree.XMLPullParser, open_elements: list[Element]) -> Iterator[SRURecord]:
+        for event, element in parser.read_events():
+            if event == "start":
+                open_elements.append(element)
+                continue
+
+            open_elements.pop()
+            depth = len(open_elements)
+            local_name = self._local_name(element.tag)
+
+            if depth == 1:
+                # A direct child of the searchRetrieveResponse
+                if local_name == "version":
+                    self.version = self._text(element)
+                elif local_name == "numberOfRecords":
+                    self.number_of_records = self._parse_int(element.text)
+                elif local_name == "nextRecordPosition":
+                    self.next_record_position = self._parse_int(element.text)
+                elif local_name == "diagnostics":
+                    self.diagnostics.extend(self._parse_diagnostic(diagnostic) for diagnostic in element)
+                element.clear()
+            elif depth == 2 and local_name == "record" and self._local_name(open_elements[-1].tag) == "records":
+                yield self._parse_record(element)
+                # The caller has moved on, so free the record.
+                element.clear()
+                open_elements[-1].remove(element)
+
+    def _parse_record(self, record: Element) -> SRURecord:
+        record_schema = None
+        record_packing = None
+        record_position = None
+        record_identifier = None
+        data_element = None
+        data_text = None
+
+        for child in record:
+            local_name = self._local_name(child.tag)
+            if local_name == "recordSchema":
+                record_schema = self._text(child)
+            elif local_name in ("recordPacking", "recordXMLEscaping"):
+                record_packing = self._text(child)
+            elif local_name == "recordPosition":
+                record_position = self._parse_int(child.text)
+            elif local_name == "recordIdentifier":
+                record_identifier = self._text(child)
+            elif local_name == "recordData":
+                if len(child):
+                    data_element = child[0]
+                else:
+                    data_text = child.text
+
+        return SRURecord(record_schema, record_packing, record_position, record_identifier, data_element, data_text)
+
+    def _parse_diagnostic(self, diagnostic: Element) -> SRUDiagnostic:
+        values = {}
+        for child in diagnostic:
+            values[self._local_name(child.tag)] = self._text(child)
+        return SRUDiagnostic(values.get("uri"), values.get("details"), values.get("message"))
+
+    @staticmethod
+    def _local_name(tag: str) -> str:
+        return tag.rsplit("}", 1)[-1]
+
+    @staticmethod
+    def _text(element: Element) -> str | None:
+        if element.text is None:
+            return None
+        return element.text.strip()
+
+    @staticmethod
+    def _parse_int(text: str | None) -> int | None:
+        try:
+            return int(text.strip())
+        except (AttributeError, ValueError):
+            return None
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+class SearchRetrieveResult():
+    """The outcome of one searchRetrieve request sent as part of a batch.
+
+    'index' is the position of the query in the batch. If the query failed validation or the
+    request could not be sent, 'exception' holds the error and 'content' is None. For federated
+    searches, 'source' is the name of the server the result came from."""
+
+    def __init__(self, index: int, content: bytes | None = None, exception: Exception | None = None, url: str | None = None, source: str | None = None):
+        self.index = index
+        self.content = content
+        self.exception = exception
+        self.url = url
+        self.source = source
+
+    @property
+    def ok(self) -> bool:
+        return self.exception is None
+
+    def __repr__(self):
+        if self.source is not None:
+            if self.ok:
+                return f"SearchRetrieveResult(index={self.index}, source={self.source!r}, url={self.url!r}, content=<{len(self.content)} bytes>)"
+            return f"SearchRetrieveResult(index={self.index}, source={self.source!r}, url={self.url!r}, exception={self.exception!r})"
+        if self.ok:
+            return f"SearchRetrieveResult(index={self.index}, url={self.url!r}, content=<{len(self.content)} bytes>)"
+        return f"SearchRetrieveResult(index={self.index}, url={self.url!r}, exception={self.exception!r})"
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+class _Call():
+    """A call that's in flight, and the callers waiting for it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exception: BaseException | None = None
+
+class SingleFlight():
+    """Coalesces identical calls made from several threads at once.
+
+    The first caller for a key runs the function, and every caller that arrives with the same key
+    while it's running waits for it and gets the same result (or has the same exception raised),
+    instead of running the function again. Once the call has finished, the next caller for the key
+    runs the function again - results aren't cached.
+
+    If timeout is passed to do(), a caller that's waiting for another caller's call raises
+    TimeoutError once it has waited that many seconds (the call itself carries on).
+
+    'shared' counts the callers that got another caller's result."""
+
+    def __init__(self):
+        self.shared = 0
+        self._calls: dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, function: Callable[[], T], timeout: float | None = None) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+
+        if not leader:
+            if not call.done.wait(timeout):
+                raise TimeoutError(f"Timed out after {timeout} seconds waiting for an identical call in flight.")
+            if call.exception is not None:
+                raise call.exception
+            return call.result
+
+        try:
+            call.result = function()
+        except BaseException as e:
+            call.exception = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+class _AsyncCall():
+
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+
+class AsyncSingleFlight():
+    """The asyncio version of SingleFlight, for coroutines running on one event loop.
+
+    The first caller's coroutine is run as a task that every caller with the same key awaits. A
+    caller that's cancelled stops waiting without affecting the others, and the task itself is
+    only cancelled once every caller waiting for it has been."""
+
+    def __init__(self):
+        self.shared = 0
+        self._calls: dict[str, _AsyncCall] = {}
+
+    async def do(self, key: str, function: Callable[[], Awaitable[T]]) -> T:
+        call = self._calls.get(key)
+        if call is None:
+            call = self._calls[key] = _AsyncCall(asyncio.ensure_future(function()))
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+        else:
+            self.shared += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Nobody is waiting for the result any more, so abort the call
+                self._forget(key, call)
+                call.task.cancel()
+
+    def _forget(self, key: str, call: _AsyncCall):
+        if self._calls.get(key) is call:
+            del self._calls[key]
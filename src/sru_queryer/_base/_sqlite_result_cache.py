@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+
+from ._result_cache import ResultCacheBase
+
+class SQLiteResultCache(ResultCacheBase):
+    """A cache of searchRetrieve responses stored in an SQLite database, so that it survives
+    restarts and can be shared by every process on a host (for instance, gunicorn workers).
+
+    Responses are compressed with zlib before they're stored. Entries expire 'ttl' seconds after
+    they were stored, and once the compressed responses take up more than max_bytes, the least
+    recently used entries are evicted until they fit.
+
+    The database uses write-ahead logging, and lookups only read it, so they never wait for each
+    other or for a writer. When a lookup finds an entry, its last use is only noted in memory, and
+    written to the database (in one transaction with the other noted uses) the next time this
+    instance stores a response, or once flush_interval seconds have passed. Expired entries are
+    removed when responses are stored. The total size of the entries is kept up to date by
+    triggers, so storing a response never has to scan the whole table. Each thread (and each
+    process, including forked ones) opens its own connection. If the database can't be used (for
+    instance, it's locked for longer than 'timeout' seconds), the error is logged and the lookup is
+    treated as a miss, so searches never fail because of the cache.
+
+    'hits', 'misses', and 'evictions' only count this instance's lookups and evictions."""
+
+    _schema = """
+        CREATE TABLE IF NOT EXISTS responses (
+            url TEXT PRIMARY KEY,
+            content BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            expires_at REAL NOT NULL,
+            last_used REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+        CREATE INDEX IF NOT EXISTS responses_expires_at ON responses (expires_at);
+
+        CREATE TABLE IF NOT EXISTS metadata (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            total_size INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO metadata (id, total_size) SELECT 0, COALESCE(SUM(size), 0) FROM responses;
+        CREATE TRIGGER IF NOT EXISTS responses_insert AFTER INSERT ON responses BEGIN
+            UPDATE metadata SET total_size = total_size + NEW.size WHERE id = 0;
+        END;
+        CREATE TRIGGER IF NOT EXISTS responses_update AFTER UPDATE OF size ON responses BEGIN
+            UPDATE metadata SET total_size = total_size - OLD.size + NEW.size WHERE id = 0;
+        END;
+        CREATE TRIGGER IF NOT EXISTS responses_delete AFTER DELETE ON responses BEGIN
+            UPDATE metadata SET total_size = total_size - OLD.size WHERE id = 0;
+        END;
+    """
+
+    def __init__(self, path: str | os.PathLike, max_bytes: int = 256 * 1024 * 1024, ttl: float = 300, compression_level: int = 6, timeout: float = 5, flush_interval: float = 10):
+        super().__init__()
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.compression_level = compression_level
+        self.timeout = timeout
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._counter_lock = threading.Lock()
+        # The last uses of entries that haven't been written to the database yet, by URL
+        self._pending_uses: dict[str, float] = {}
+        self._last_flush = time.monotonic()
+        # Create the database now, so that a bad path fails here rather than on every lookup
+        self._get_connection()
+
+    def get(self, url: str) -> bytes | None:
+        content = None
+        try:
+            connection = self._get_connection()
+            now = time.time()
+            row = connection.execute("SELECT content FROM responses WHERE url = ? AND expires_at > ?", (url, now)).fetchone()
+            if row is not None:
+                content = zlib.decompress(row[0])
+        except (sqlite3.Error, zlib.error) as e:
+            logging.warning(f"Could not read the cached response for {url}: {e.__str__()}")
+            content = None
+
+        with self._counter_lock:
+            if content is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._pending_uses[url] = now
+            flush = content is not None and time.monotonic() - self._last_flush >= self.flush_interval
+        if flush:
+            self.flush()
+        return content
+
+    def flush(self):
+        """Writes the last uses of the entries found since the last flush to the database."""
+        with self._counter_lock:
+            pending_uses, self._pending_uses = self._pending_uses, {}
+            self._last_flush = time.monotonic()
+        if not pending_uses:
+            return
+        try:
+            connection = self._get_connection()
+            with self._transaction(connection):
+                self._write_uses(connection, pending_uses)
+        except sqlite3.Error as e:
+            # Only the eviction order suffers, so the uses are dropped rather than retried
+            logging.warning(f"Could not record the use of cached responses: {e.__str__()}")
+
+    def set(self, url: str, content: bytes):
+        compressed_content = zlib.compress(content, self.compression_level)
+        if len(compressed_content) > self.max_bytes:
+            return
+
+        with self._counter_lock:
+            pending_uses, self._pending_uses = self._pending_uses, {}
+            self._last_flush = time.monotonic()
+        try:
+            connection = self._get_connection()
+            now = time.time()
+            with self._transaction(connection):
+                # Record the uses first, so the eviction order is up to date
+                self._write_uses(connection, pending_uses)
+                connection.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+                connection.execute("INSERT INTO responses (url, content, size, expires_at, last_used) VALUES (?, ?, ?, ?, ?) "
+                                   "ON CONFLICT (url) DO UPDATE SET content = excluded.content, size = excluded.size, expires_at = excluded.expires_at, last_used = excluded.last_used",
+                                   (url, compressed_content, len(compressed_content), now + self.ttl, now))
+                evicted = self._evict(connection)
+        except sqlite3.Error as e:
+            logging.warning(f"Could not cache the response for {url}: {e.__str__()}")
+            return
+
+        if evicted:
+            with self._counter_lock:
+                self.evictions += evicted
+
+    def invalidate(self, url: str):
+        try:
+            self._get_connection().execute("DELETE FROM responses WHERE url = ?", (url,))
+        except sqlite3.Error as e:
+            logging.warning(f"Could not remove the cached response for {url}: {e.__str__()}")
+
+    def clear(self):
+        with self._counter_lock:
+            self._pending_uses.clear()
+        try:
+            self._get_connection().execute("DELETE FROM responses")
+        except sqlite3.Error as e:
+            logging.warning(f"Could not clear the response cache: {e.__str__()}")
+
+    def __len__(self) -> int:
+        """The number of unexpired entries."""
+        return self._get_connection().execute("SELECT COUNT(*) FROM responses WHERE expires_at > ?", (time.time(),)).fetchone()[0]
+
+    @property
+    def current_bytes(self) -> int:
+        """The total size of the stored (compressed) responses, including expired ones that haven't been removed yet."""
+        return self._get_total_size(self._get_connection())
+
+    def close(self):
+        """Closes this thread's connection to the database."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def __repr__(self):
+        return f"SQLiteResultCache({self.path!r}, hits={self.hits}, misses={self.misses}, evictions={self.evictions})"
+
+    def _evict(self, connection: sqlite3.Connection) -> int:
+        """Deletes the least recently used entries until the responses fit in max_bytes. Returns the number deleted."""
+        total_size = self._get_total_size(connection)
+        evicted = 0
+        while total_size > self.max_bytes:
+            oldest = connection.execute("SELECT url, size FROM responses ORDER BY last_used LIMIT 64").fetchall()
+            for url, size in oldest:
+                if total_size <= self.max_bytes:
+                    break
+                connection.execute("DELETE FROM responses WHERE url = ?", (url,))
+                total_size -= size
+                evicted += 1
+        return evicted
+
+    @staticmethod
+    def _get_total_size(connection: sqlite3.Connection) -> int:
+        return connection.execute("SELECT total_size FROM metadata WHERE id = 0").fetchone()[0]
+
+    @staticmethod
+    def _write_uses(connection: sqlite3.Connection, uses: dict[str, float]):
+        if uses:
+            connection.executemany("UPDATE responses SET last_used = MAX(last_used, ?) WHERE url = ?", [(used_at, url) for url, used_at in uses.items()])
+
+    def _get_connection(self) -> sqlite3.Connection:
+        # A connection can't be used by a forked child process, so each process opens its own
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and self._local.pid == os.getpid():
+            return connection
+
+        connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(self._schema)
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+        return connection
+
+    @staticmethod
+    @contextmanager
+    def _transaction(connection: sqlite3.Connection):
+        # BEGIN IMMEDIATE takes the write lock at the start, so concurrent writers wait for each
+        # other (up to the connection's timeout) instead of failing part of the way through.
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
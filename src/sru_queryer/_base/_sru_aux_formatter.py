@@ -3,6 +3,7 @@ from __future__ import annotations
 from base64 import b64encode
 
 from ._sru_configuration import SRUConfiguration
+from ._index_catalog import IndexRecord
 from ._sort_key import SortKey
 
 
@@ -20,6 +21,8 @@ class SRUAuxiliaryFormatter():
             formatted_string += f"------INDEX SET: {context_set}------\n\n"
             for index_code in available_context_sets_and_indexes[context_set]:
                 index_data = available_context_sets_and_indexes[context_set][index_code]
+                if isinstance(index_data, IndexRecord):
+                    index_data = index_data.to_dict()
 
                 formatted_string += f"Index: {index_data['title']}\n"
 
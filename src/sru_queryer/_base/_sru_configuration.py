@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from ._index_catalog import IndexCatalog
+
 class SRUConfiguration():
 
     def __init__(self, from_dict: dict = None):
@@ -18,8 +20,9 @@ class SRUConfiguration():
                 self.default_record_schema: str | None = from_dict["default_record_schema"]
                 self.default_sort_schema: str | None = from_dict["default_sort_schema"]
                 # Default record numbers
-                self.default_records_returned: int | None = int(from_dict["default_records_returned"])
-                self.max_records_supported: int | None = int(from_dict["max_records_supported"])
+                # Many servers don't give these, so they may be None
+                self.default_records_returned: int | None = self._to_int(from_dict["default_records_returned"])
+                self.max_records_supported: int | None = self._to_int(from_dict["max_records_supported"])
 
                 # Hard-coded limits from documentation
                 self.available_record_packing_values = ["string", "xml"]
@@ -59,3 +62,24 @@ class SRUConfiguration():
         self.username: str | None = None
         self.password: str | None = None
         self.disable_validation_for_cql_defaults: bool = False
+
+    def compact(self) -> SRUConfiguration:
+        """Replaces available_context_sets_and_indexes with an IndexCatalog, a compact, read-only
+        version of it, and returns the configuration.
+
+        The catalog supports the same lookups as the dict, so the configuration can be used in the
+        same way. Use to_dict() to get the dict version of the configuration."""
+        if not isinstance(self.available_context_sets_and_indexes, IndexCatalog):
+            self.available_context_sets_and_indexes = IndexCatalog(self.available_context_sets_and_indexes)
+        return self
+
+    def to_dict(self) -> dict:
+        """Returns the configuration as a dict, which can be saved as JSON and loaded with SRUConfiguration(from_dict=...)."""
+        configuration_dict = dict(self.__dict__)
+        if isinstance(self.available_context_sets_and_indexes, IndexCatalog):
+            configuration_dict["available_context_sets_and_indexes"] = self.available_context_sets_and_indexes.to_dict()
+        return configuration_dict
+
+    @staticmethod
+    def _to_int(value) -> int | None:
+        return int(value) if value is not None else None
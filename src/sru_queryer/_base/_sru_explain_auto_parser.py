@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from ._sru_configuration import SRUConfiguration
-from ._exceptions import NoExplainResponseException
+from ._exceptions import NoExplainResponseException, ExplainResponseParserException
 
 generic_driver = {
     "name": "Generic Driver for auto-detect",
@@ -33,79 +33,148 @@ generic_driver = {
     }
 }
 
+class PropertyPathResolver():
+    """Finds values in the xmltodict output of an explainResponse, remembering which keys each path resolved to.
+
+    SRUExplainAutoParser._find_property_value matches each path segment to the key that CONTAINS
+    it, so that the parser works with whatever namespace prefixes the server uses. Scanning the
+    keys like that for every index is slow, but the elements of a document all use the same
+    prefixes. So the first time a path is resolved, the keys it matched are compiled into a
+    direct lookup, which is used for every later element. If the direct lookup fails (say an
+    optional element is missing), the keys are scanned as usual.
+
+    A path is only compiled if each of its segments matched exactly one key, since a scan returns
+    the last of several matches. Explain records don't have sibling elements whose names contain
+    one another, so a compiled path finds the same key a scan would. Create one per document,
+    since each document can use different prefixes."""
+
+    def __init__(self):
+        self._compiled_paths: dict[tuple[str, ...], tuple[str, ...]] = {}
+
+    def find_property_value(self, input_dict: dict, location: list[str]) -> any | None:
+        """Same as SRUExplainAutoParser._find_property_value."""
+        location = tuple(location)
+        compiled_path = self._compiled_paths.get(location)
+        if compiled_path:
+            data = input_dict
+            try:
+                for key in compiled_path:
+                    data = data[key]
+                return data
+            except (KeyError, TypeError):
+                pass
+
+        data = input_dict
+        matched_keys = []
+        compilable = True
+        for path_segment in location:
+            keys = [key for key in data.keys() if path_segment in key]
+            if not keys or not keys[-1]:
+                return None
+            compilable = compilable and len(keys) == 1
+            matched_keys.append(keys[-1])
+            data = data[keys[-1]]
+
+        if compilable:
+            self._compiled_paths[location] = tuple(matched_keys)
+        return data
+
 class SRUExplainAutoParser():
 
     def __init__(self, sru_explain_dict: dict):
         self.sru_explain_dict = sru_explain_dict
         self.sru_config: SRUConfiguration = None
+        self._resolver = PropertyPathResolver()
 
     def get_sru_configuration_from_explain_response(self) -> SRUConfiguration:
 
         # Raise exception if the explainResponse can't be parsed.
         # Check validity - invalid ones will not contain explainResponse 
-        contains_explain_response = self._find_property_value(self.sru_explain_dict, ["explainResponse"])
-        if not contains_explain_response:
+        if not self._contains_explain_response():
             raise NoExplainResponseException("ExplainResponse could not be parsed", self.sru_explain_dict)
 
         self.sru_config = SRUConfiguration()
-        self.sru_config.sru_version = self._find_property_value(self.sru_explain_dict, generic_driver["version"]["location"])
+        self.sru_config.sru_version = self._resolver.find_property_value(self.sru_explain_dict, generic_driver["version"]["location"])
         self._parse_context_set_and_index_info()
         self._parse_config_info()
         self._parse_schema_info()
        
         return self.sru_config
+
+    def _contains_explain_response(self) -> bool:
+        return bool(self._resolver.find_property_value(self.sru_explain_dict, ["explainResponse"]))
     
     def _parse_context_set_and_index_info(self):
         """Parses the context set and index information from the explainResponse.
+
+        This is a single pass over the indexes. Sortability is only reported if at least one index
+        includes sort information, which isn't known until every index has been read. So each
+        index's sort value is recorded as it's parsed, and they're all set to None at the end if
+        no index had sort information.
         
         Relies on the sru_explain_dict and sru_config property."""
-        index_information = self._find_property_value(self.sru_explain_dict, generic_driver["index"]["location"])
+        index_information = self._resolver.find_property_value(self.sru_explain_dict, generic_driver["index"]["location"])
+        if index_information is None:
+            raise ExplainResponseParserException("The explainResponse does not list any indexes", self.sru_explain_dict)
+        if isinstance(index_information, dict):
+            index_information = [index_information]
+
         self.sru_config.available_context_sets_and_indexes = {}
+        index_configs: list[dict] = []
+        sort_info_included_in_indexes = False
         for index in index_information:
-            id = self._find_property_value(index, generic_driver["index"]["idLocation"])
-            title = self._find_property_value(index, generic_driver["index"]["titleLocation"])
-            empty_term_supported, supported_relations = self._get_supported_relations_for_index(index)
-
-            # Get the sort information
-            sortable = None
-            sort_info_included_in_indexes = self._evaluate_if_sort_info_included_in_index_info()
-            if sort_info_included_in_indexes:
-                sort = self._find_property_value(index, generic_driver["index"]["sortLocation"])
-                if sort == "true":
-                    sortable = True
-                else:
-                    sortable = False
-
-            context_sets_that_include_this_index = self._find_property_value(index, ["map"])
-            if isinstance(context_sets_that_include_this_index, dict):
-                # A few indexes are part of multiple context sets, so
-                # I'll just loop over them. This means turning dicts into
-                # a list. 
-                context_sets_that_include_this_index = [context_sets_that_include_this_index]
-
-            for context_set in context_sets_that_include_this_index:
-                name = self._remove_set_from_index_name(self._find_property_value(context_set, ["name", "#text"]))
-                set = self._find_property_value(context_set, ["name", "@set"])
-
-                # If the set is not in the index and config info, add it
-                if set not in self.sru_config.available_context_sets_and_indexes:
-                    self.sru_config.available_context_sets_and_indexes[set] = {}
-
-                # Add the index to its set.
-                index_config = self._generate_index_config(title, id=id, sort=sortable, supported_relations=supported_relations, empty_term_supported=empty_term_supported)
-                self.sru_config.available_context_sets_and_indexes[set][name] = index_config
+            if self._parse_index(index, self.sru_config.available_context_sets_and_indexes, index_configs):
+                sort_info_included_in_indexes = True
+
+        if not sort_info_included_in_indexes:
+            for index_config in index_configs:
+                index_config["sort"] = None
+
+    def _parse_index(self, index: dict, available_context_sets_and_indexes: dict, index_configs: list[dict]) -> bool:
+        """Adds an index to each of the context sets it's mapped to, and appends its config to index_configs.
+
+        Returns whether the index includes sort information."""
+        id = self._resolver.find_property_value(index, generic_driver["index"]["idLocation"])
+        title = self._resolver.find_property_value(index, generic_driver["index"]["titleLocation"])
+        empty_term_supported, supported_relations = self._get_supported_relations_for_index(index)
+
+        # Get the sort information
+        sort = self._resolver.find_property_value(index, generic_driver["index"]["sortLocation"])
+        sortable = sort == "true"
+
+        context_sets_that_include_this_index = self._resolver.find_property_value(index, ["map"])
+        if isinstance(context_sets_that_include_this_index, dict):
+            # A few indexes are part of multiple context sets, so
+            # I'll just loop over them. This means turning dicts into
+            # a list. 
+            context_sets_that_include_this_index = [context_sets_that_include_this_index]
+
+        for context_set in context_sets_that_include_this_index:
+            name = self._remove_set_from_index_name(self._resolver.find_property_value(context_set, ["name", "#text"]))
+            set = self._resolver.find_property_value(context_set, ["name", "@set"])
+
+            # If the set is not in the index and config info, add it
+            if set not in available_context_sets_and_indexes:
+                available_context_sets_and_indexes[set] = {}
+
+            # Add the index to its set.
+            index_config = self._generate_index_config(title, id=id, sort=sortable, supported_relations=supported_relations, empty_term_supported=empty_term_supported)
+            available_context_sets_and_indexes[set][name] = index_config
+            index_configs.append(index_config)
+
+        return sort is not None
 
     def _parse_config_info(self):
         """Parses the configuration info from the explainResponse."""
 
-        default_information = self._find_property_value(self.sru_explain_dict, generic_driver["defaults"]["location"])
+        default_information = self._resolver.find_property_value(self.sru_explain_dict, generic_driver["defaults"]["location"])
         if default_information:
             if isinstance(default_information, dict):
                 default_information = [default_information]
 
             for default in default_information:
-                def_type = self._find_property_value(default, ["@type"])
-                value = self._find_property_value(default, ["#text"])
+                def_type = self._resolver.find_property_value(default, ["@type"])
+                value = self._resolver.find_property_value(default, ["#text"])
                 if def_type == "numberOfRecords":
                     self.sru_config.default_records_returned = int(value)
                 elif def_type == "contextSet":
@@ -119,27 +188,27 @@ class SRUExplainAutoParser():
                 elif def_type == "sortSchema":
                     self.sru_config.default_sort_schema = value
 
-        settings_information = self._find_property_value(self.sru_explain_dict, generic_driver["settings"]["location"])
+        settings_information = self._resolver.find_property_value(self.sru_explain_dict, generic_driver["settings"]["location"])
         if settings_information:
             if isinstance(settings_information, dict):
                 settings_information = [settings_information]
 
             for setting in settings_information:
-                setting_name = self._find_property_value(setting, ["@type"])
-                value = self._find_property_value(setting, ["#text"])
+                setting_name = self._resolver.find_property_value(setting, ["@type"])
+                value = self._resolver.find_property_value(setting, ["#text"])
 
                 if setting_name == "maximumRecords":
                     self.sru_config.max_records_supported = int(value)
 
-        supports_information = self._find_property_value(self.sru_explain_dict, generic_driver["supports"]["location"])
+        supports_information = self._resolver.find_property_value(self.sru_explain_dict, generic_driver["supports"]["location"])
         if supports_information:
             self.sru_config.supported_relation_modifiers = []
             if isinstance(supports_information, dict):
                 supports_information = [supports_information]
 
             for support_setting in supports_information:
-                if self._find_property_value(support_setting, ["@type"]) == "relationModifier":
-                    self.sru_config.supported_relation_modifiers.append(self._find_property_value(support_setting, ["#text"]))
+                if self._resolver.find_property_value(support_setting, ["@type"]) == "relationModifier":
+                    self.sru_config.supported_relation_modifiers.append(self._resolver.find_property_value(support_setting, ["#text"]))
 
 
     def _parse_schema_info(self):
@@ -155,7 +224,7 @@ class SRUExplainAutoParser():
         
         This information is optional to include in an SRU response, so we are setting it to None if the
         information cannot be found."""
-        schema_information = self._find_property_value(self.sru_explain_dict, generic_driver["schema"]["location"])
+        schema_information = self._resolver.find_property_value(self.sru_explain_dict, generic_driver["schema"]["location"])
         if not schema_information: return
         
         cleaned_record_schema_info: dict = {}
@@ -167,11 +236,11 @@ class SRUExplainAutoParser():
 
         for schema in schema_information:
             sort = True
-            if self._find_property_value(schema, ["@sort"]) == "false":
+            if self._resolver.find_property_value(schema, ["@sort"]) == "false":
                 sort = False
 
-            schema_name = self._find_property_value(schema, ["@name"])
-            schema_identifier = self._find_property_value(schema, ["@identifier"])
+            schema_name = self._resolver.find_property_value(schema, ["@name"])
+            schema_identifier = self._resolver.find_property_value(schema, ["@identifier"])
 
             cleaned_record_schema_info[schema_name] = {
                 "sort": sort,
@@ -195,12 +264,7 @@ class SRUExplainAutoParser():
         """
         data = input_dict
         for path_segment in location:
-            # Get the available keys and try to find a match
-            keys = data.keys()
-            actual_key = None
-            for key in keys:
-                if path_segment in key:
-                    actual_key = key
+            actual_key = SRUExplainAutoParser._match_key(data, path_segment)
 
             if actual_key:
                 data = data[actual_key]
@@ -208,24 +272,24 @@ class SRUExplainAutoParser():
                 return None
 
         return data
-    
-    def _evaluate_if_sort_info_included_in_index_info(self) -> bool:
-        sort_information_included_in_index_info = False
-        for index in self._find_property_value(self.sru_explain_dict, generic_driver["index"]["location"]):
-            sort_info = self._find_property_value(index, generic_driver["index"]["sortLocation"])
-            if sort_info != None:
-                sort_information_included_in_index_info = True
-                break
-
-        return sort_information_included_in_index_info
-        
 
+    @staticmethod
+    def _match_key(data: dict, path_segment: str) -> str | None:
+        """Returns the last key of 'data' that includes path_segment, or None if no key does."""
+        # Get the available keys and try to find a match
+        keys = data.keys()
+        actual_key = None
+        for key in keys:
+            if path_segment in key:
+                actual_key = key
+        return actual_key
+    
     def _get_supported_relations_for_index(self, index) -> tuple[bool, list[str]]:
         """Get the relations supported by a CQL index.
         
         This takes a CQL index from the explainResponse after being parsed from xmltodict,
         and returns whether empty terms are supported and the other terms that are supported"""
-        raw_supported_relations = self._find_property_value(index, generic_driver["index"]["supportedRelationsLocation"])
+        raw_supported_relations = self._resolver.find_property_value(index, generic_driver["index"]["supportedRelationsLocation"])
 
         if not raw_supported_relations:
             return None, None
@@ -233,10 +297,11 @@ class SRUExplainAutoParser():
         supported_relations: dict = []
         empty_term_supported = False
         for relation in raw_supported_relations:
-            if self._find_property_value(relation, ["@type"]) == "emptyTerm":
+            relation_type = self._resolver.find_property_value(relation, ["@type"])
+            if relation_type == "emptyTerm":
                 empty_term_supported = True
-            elif self._find_property_value(relation, ["@type"]) == "relation":
-                supported_relations.append(self._find_property_value(relation, ["#text"]))
+            elif relation_type == "relation":
+                supported_relations.append(self._resolver.find_property_value(relation, ["#text"]))
 
         return empty_term_supported, supported_relations
     
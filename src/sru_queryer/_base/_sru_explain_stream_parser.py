@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+from typing import BinaryIO, Iterable
+from xml.parsers import expat
+
+from ._sru_configuration import SRUConfiguration
+from ._sru_explain_auto_parser import SRUExplainAutoParser, generic_driver
+from ._exceptions import ExplainResponseParserException
+from ._xml_source import read_chunks
+
+class _PathNode():
+    """A node in the tree of driver locations. 'leaf' is None for elements that are only on the
+    way to a location, "capture" for elements that are converted in full, and "index" for index
+    elements, which are parsed as soon as they've been read."""
+
+    def __init__(self):
+        self.children: dict[str, _PathNode] = {}
+        self.leaf: str | None = None
+
+def _build_path_tree() -> _PathNode:
+    root = _PathNode()
+    locations = [
+        (generic_driver["version"]["location"], "capture"),
+        (generic_driver["index"]["location"], "index"),
+        (generic_driver["schema"]["location"], "capture"),
+        (generic_driver["defaults"]["location"], "capture"),
+        (generic_driver["settings"]["location"], "capture"),
+        (generic_driver["supports"]["location"], "capture")
+    ]
+    for location, leaf in locations:
+        node = root
+        for path_segment in location:
+            node = node.children.setdefault(path_segment, _PathNode())
+        node.leaf = leaf
+    return root
+
+class _Frame():
+    """An element that is currently open."""
+    __slots__ = ("name", "item", "data", "nodes", "capture", "omitted")
+
+    def __init__(self, name: str, item: dict | None, nodes: list[_PathNode], capture: str | None):
+        self.name = name
+        self.item = item
+        self.data: list[str] = []
+        self.nodes = nodes
+        self.capture = capture
+        self.omitted = False
+
+class _IndexGroup():
+    """The indexes read from one path. There's almost always just one, but the dict parser decides
+    which path holds the indexes only once the whole document has been read, so every path that
+    could is kept."""
+
+    def __init__(self):
+        self.available_context_sets_and_indexes: dict = {}
+        self.index_configs: list[dict] = []
+        self.sort_info_included_in_indexes = False
+        self.exception: Exception | None = None
+
+class SRUExplainStreamParser(SRUExplainAutoParser):
+    """Parses an explainResponse straight from its XML, without converting the whole document with xmltodict first.
+
+    The XML is read with expat. Only the elements that SRUExplainAutoParser looks at are converted,
+    into exactly the values xmltodict would have produced, and everything else is skipped as it's
+    read. Each index is parsed (and then discarded) as soon as its end tag is read, so large
+    explainResponses like the Library of Congress's never have to be held in memory as a tree.
+    The resulting configuration is identical to SRUExplainAutoParser's, and so are the exceptions
+    raised for a document that isn't an explainResponse.
+
+    The source can be the response bytes, a binary file-like object, or an iterable of byte chunks.
+    Raises xml.parsers.expat.ExpatError if the source isn't XML."""
+
+    _path_tree = _build_path_tree()
+
+    def __init__(self, source: bytes | BinaryIO | Iterable[bytes], chunk_size: int = 65536):
+        super().__init__(None)
+        self.source = source
+        self.chunk_size = chunk_size
+        self._index_groups: dict[tuple[str, ...], _IndexGroup] = {}
+
+    def get_sru_configuration_from_explain_response(self) -> SRUConfiguration:
+        # The explain dict only contains the elements on the driver's locations, with each index
+        # element replaced by the key of the group its results were added to.
+        self.sru_explain_dict = self._read_explain_dict()
+        return super().get_sru_configuration_from_explain_response()
+
+    def _contains_explain_response(self) -> bool:
+        # An explainResponse whose children were all skipped is an empty dict here, where the full
+        # dict would still have (truthy) content, so only check that it isn't empty.
+        return self._resolver.find_property_value(self.sru_explain_dict, ["explainResponse"]) is not None
+
+    def _parse_context_set_and_index_info(self):
+        """Uses the indexes parsed while reading the document, from the path the dict parser would have read them from."""
+        group_key = self._resolver.find_property_value(self.sru_explain_dict, generic_driver["index"]["location"])
+        if isinstance(group_key, list):
+            group_key = group_key[0]
+
+        self.sru_config.available_context_sets_and_indexes = {}
+        if group_key is None:
+            raise ExplainResponseParserException("The explainResponse does not list any indexes", self.sru_explain_dict)
+
+        group = self._index_groups[group_key]
+        if group.exception:
+            raise group.exception
+
+        self.sru_config.available_context_sets_and_indexes = group.available_context_sets_and_indexes
+        if not group.sort_info_included_in_indexes:
+            for index_config in group.index_configs:
+                index_config["sort"] = None
+
+    def _read_explain_dict(self) -> dict:
+        # Mirrors the expat settings xmltodict uses, so names, attributes, and text come out the same.
+        parser = expat.ParserCreate()
+        parser.ordered_attributes = True
+        parser.buffer_text = True
+        parser.DefaultHandler = lambda data: None
+        parser.ExternalEntityRefHandler = lambda *args: 1
+
+        stack: list[_Frame] = []
+        path_names: list[str] = []
+        # The document is held in a root frame, like xmltodict's result
+        root = _Frame("", None, [self._path_tree], None)
+        stack.append(root)
+        # The number of open elements that are being skipped
+        skipped_depth = 0
+
+        def start_element(name: str, attributes: list[str]):
+            nonlocal skipped_depth
+            if skipped_depth:
+                skipped_depth += 1
+                return
+
+            parent = stack[-1]
+            # Elements inside an index or another captured element are converted along with it
+            capture = "capture" if parent.capture else None
+            nodes = []
+            if not capture:
+                nodes = [child for node in parent.nodes for path_segment, child in node.children.items() if path_segment in name]
+                if not nodes:
+                    parent.omitted = True
+                    skipped_depth = 1
+                    return
+                leaves = [node.leaf for node in nodes if node.leaf]
+                if leaves:
+                    capture = "index" if "index" in leaves else "capture"
+                    nodes = []
+
+            item = None
+            if attributes:
+                item = {f"@{attributes[i]}": attributes[i + 1] for i in range(0, len(attributes), 2)}
+            stack.append(_Frame(name, item, nodes, capture))
+            path_names.append(name)
+
+        def end_element(name: str):
+            nonlocal skipped_depth
+            if skipped_depth:
+                skipped_depth -= 1
+                return
+
+            frame = stack.pop()
+            value = self._get_value(frame)
+            if frame.capture == "index":
+                value = self._add_index(tuple(path_names), value)
+            path_names.pop()
+            parent = stack[-1]
+            parent.item = self._push_data(parent.item, frame.name, value)
+
+        def character_data(data: str):
+            if not skipped_depth:
+                stack[-1].data.append(data)
+
+        parser.StartElementHandler = start_element
+        parser.EndElementHandler = end_element
+        parser.CharacterDataHandler = character_data
+
+        for chunk in read_chunks(self.source, self.chunk_size):
+            parser.Parse(chunk, False)
+        parser.Parse(b"", True)
+
+        # A document that isn't an explainResponse has nothing on the driver's locations
+        return root.item if root.item is not None else {}
+
+    def _add_index(self, group_key: tuple[str, ...], index: dict) -> tuple[str, ...]:
+        """Parses an index into its group's results, and returns the group's key to stand in for it."""
+        group = self._index_groups.get(group_key)
+        if group is None:
+            group = self._index_groups[group_key] = _IndexGroup()
+
+        # The dict parser only fails once it has read the whole document (and found that it's an
+        # explainResponse), so save the exception until then.
+        if group.exception is None:
+            try:
+                if self._parse_index(index, group.available_context_sets_and_indexes, group.index_configs):
+                    group.sort_info_included_in_indexes = True
+            except Exception as e:
+                group.exception = e
+        return group_key
+
+    @staticmethod
+    def _get_value(frame: _Frame) -> dict | str | None:
+        """Returns the value xmltodict would give an element."""
+        data = "".join(frame.data).strip() or None
+        item = frame.item
+        if frame.omitted and item is None:
+            # An element with skipped children is still a dict, as it would be in the full dict
+            item = {}
+        if item is None:
+            return data
+        if data:
+            SRUExplainStreamParser._push_data(item, "#text", data)
+        return item
+
+    @staticmethod
+    def _push_data(item: dict | None, key: str, data) -> dict:
+        """Adds a value to an element's dict, turning repeated keys into lists as xmltodict does."""
+        if item is None:
+            item = {}
+        if key in item:
+            value = item[key]
+            if isinstance(value, list):
+                value.append(data)
+            else:
+                item[key] = [value, data]
+        else:
+            item[key] = data
+        return item
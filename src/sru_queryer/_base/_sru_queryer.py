@@ -1,57 +1,900 @@
 from __future__ import annotations
 
+import concurrent.futures
+import hashlib
 import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterator
+from xml.etree import ElementTree
+from xml.parsers import expat
 import xmltodict
 import requests
 from requests import Request
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import DecodeError, ProtocolError, ReadTimeoutError
 
 from ._sru_aux_formatter import SRUAuxiliaryFormatter
-from ._exceptions import NoExplainResponseException, ExplainResponseContentTypeException, ExplainResponseParserException
+from ._exceptions import NoExplainResponseException, ExplainResponseContentTypeException, ExplainResponseParserException, DeadlineExceededException
 from ._sru_explain_auto_parser import SRUExplainAutoParser
+from ._sru_explain_stream_parser import SRUExplainStreamParser
 from ._sru_configuration import SRUConfiguration
+from ._index_catalog import IndexCatalog
+from ._explain_cache import ExplainCache
+from ._result_cache import ResultCacheBase
+from ._single_flight import SingleFlight
+from ._rate_limiter import RateLimiter
+from ._retry_policy import RetryPolicy
+from ._circuit_breaker import CircuitBreaker
+from ._deadline import Deadline
+from ._endpoint_selector import Endpoint, EndpointSelector
+from ._hedging_policy import HedgingPolicy
 from ._search_clause import SearchClause
 from ._raw_cql import RawCQL
 from ._cql_boolean_operators import CQLBooleanOperatorBase
 from ._sort_key import SortKey
 from ._search_retrieve import SearchRetrieve
+from ._search_retrieve_result import SearchRetrieveResult
+from ._search_retrieve_response_parser import SearchRetrieveResponseParser
 
 class SRUQueryer():
     supported_sru_versions = ["1.2", "1.1"]
+    explain_parsers = ["xmltodict", "stream"]
     
-    def __init__(self, server_url: str = None, sru_version: str = None, username: str | None = None, password: str | None = None, default_cql_context_set: str | None = None, default_cql_index: str | None = None, default_cql_relation: str | None = None, disable_validation_for_cql_defaults: bool = False, max_records_supported: int | None = None, default_records_returned: int | None = None , default_record_schema: str | None = None, default_sort_schema: str | None = None, from_dict: dict | None = None):
-        """Raises ExplainResponseContentTypeException, NoExplainResponseException, ExplainResponseParserException, or PermissionError"""
+    def __init__(self, server_url: str = None, sru_version: str = None, username: str | None = None, password: str | None = None, default_cql_context_set: str | None = None, default_cql_index: str | None = None, default_cql_relation: str | None = None, disable_validation_for_cql_defaults: bool = False, max_records_supported: int | None = None, default_records_returned: int | None = None , default_record_schema: str | None = None, default_sort_schema: str | None = None, from_dict: dict | None = None, pool_connections: int = 10, pool_maxsize: int = 10, pool_block: bool = False, keep_alive: bool = True, explain_cache: ExplainCache | None = None, lazy: bool = False, explain_xml: bytes | str | os.PathLike | None = None, explain_parser: str = "xmltodict", compact_configuration: bool = False, result_cache: ResultCacheBase | None = None, coalesce_requests: bool = False, rate_limiter: RateLimiter | None = None, retry_policy: RetryPolicy | None = None, circuit_breaker: CircuitBreaker | None = None, connect_timeout: float | None = None, read_timeout: float | None = None, mirrors: list[str] | None = None, hedging_policy: HedgingPolicy | None = None):
+        """Raises ExplainResponseContentTypeException, NoExplainResponseException, ExplainResponseParserException, or PermissionError
+
+        If lazy is True, the explainResponse isn't requested until the configuration is first
+        needed, and those exceptions are raised from that call instead.
+
+        If explain_xml is provided (the explainResponse as bytes or an XML string, or the path of a
+        file containing it), it's parsed instead of requesting the explainResponse from the server.
+
+        explain_parser is "xmltodict" (the default) or "stream", which reads the explainResponse
+        without converting the whole document to a dict first. Both produce the same configuration.
+
+        If compact_configuration is True, the configuration's indexes are stored in a compact,
+        read-only IndexCatalog (see SRUConfiguration.compact).
+
+        If result_cache is set, searchRetrieve responses are stored in it and repeated requests
+        for the same URL (with the same credentials) are answered from it (unless use_cache=False
+        is passed). Entries for requests with credentials are keyed by the URL and a hash of the
+        credentials, so queryers with different credentials can share a cache safely.
+
+        If coalesce_requests is True, threads that send the same searchRetrieve request while it's
+        already in flight wait for it and share its response (or exception) instead of sending it again.
+
+        If rate_limiter is set, every request (explain and searchRetrieve) waits for it before
+        being sent, and reports the response's status and Retry-After header to it.
+
+        If retry_policy is set, requests that fail with a connection error, a timeout, or a
+        retryable status are sent again after a jittered backoff. If circuit_breaker is set,
+        requests raise CircuitOpenException instead of being sent while the server is failing.
+
+        connect_timeout and read_timeout are the number of seconds to wait for a connection to the
+        server, and for each read from it, on every request. By default, requests wait forever.
+
+        mirrors are other base URLs that serve the same database as server_url (for instance,
+        disaster recovery or regional copies). Each request is sent to whichever endpoint is
+        currently fastest and healthiest, and fails over to the others if it fails. The
+        statistics are in queryer.endpoint_selector.
+
+        If hedging_policy is set, a searchRetrieve request that's slower than most (see
+        HedgingPolicy) is sent a second time, to a mirror if there is one, and whichever response
+        arrives first is used."""
+        if explain_parser not in self.explain_parsers:
+            raise ValueError(f"Explain parser {explain_parser} is not supported. Use one of: {", ".join(self.explain_parsers)}")
+
+        # Every request (explain and searchRetrieve) goes through this session, so connections are reused between calls.
+        self._session = self._create_session(pool_connections, pool_maxsize, pool_block, keep_alive)
+        self._sru_configuration: SRUConfiguration | None = None
+        self._provisional_configuration: SRUConfiguration | None = None
+        self._configuration_lock = threading.Lock()
+        self._compact_configuration = compact_configuration
+        self.result_cache = result_cache
+        self._single_flight = SingleFlight() if coalesce_requests else None
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self._timeout = (connect_timeout, read_timeout) if connect_timeout is not None or read_timeout is not None else None
+        self.endpoint_selector = self._create_endpoint_selector(server_url or (from_dict or {}).get("server_url"), mirrors) if mirrors else None
+        self.hedging_policy = hedging_policy
+        # Hedged requests are sent from a pool of threads, so the caller can take whichever copy finishes first
+        self._hedge_executor: ThreadPoolExecutor | None = None
+        self._hedge_executor_workers = 2 * pool_maxsize
+        self._hedge_executor_lock = threading.Lock()
+
         # Ability to load from saved configuration. DO NOT CREATE MANUALLY.
         if from_dict:
-            self.sru_configuration = SRUConfiguration(from_dict)
+            self._sru_configuration = SRUConfiguration(from_dict)
+            if compact_configuration:
+                self._sru_configuration.compact()
+            return
+
+        self._user_settings = {
+            "server_url": server_url,
+            "username": username,
+            "password": password,
+            "default_cql_context_set": default_cql_context_set,
+            "default_cql_index": default_cql_index,
+            "default_cql_relation": default_cql_relation,
+            "disable_validation_for_cql_defaults": disable_validation_for_cql_defaults,
+            "max_records_supported": max_records_supported,
+            "default_records_returned": default_records_returned,
+            "default_record_schema": default_record_schema,
+            "default_sort_schema": default_sort_schema
+        }
+        self._sru_version = sru_version
+        self._explain_cache = explain_cache
+        self._explain_xml = explain_xml
+        self._explain_parser = explain_parser
+
+        if not lazy:
+            self.load_configuration()
+
+    @classmethod
+    def from_explain_xml(cls, explain_xml: bytes | str | os.PathLike, server_url: str | None = None, **kwargs) -> SRUQueryer:
+        """Creates an SRUQueryer from a saved explainResponse, without contacting the SRU server.
+
+        explain_xml is the explainResponse as bytes or an XML string, or the path of a file
+        containing it. server_url is the server that searchRetrieve requests are sent to. Takes the
+        same keyword arguments as the constructor, which override the explainResponse in the same way.
+
+        Raises ExplainResponseContentTypeException, ExplainResponseParserException, or OSError if the file can't be read"""
+        return cls(server_url, explain_xml=explain_xml, **kwargs)
+
+    @classmethod
+    def from_configuration(cls, sru_configuration: SRUConfiguration, compact_configuration: bool = False) -> SRUQueryer:
+        """Creates an SRUQueryer from a saved SRUConfiguration (for instance, one loaded from a
+        ConfigurationBundle), without contacting the SRU server, in the same way as from_dict."""
+        # A shallow copy, so a compact configuration keeps its IndexCatalog
+        return cls(from_dict=dict(sru_configuration.__dict__), compact_configuration=compact_configuration)
+
+    @property
+    def sru_configuration(self) -> SRUConfiguration:
+        """The configuration of the queryer. In lazy mode, the first access loads it from the explainResponse."""
+        if self._sru_configuration is None:
+            return self.load_configuration()
+        return self._sru_configuration
+
+    @sru_configuration.setter
+    def sru_configuration(self, sru_configuration: SRUConfiguration):
+        self._sru_configuration = sru_configuration
+
+    def is_configuration_loaded(self) -> bool:
+        """Whether the configuration has been loaded. Always True unless the queryer is lazy."""
+        return self._sru_configuration is not None
+
+    def load_configuration(self) -> SRUConfiguration:
+        """Retrieves and parses the explainResponse, unless the configuration is already loaded.
+
+        Only one thread loads the configuration - any others that need it at the same time wait
+        for it to finish. If loading fails, the exception is raised and the next call tries again.
+
+        Raises ExplainResponseContentTypeException, NoExplainResponseException, ExplainResponseParserException, or PermissionError"""
+        if self._sru_configuration is not None:
+            return self._sru_configuration
+
+        with self._configuration_lock:
+            if self._sru_configuration is None:
+                sru_version_to_use = self._resolve_sru_version(self._sru_version)
+                if self._explain_xml is not None:
+                    configuration = self._parse_local_explain_xml(self._explain_xml, self._explain_parser)
+                else:
+                    configuration = self._load_explain_configuration(self._user_settings["server_url"], sru_version_to_use, self._user_settings["username"], self._user_settings["password"], self._explain_cache)
+                configuration = self._merge_user_settings(configuration, self._sru_version, sru_version_to_use, **self._user_settings)
+                if self._compact_configuration:
+                    configuration.compact()
+                self._sru_configuration = configuration
+        return self._sru_configuration
+
+    def search_retrieve(self, cql_query: SearchClause | CQLBooleanOperatorBase | RawCQL | None = None, start_record: int | None = None, maximum_records: int | None = None, record_schema: str | None = None, sort_queries: list[dict] | list[SortKey] | None = None, record_packing: str | None = None, validate: bool = True, from_dict: dict | None = None, use_cache: bool = True, deadline: float | None = None) -> bytes:
+        """Conducts a searchRetrieve request and returns the response.
+
+        This will throw ValueErrors for any incorrect portion of the query. 
+        
+        This function does not handle any errors in the searchRetrieveResponse.
+
+        If the queryer has a result_cache, a cached response for the same URL is returned instead
+        of sending the request, unless use_cache is False.
+
+        deadline is the number of seconds the whole call (including any retries) may take, after
+        which DeadlineExceededException is raised. It starts once the query has been built, so it
+        doesn't cover loading a lazy queryer's configuration (one explain request, shared by every
+        caller) - set connect_timeout and read_timeout to limit that."""
+        query = SearchRetrieve(self._get_configuration_for_query(validate), cql_query, start_record, maximum_records, record_schema, sort_queries, record_packing, from_dict)
+        if validate:
+            query.validate()
+        request = query.construct_request()
+        call_deadline = Deadline(deadline) if deadline is not None else None
+        return self._get_search_retrieve_content(request, use_cache, call_deadline)
+    
+    def stream_search_retrieve(self, cql_query: SearchClause | CQLBooleanOperatorBase | RawCQL | None = None, start_record: int | None = None, maximum_records: int | None = None, record_schema: str | None = None, sort_queries: list[dict] | list[SortKey] | None = None, record_packing: str | None = None, validate: bool = True, from_dict: dict | None = None, deadline: float | None = None) -> SearchRetrieveResponseParser:
+        """Conducts a searchRetrieve request, and returns a parser that reads the response as it arrives.
+
+        Iterating over the parser yields each record (as an SRURecord) while the rest of the
+        response is still downloading, so large pages never have to be held in memory at once.
+        The parser's number_of_records, next_record_position and diagnostics are filled in as
+        they are read. The connection is released once all the records have been read, or when
+        the parser is closed - use it as a context manager if you might not read every record. The
+        records can only be iterated over once.
+
+        deadline is the number of seconds to wait for the response to start arriving. After that,
+        only the read timeout applies to reading it. As in search_retrieve, it starts once the
+        query has been built."""
+        query = SearchRetrieve(self._get_configuration_for_query(validate), cql_query, start_record, maximum_records, record_schema, sort_queries, record_packing, from_dict)
+        if validate:
+            query.validate()
+        request = query.construct_request()
+        call_deadline = Deadline(deadline) if deadline is not None else None
+        logging.info(f"Querying {request.url}")
+        response = self._send(request, stream=True, deadline=call_deadline)
+        return SearchRetrieveResponseParser(response)
+
+    def search_retrieve_many(self, queries: list[SearchClause | CQLBooleanOperatorBase | RawCQL | dict], max_workers: int = 10, as_completed: bool = False, start_record: int | None = None, maximum_records: int | None = None, record_schema: str | None = None, sort_queries: list[dict] | list[SortKey] | None = None, record_packing: str | None = None, validate: bool = True, use_cache: bool = True, deadline: float | None = None) -> list[SearchRetrieveResult] | Iterator[SearchRetrieveResult]:
+        """Conducts many independent searchRetrieve requests concurrently.
+
+        Each query can be a CQL query object or a query dict (the same format as search_retrieve's
+        from_dict). The other arguments apply to every query, but are overwritten by any values in
+        a query dict. All the requests are validated and constructed before any are sent, and are
+        then sent from a pool of max_workers threads over the queryer's session. For best results,
+        max_workers should not be larger than pool_maxsize.
+
+        A query that fails does not stop the batch - its SearchRetrieveResult holds the exception.
+        By default, the results are returned as a list in the same order as the queries. If
+        as_completed is True, an iterator is returned instead which yields each result as soon as
+        it's ready.
+
+        deadline is the number of seconds the whole batch may take. Queries that haven't finished
+        by then get a result whose exception is a DeadlineExceededException. It starts once every
+        query has been built."""
+        prepared_requests: list[tuple[int, Request]] = []
+        failed_results: list[SearchRetrieveResult] = []
+        for index, query in enumerate(queries):
+            cql_query, query_dict = (None, query) if isinstance(query, dict) else (query, None)
+            try:
+                request = self.construct_search_retrieve_request(cql_query, start_record, maximum_records, record_schema, sort_queries, record_packing, validate, query_dict)
+            except Exception as e:
+                failed_results.append(SearchRetrieveResult(index, exception=e))
+                continue
+            prepared_requests.append((index, request))
+
+        call_deadline = Deadline(deadline) if deadline is not None else None
+        results = self._send_many(prepared_requests, failed_results, max_workers, use_cache, call_deadline)
+        if as_completed:
+            return results
+        return sorted(results, key=lambda result: result.index)
+
+    def iter_pages(self, cql_query: SearchClause | CQLBooleanOperatorBase | RawCQL | None = None, page_size: int | None = None, start_record: int | None = None, max_records: int | None = None, record_schema: str | None = None, sort_queries: list[dict] | list[SortKey] | None = None, record_packing: str | None = None, validate: bool = True, from_dict: dict | None = None, prefetch: int = 0, use_cache: bool = True, deadline: float | None = None) -> Iterator[bytes]:
+        """Pages through the results of a searchRetrieve request, yielding the content of each response.
+
+        Pages are requested lazily - the next one is only sent once the caller asks for it - so only
+        one page is held in memory at a time. The position of the next page is read from each
+        response's nextRecordPosition, and paging stops when the server stops returning one, when
+        numberOfRecords is reached, or once max_records records have been requested.
+
+        page_size defaults to the default number of records returned, and is clamped to the
+        max_records_supported of the configuration.
+
+        If prefetch is more than 0, up to that many of the following pages are requested in the
+        background while the caller works on the current one. Since those requests are sent before
+        the current page has arrived, their positions are counted from the numberOfRecords of the
+        first response rather than read from nextRecordPosition.
+
+        deadline is the number of seconds that paging may take, counted from when the first page
+        is requested (including the time the caller spends on each page). Once it has run out,
+        DeadlineExceededException is raised instead of requesting the next page. Loading a lazy
+        queryer's configuration isn't counted."""
+        query = SearchRetrieve(self._get_configuration_for_query(validate), cql_query, start_record, page_size, record_schema, sort_queries, record_packing, from_dict)
+
+        configuration = query.sru_configuration
+        page_size = query.maximum_records or configuration.default_records_returned or configuration.max_records_supported or 10
+        if configuration.max_records_supported and page_size > configuration.max_records_supported:
+            logging.info(f"Page size {page_size} is larger than the maximum records supported. Using {configuration.max_records_supported}...")
+            page_size = configuration.max_records_supported
+        query.maximum_records = page_size
+        query.start_record = query.start_record or 1
+
+        if validate:
+            query.validate()
+
+        call_deadline = Deadline(deadline) if deadline is not None else None
+        if prefetch > 0:
+            yield from self._iter_pages_with_prefetch(query, page_size, max_records, prefetch, use_cache, call_deadline)
             return
+
+        records_requested = 0
+        while True:
+            if max_records is not None:
+                if records_requested >= max_records:
+                    return
+                query.maximum_records = min(page_size, max_records - records_requested)
+
+            request = query.construct_request()
+            content = self._get_search_retrieve_content(request, use_cache, call_deadline)
+            records_requested += query.maximum_records
+            yield content
+
+            next_record_position = self._get_next_record_position(content, query.start_record, query.maximum_records)
+            if next_record_position is None:
+                return
+            query.start_record = next_record_position
+
+    def construct_search_retrieve_request(self, cql_query: SearchClause | CQLBooleanOperatorBase | RawCQL | None = None, start_record: int | None = None, maximum_records: int | None = None, record_schema: str | None = None, sort_queries: list[dict] | list[SortKey] | None = None, record_packing: str | None = None, validate: bool = True, from_dict: dict | None = None) -> Request:
+        """Construct a requests.Request object, which you can then prepare and use.
         
+        This is helpful (as compared to search_retrieve) when you want to create a request, and perhaps modify it
+        or use it with your own session mechanism."""
+        query = SearchRetrieve(self._get_configuration_for_query(validate), cql_query, start_record, maximum_records, record_schema, sort_queries, record_packing, from_dict)
+        if validate:
+            query.validate()
+        return query.construct_request()
+    
+    def format_available_indexes(self, filename: str | None = None, print_to_console: bool = True, title_filter: str | None = None):
+        """Formats available indexes, and prints to the console by default.
+
+        Can also print to a file and disable printing to the console."""
+        available_context_sets_and_indexes = self.sru_configuration.available_context_sets_and_indexes
+
+        if title_filter:
+            available_context_sets_and_indexes = self._filter_available_context_sets_and_indexes(
+                available_context_sets_and_indexes, title_filter)
+
+        SRUAuxiliaryFormatter.format_available_indexes(available_context_sets_and_indexes, filename, print_to_console)
+
+    def get_configuration(self):
+        """Returns the configuration as a dict, which can be passed back in as from_dict.
+
+        For a compact configuration, this is a copy with the indexes turned back into dicts.
+        Otherwise, it's the configuration's own __dict__, so changes to it change the queryer."""
+        configuration = self.sru_configuration
+        if isinstance(configuration.available_context_sets_and_indexes, IndexCatalog):
+            return configuration.to_dict()
+        return configuration.__dict__
+
+    def close(self):
+        """Closes the pooled connections held by this queryer."""
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False, cancel_futures=True)
+            self._hedge_executor = None
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _get_configuration_for_query(self, validate: bool) -> SRUConfiguration:
+        """Returns the configuration to build a query with.
+
+        Unvalidated queries made before a lazy queryer has loaded its configuration use a
+        provisional one made from the constructor's settings, so they don't wait for the
+        explainResponse. It uses the requested SRU version (or 1.2), which the server may not."""
+        if validate or self._sru_configuration is not None:
+            return self.sru_configuration
+
+        if self._provisional_configuration is None:
+            sru_version_to_use = self._resolve_sru_version(self._sru_version)
+            configuration = SRUConfiguration()
+            configuration.sru_version = sru_version_to_use
+            self._provisional_configuration = self._merge_user_settings(configuration, sru_version_to_use, sru_version_to_use, **self._user_settings)
+        return self._provisional_configuration
+
+    def _iter_pages_with_prefetch(self, query: SearchRetrieve, page_size: int, max_records: int | None, prefetch: int, use_cache: bool = True, deadline: Deadline | None = None) -> Iterator[bytes]:
+        """Pages through results like iter_pages, keeping up to 'prefetch' of the following pages requested in the background."""
+        if max_records is not None:
+            query.maximum_records = min(page_size, max_records)
+
+        request = query.construct_request()
+        content = self._get_search_retrieve_content(request, use_cache, deadline)
+
+        try:
+            number_of_records, _ = SearchRetrieveResponseParser.parse_pagination_info(content)
+        except ElementTree.ParseError:
+            logging.warning("Could not parse the searchRetrieveResponse to find the next page.")
+            number_of_records = None
+        if number_of_records is None:
+            yield content
+            return
+
+        last_record = number_of_records
+        if max_records is not None:
+            last_record = min(last_record, query.start_record + max_records - 1)
+        page_starts = iter(range(query.start_record + query.maximum_records, last_record + 1, page_size))
+
+        executor = ThreadPoolExecutor(max_workers=prefetch)
+        pending: deque[tuple[Future, Request]] = deque()
+
+        def request_next_page():
+            start = next(page_starts, None)
+            if start is None:
+                return
+            query.start_record = start
+            query.maximum_records = min(page_size, last_record - start + 1)
+            request = query.construct_request()
+            pending.append((executor.submit(self._get_search_retrieve_content, request, use_cache, deadline), request))
+
+        try:
+            # Fill the buffer before handing over the first page, so the following pages are
+            # already on their way while the caller works on it
+            for _ in range(prefetch):
+                request_next_page()
+            yield content
+
+            while pending:
+                future, request = pending.popleft()
+                try:
+                    content = future.result(timeout=deadline.remaining() if deadline is not None else None)
+                except concurrent.futures.TimeoutError:
+                    pending.appendleft((future, request))
+                    raise deadline.exceeded(request.url)
+                # Keep the buffer full while the caller works on this page
+                request_next_page()
+                yield content
+        finally:
+            for future, _ in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    @staticmethod
+    def _get_next_record_position(content: bytes, start_record: int, maximum_records: int) -> int | None:
+        """Works out where the page after a searchRetrieveResponse starts, or returns None if it was the last page."""
+        try:
+            number_of_records, next_record_position = SearchRetrieveResponseParser.parse_pagination_info(content)
+        except ElementTree.ParseError:
+            logging.warning("Could not parse the searchRetrieveResponse to find the next page.")
+            return None
+
+        # Some servers don't send nextRecordPosition, so fall back to counting.
+        if next_record_position is None and number_of_records is not None:
+            if start_record + maximum_records <= number_of_records:
+                next_record_position = start_record + maximum_records
+
+        # Stop rather than request the same page again
+        if next_record_position is None or next_record_position <= start_record:
+            return None
+        return next_record_position
+
+    def _send_many(self, prepared_requests: list[tuple[int, Request]], failed_results: list[SearchRetrieveResult], max_workers: int, use_cache: bool = True, deadline: Deadline | None = None) -> Iterator[SearchRetrieveResult]:
+        """Submits requests to a thread pool, and returns an iterator yielding a SearchRetrieveResult for each as it completes."""
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        futures = {}
+        for index, request in prepared_requests:
+            futures[executor.submit(self._get_search_retrieve_content, request, use_cache, deadline)] = (index, request)
+        executor.shutdown(wait=False)
+
+        def collect_results():
+            yield from failed_results
+            finished = set()
+            try:
+                for future in concurrent.futures.as_completed(futures, timeout=deadline.remaining() if deadline is not None else None):
+                    finished.add(future)
+                    index, request = futures[future]
+                    try:
+                        yield SearchRetrieveResult(index, content=future.result(), url=request.url)
+                    except Exception as e:
+                        yield SearchRetrieveResult(index, exception=e, url=request.url)
+            except concurrent.futures.TimeoutError:
+                for future, (index, request) in futures.items():
+                    if future not in finished:
+                        future.cancel()
+                        yield SearchRetrieveResult(index, exception=deadline.exceeded(request.url), url=request.url)
+            finally:
+                # If the caller stops iterating early, don't send the requests that haven't started.
+                for future in futures:
+                    future.cancel()
+
+        return collect_results()
+
+    def _get_search_retrieve_content(self, request: Request, use_cache: bool = True, deadline: Deadline | None = None) -> bytes:
+        """Sends a searchRetrieve request and returns the response content, using the result cache if
+        there is one and joining an identical request that's already in flight if requests are coalesced.
+
+        Each caller only times out on its own deadline: waiting for a request in flight is limited
+        by it, and if the caller that sent the request runs out of time first, the request is sent
+        again for the callers that still have time.
+
+        Only successful (200) responses are cached."""
+        result_cache = self.result_cache if use_cache else None
+        if result_cache is not None:
+            content = result_cache.get(self._get_cache_key(request))
+            if content is not None:
+                logging.info(f"Using cached response for {request.url}")
+                return content
+
+        if self._single_flight is not None:
+            while True:
+                # Set if this caller ends up sending the request itself
+                sent: list[bool] = []
+
+                def send() -> bytes:
+                    sent.append(True)
+                    return self._send_search_retrieve_request(request, result_cache, deadline)
+
+                try:
+                    return self._single_flight.do(request.url, send, timeout=deadline.remaining() if deadline is not None else None)
+                except DeadlineExceededException as e:
+                    if sent:
+                        raise
+                    if deadline is not None and deadline.expired():
+                        raise deadline.exceeded(request.url) from e
+                    # The caller that sent the request ran out of time, but this one hasn't, so
+                    # send it again (or join whoever already has)
+                    logging.info(f"Identical request in flight ran out of time. Retrying {request.url}")
+                except TimeoutError as e:
+                    # Another caller's request, with a longer deadline (or none), is still in flight
+                    if deadline is not None and deadline.expired():
+                        raise deadline.exceeded(request.url) from e
+                    raise
+        return self._send_search_retrieve_request(request, result_cache, deadline)
+
+    @staticmethod
+    def _get_cache_key(request: Request) -> str:
+        """Returns the result cache key of a searchRetrieve request: its URL, followed by a hash of its
+        Authorization header if it has one, so queryers with different credentials that share a
+        cache never get each other's responses."""
+        authorization = request.headers.get("Authorization") if request.headers else None
+        if not authorization:
+            return request.url
+        if isinstance(authorization, str):
+            authorization = authorization.encode("utf-8")
+        return f"{request.url}#credentials={hashlib.sha256(authorization).hexdigest()}"
+
+    def _send_search_retrieve_request(self, request: Request, result_cache: ResultCacheBase | None, deadline: Deadline | None = None) -> bytes:
+        logging.info(f"Querying {request.url}")
+        if self.hedging_policy is not None:
+            response = self._send_hedged(request, deadline)
+        else:
+            response = self._send(request, deadline=deadline)
+        if result_cache is not None and response.status_code == 200:
+            result_cache.set(self._get_cache_key(request), response.content)
+        return response.content
+
+    def _send_hedged(self, request: Request, deadline: Deadline | None = None) -> requests.Response:
+        """Sends a request, and sends it again if it's still running after the hedging policy's
+        delay (and the budget allows). Returns the first response, or raises the first exception if
+        both copies fail.
+
+        A copy that's already being sent can't be interrupted, so the slower one is left to finish
+        in the background and its response is closed, releasing its connection."""
+        delay = self.hedging_policy.get_delay()
+        if delay is None:
+            return self._send_timed(request, deadline, None)
+
+        executor = self._get_hedge_executor()
+        shared_endpoints: list[Endpoint] = []
+        original = executor.submit(self._send_timed, request, deadline, shared_endpoints)
+        wait_timeout = min(delay, deadline.remaining()) if deadline is not None else delay
+        concurrent.futures.wait([original], timeout=wait_timeout)
+        if original.done() or (deadline is not None and deadline.expired()) or not self.hedging_policy.try_hedge():
+            return original.result()
+
+        logging.info(f"No response after {delay:.3f} seconds. Hedging {request.url}")
+        hedge = executor.submit(self._send_timed, request, deadline, shared_endpoints)
+        pending = {original, hedge}
+        first_exception = None
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self.hedging_policy.record_hedge_won()
+                    for other in pending:
+                        self._discard_response(other)
+                    return future.result()
+                # Prefer the original request's exception
+                if first_exception is None or future is original:
+                    first_exception = future.exception()
+        raise first_exception
+
+    def _send_timed(self, request: Request, deadline: Deadline | None, shared_endpoints: list[Endpoint] | None) -> requests.Response:
+        """Sends a request, recording how long it took for the hedging policy."""
+        started_at = time.monotonic()
+        response = self._send(request, deadline=deadline, shared_endpoints=shared_endpoints)
+        self.hedging_policy.record_latency(time.monotonic() - started_at)
+        return response
+
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        with self._hedge_executor_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(max_workers=self._hedge_executor_workers, thread_name_prefix="sru-hedge")
+            return self._hedge_executor
+
+    @staticmethod
+    def _discard_response(future: Future):
+        """Cancels a request that's no longer needed, or closes its response once it arrives."""
+        if future.cancel():
+            return
+
+        def close_response(future: Future):
+            if not future.cancelled() and future.exception() is None:
+                future.result().close()
+
+        future.add_done_callback(close_response)
+
+    def _send(self, request: Request, stream: bool = False, timeout: float | tuple[float | None, float | None] | None = None, deadline: Deadline | None = None, shared_endpoints: list[Endpoint] | None = None) -> requests.Response:
+        """Prepares a request and sends it over the queryer's pooled session.
+
+        timeout defaults to the queryer's connect and read timeouts. If there's a deadline, the
+        timeouts are cut down to the time it has left, and the request isn't kept waiting for the
+        rate limiter past it. Unless stream is True, the body is then read within the deadline too
+        (see _read_content), so a server that trickles it out can't hold the call up past it.
+        If the queryer has them, the request waits
+        for the rate limiter, fails fast while the circuit breaker is open, and is retried
+        according to the retry policy (while the deadline leaves time for another attempt).
+
+        If the queryer has mirrors, each attempt goes to the best endpoint, and a request that
+        fails (with a connection error, a timeout, or a failure status) is sent straight on to the
+        next endpoint it hasn't been sent to yet. shared_endpoints (used for hedged requests) are
+        the endpoints that other copies of the request have been sent to, which are avoided if
+        there are others. The endpoints this copy is sent to are added to it.
+
+        The circuit breaker guards the server as a whole rather than each endpoint: it's checked
+        once per attempt, before the first endpoint is tried, and hears one outcome per attempt -
+        a success if any endpoint answers, or a single failure if they all fail. So a failed
+        endpoint never stops the request from failing over to a healthy mirror, and failing over
+        across N endpoints doesn't count as N failures.
+
+        Raises CircuitOpenException, DeadlineExceededException, or the exception of the last attempt."""
+        if timeout is None:
+            timeout = self._timeout
+        prepared_request = self._session.prepare_request(request)
+        url = prepared_request.url
+        use_endpoints = self.endpoint_selector is not None and self.endpoint_selector.find(url) is not None
+        tried_endpoints: list[Endpoint] = []
+        attempt = 1
+        while True:
+            endpoint = None
+            # The circuit breaker already let this attempt through on the first endpoint
+            failing_over = bool(tried_endpoints)
+            if use_endpoints:
+                endpoint = self.endpoint_selector.choose(exclude=tried_endpoints + (shared_endpoints or []))
+                if endpoint is None:
+                    endpoint = self.endpoint_selector.choose(exclude=tried_endpoints)
+                tried_endpoints.append(endpoint)
+                if shared_endpoints is not None:
+                    shared_endpoints.append(endpoint)
+                prepared_request.url = self.endpoint_selector.rewrite_url(url, endpoint)
+            can_fail_over = use_endpoints and len(tried_endpoints) < len(self.endpoint_selector.endpoints)
+
+            # Everything that can stop the request before it's sent comes before the circuit
+            # breaker, which counts on every request it lets through being recorded.
+            try:
+                if self.rate_limiter is not None and not self.rate_limiter.acquire(deadline.remaining() if deadline is not None else None):
+                    raise deadline.exceeded(prepared_request.url)
+                if deadline is not None:
+                    deadline.check(prepared_request.url)
+            except DeadlineExceededException:
+                if failing_over and self.circuit_breaker is not None:
+                    self.circuit_breaker.record_failure()
+                raise
+            if self.circuit_breaker is not None and not failing_over:
+                self.circuit_breaker.before_request(prepared_request.url)
+
+            sent_at = time.monotonic()
+            try:
+                # With a deadline, the body is read separately, so the deadline can be checked while it arrives
+                response = self._session.send(prepared_request, stream=stream or deadline is not None, timeout=deadline.limit_timeout(timeout) if deadline is not None else timeout)
+            except Exception as e:
+                if endpoint is not None:
+                    self.endpoint_selector.record(endpoint, time.monotonic() - sent_at, failed=True)
+                deadline_exceeded = deadline is not None and isinstance(e, requests.Timeout) and deadline.expired()
+                fail_over = can_fail_over and isinstance(e, requests.RequestException) and not deadline_exceeded
+                if self.circuit_breaker is not None and not fail_over:
+                    self.circuit_breaker.record_failure()
+                if deadline_exceeded:
+                    raise deadline.exceeded(prepared_request.url) from e
+                if fail_over:
+                    logging.warning(f"Request to {prepared_request.url} failed ({e.__str__()}). Failing over to another endpoint...")
+                    continue
+                delay = self._get_retry_delay(prepared_request.method, attempt, deadline, exception=e)
+                if delay is None:
+                    raise
+                logging.warning(f"Request to {prepared_request.url} failed ({e.__str__()}). Retrying in {delay:.2f} seconds...")
+            else:
+                if endpoint is not None:
+                    self.endpoint_selector.record_response(endpoint, time.monotonic() - sent_at, response.status_code)
+                if self.rate_limiter is not None:
+                    self.rate_limiter.record_response(response.status_code, response.headers.get("Retry-After"))
+                if can_fail_over and self.endpoint_selector.is_failure_status(response.status_code):
+                    logging.warning(f"Request to {prepared_request.url} returned status {response.status_code}. Failing over to another endpoint...")
+                    response.close()
+                    continue
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record_response(response.status_code)
+                delay = self._get_retry_delay(prepared_request.method, attempt, deadline, status_code=response.status_code, retry_after=response.headers.get("Retry-After"))
+                if delay is None:
+                    if deadline is not None and not stream:
+                        self._read_content(response, deadline, prepared_request.url)
+                    return response
+                logging.warning(f"Request to {prepared_request.url} returned status {response.status_code}. Retrying in {delay:.2f} seconds...")
+                response.close()
+
+            time.sleep(delay)
+            attempt += 1
+            # A retry can go to any of the endpoints again
+            tried_endpoints = []
+
+    @staticmethod
+    def _read_content(response: requests.Response, deadline: Deadline, url: str, chunk_size: int = 65536):
+        """Reads the body of a response sent with stream=True into response.content, checking the
+        deadline between chunks.
+
+        Before each read, the socket's timeout is cut down to the time that's left, and each read
+        returns whatever has arrived (with urllib3 2, which has read1 - older versions wait for a
+        whole chunk). If the deadline runs out, the response is closed and DeadlineExceededException
+        is raised. Errors while reading are raised as the requests exceptions they'd otherwise be."""
+        raw = response.raw
+        read = raw.read1 if hasattr(raw, "read1") else raw.read
+        chunks: list[bytes] = []
+        try:
+            while True:
+                remaining = deadline.remaining()
+                if remaining <= 0:
+                    raise deadline.exceeded(url)
+                connection = raw.connection
+                if connection is not None and connection.sock is not None:
+                    current_timeout = connection.sock.gettimeout()
+                    connection.sock.settimeout(remaining if current_timeout is None else min(current_timeout, remaining))
+                chunk = read(chunk_size, decode_content=True)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        except (ReadTimeoutError, ProtocolError, DecodeError) as e:
+            response.close()
+            if deadline.expired():
+                raise deadline.exceeded(url) from e
+            if isinstance(e, ProtocolError):
+                raise requests.exceptions.ChunkedEncodingError(e) from e
+            if isinstance(e, DecodeError):
+                raise requests.exceptions.ContentDecodingError(e) from e
+            raise requests.ConnectionError(e) from e
+        except BaseException:
+            response.close()
+            raise
+        response._content = b"".join(chunks)
+        response._content_consumed = True
+        raw.release_conn()
+
+    def _get_retry_delay(self, method: str, attempt: int, deadline: Deadline | None, status_code: int | None = None, exception: Exception | None = None, retry_after: str | None = None) -> float | None:
+        """Returns the number of seconds to wait before retrying a request, or None if it shouldn't
+        be retried (including when waiting would use up the rest of the deadline)."""
+        if self.retry_policy is None or not self.retry_policy.should_retry(method, attempt, status_code, exception):
+            return None
+        delay = self.retry_policy.get_delay(attempt, retry_after)
+        if deadline is not None and delay >= deadline.remaining():
+            return None
+        return delay
+
+    @staticmethod
+    def _create_endpoint_selector(server_url: str | None, mirrors: list[str]) -> EndpointSelector:
+        if not server_url:
+            raise ValueError("A server_url is required to use mirrors.")
+        # Normalize the base URLs in the same way as the requests sent to them, so they can be matched
+        return EndpointSelector([Request("GET", url).prepare().url.rstrip("/") for url in [server_url, *mirrors]])
+
+    @staticmethod
+    def _create_session(pool_connections: int, pool_maxsize: int, pool_block: bool, keep_alive: bool) -> requests.Session:
+        """Creates the session shared by every request this queryer sends.
+
+        pool_connections is the number of hosts to keep connection pools for, and pool_maxsize is
+        the number of connections kept open per host."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        if not keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def _load_explain_configuration(self, server_url: str, sru_version_to_use: str, username: str | None, password: str | None, explain_cache: ExplainCache | None) -> SRUConfiguration:
+        """Returns the configuration parsed from the server's explainResponse, before the user's settings are applied.
+
+        If there's an explain cache, an unexpired entry is used without contacting the server. An
+        expired entry is revalidated with a conditional request, and reused if the server responds
+        304 Not Modified."""
+        if explain_cache:
+            configuration = explain_cache.get(server_url, sru_version_to_use)
+            if configuration is not None:
+                return configuration
+
+        formatted_explain_query = SRUAuxiliaryFormatter.format_base_explain_query(server_url, sru_version_to_use)
+
+        explain_response_xml: dict | bytes = None
+        try:
+            if not explain_cache:
+                if self._explain_parser == "xmltodict":
+                    explain_response_xml = self._retrieve_explain_response_xml(formatted_explain_query, username, password, self._send)
+                    return self._parse_explain_response_configuration(explain_response_xml)
+                explain_response_xml = self._get_request_contents(formatted_explain_query, username, password, self._send)
+                return self._parse_explain_response_content(explain_response_xml, self._explain_parser)
+
+            etag, last_modified = explain_cache.get_validators(server_url, sru_version_to_use)
+            response = self._get_request_response(formatted_explain_query, username, password, self._send, self._format_conditional_headers(etag, last_modified))
+            if response.status_code == 304:
+                configuration = explain_cache.get(server_url, sru_version_to_use, allow_expired=True)
+                if configuration is not None:
+                    logging.debug(f"The explainResponse for {server_url} has not changed. Using the cached configuration...")
+                    self._store_in_explain_cache(explain_cache, server_url, sru_version_to_use, configuration, response.headers.get("ETag", etag), response.headers.get("Last-Modified", last_modified))
+                    return configuration
+                # The entry was removed after the request was sent
+                response = self._get_request_response(formatted_explain_query, username, password, self._send)
+
+            explain_response_xml = response.content
+            configuration = self._parse_explain_response_content(explain_response_xml, self._explain_parser)
+        except Exception as e:
+            raise self._convert_explain_exception(e, explain_response_xml)
+
+        self._store_in_explain_cache(explain_cache, server_url, sru_version_to_use, configuration, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return configuration
+
+    @staticmethod
+    def _parse_local_explain_xml(explain_xml: bytes | str | os.PathLike, explain_parser: str = "xmltodict") -> SRUConfiguration:
+        """Parses an explainResponse passed as bytes, an XML string, or the path of a file."""
+        if isinstance(explain_xml, str) and explain_xml.lstrip().startswith("<"):
+            explain_response_content = explain_xml.encode("utf-8")
+        elif isinstance(explain_xml, (bytes, bytearray)):
+            explain_response_content = explain_xml
+        else:
+            with open(explain_xml, "rb") as f:
+                explain_response_content = f.read()
+
+        try:
+            return SRUQueryer._parse_explain_response_content(explain_response_content, explain_parser)
+        except Exception as e:
+            raise SRUQueryer._convert_explain_exception(e, explain_response_content)
+
+    @staticmethod
+    def _format_conditional_headers(etag: str | None, last_modified: str | None) -> dict:
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    @staticmethod
+    def _store_in_explain_cache(explain_cache: ExplainCache, server_url: str, sru_version: str, configuration: SRUConfiguration, etag: str | None = None, last_modified: str | None = None):
+        """Writes a configuration to the explain cache. A failure to write is logged rather than raised, since the queryer can carry on without the cache."""
+        try:
+            explain_cache.set(server_url, sru_version, configuration, etag, last_modified)
+        except (OSError, TypeError, ValueError) as e:
+            logging.warning(f"Could not write the explain configuration for {server_url} to the cache: {e.__str__()}")
+
+    @staticmethod
+    def _resolve_sru_version(sru_version: str | None) -> str:
+        """Returns the SRU version to request in the explain query."""
         sru_version_to_use = sru_version
         if not sru_version_to_use:
             sru_version_to_use = "1.2"
-        elif sru_version_to_use not in self.supported_sru_versions:
+        elif sru_version_to_use not in SRUQueryer.supported_sru_versions:
             logging.warning(f"SRU version {sru_version_to_use} is not supported. Defaulting to version 1.2...")
             sru_version_to_use = "1.2"
+        return sru_version_to_use
 
-        formatted_explain_query = SRUAuxiliaryFormatter.format_base_explain_query(server_url, sru_version_to_use)
-
-        explain_response_xml: bytes = None
-        try:
-            explain_response_xml = self._retrieve_explain_response_xml(formatted_explain_query, username, password)
-            configuration = self._parse_explain_response_configuration(explain_response_xml)
-        except NoExplainResponseException as be:
-            logging.exception(be.__str__())
-            raise be
-        except PermissionError as pe:
-            raise pe
-        except ExplainResponseContentTypeException as pf: 
-            raise pf
-        except Exception as e:
+    @staticmethod
+    def _convert_explain_exception(e: Exception, explain_response_xml: dict | bytes | None) -> Exception:
+        """Converts an exception raised while retrieving or parsing the explainResponse into the exception that should be raised."""
+        if isinstance(e, NoExplainResponseException):
             logging.exception(e.__str__())
-            if explain_response_xml:
-                raise ExplainResponseParserException(e.__str__(), xmltodict.parse(explain_response_xml))
-            else: raise NoExplainResponseException(f"Could not connect to the SRU server: {e.__str__()}", e.__str__())
-                
+            return e
+        if isinstance(e, (PermissionError, ExplainResponseContentTypeException)):
+            return e
+
+        logging.exception(e.__str__())
+        if explain_response_xml:
+            if not isinstance(explain_response_xml, dict):
+                explain_response_xml = xmltodict.parse(explain_response_xml)
+            return ExplainResponseParserException(e.__str__(), explain_response_xml)
+        else: return NoExplainResponseException(f"Could not connect to the SRU server: {e.__str__()}", e.__str__())
 
+    @staticmethod
+    def _merge_user_settings(configuration: SRUConfiguration, sru_version: str | None, sru_version_to_use: str, server_url: str, username: str | None = None, password: str | None = None, default_cql_context_set: str | None = None, default_cql_index: str | None = None, default_cql_relation: str | None = None, disable_validation_for_cql_defaults: bool = False, max_records_supported: int | None = None, default_records_returned: int | None = None , default_record_schema: str | None = None, default_sort_schema: str | None = None) -> SRUConfiguration:
+        """Reconciles the configuration parsed from the explainResponse with the settings passed to the queryer."""
         # If the server has sent back a different SRU version than what the explainResponse requested...
         if sru_version_to_use != configuration.sru_version:
             # If the SRU version that the user requested is being used, warn them that the server isn't using this version
@@ -104,48 +947,7 @@ class SRUQueryer():
             if configuration.default_sort_schema and (configuration.default_sort_schema != default_sort_schema): logging.warning(f"Overriding default sort schema (Using {default_sort_schema}, server specified {configuration.default_sort_schema}).")
             configuration.default_sort_schema = default_sort_schema
 
-        self.sru_configuration = configuration
-
-    def search_retrieve(self, cql_query: SearchClause | CQLBooleanOperatorBase | RawCQL | None = None, start_record: int | None = None, maximum_records: int | None = None, record_schema: str | None = None, sort_queries: list[dict] | list[SortKey] | None = None, record_packing: str | None = None, validate: bool = True, from_dict: dict | None = None) -> bytes:
-        """Conducts a searchRetrieve request and returns the response.
-
-        This will throw ValueErrors for any incorrect portion of the query. 
-        
-        This function does not handle any errors in the searchRetrieveResponse."""
-        query = SearchRetrieve(self.sru_configuration, cql_query, start_record, maximum_records, record_schema, sort_queries, record_packing, from_dict)
-        if validate:
-            query.validate()
-        request = query.construct_request()
-        logging.info(f"Querying {request.url}")
-        request = request.prepare()
-        s = requests.Session()
-        response = s.send(request)
-        return response.content
-    
-    def construct_search_retrieve_request(self, cql_query: SearchClause | CQLBooleanOperatorBase | RawCQL | None = None, start_record: int | None = None, maximum_records: int | None = None, record_schema: str | None = None, sort_queries: list[dict] | list[SortKey] | None = None, record_packing: str | None = None, validate: bool = True, from_dict: dict | None = None) -> Request:
-        """Construct a requests.Request object, which you can then prepare and use.
-        
-        This is helpful (as compared to search_retrieve) when you want to create a request, and perhaps modify it
-        or use it with your own session mechanism."""
-        query = SearchRetrieve(self.sru_configuration, cql_query, start_record, maximum_records, record_schema, sort_queries, record_packing, from_dict)
-        if validate:
-            query.validate()
-        return query.construct_request()
-    
-    def format_available_indexes(self, filename: str | None = None, print_to_console: bool = True, title_filter: str | None = None):
-        """Formats available indexes, and prints to the console by default.
-
-        Can also print to a file and disable printing to the console."""
-        available_context_sets_and_indexes = self.sru_configuration.available_context_sets_and_indexes
-
-        if title_filter:
-            available_context_sets_and_indexes = self._filter_available_context_sets_and_indexes(
-                available_context_sets_and_indexes, title_filter)
-
-        SRUAuxiliaryFormatter.format_available_indexes(available_context_sets_and_indexes, filename, print_to_console)
-
-    def get_configuration(self):
-        return self.sru_configuration.__dict__
+        return configuration
 
     @staticmethod
     def _filter_available_context_sets_and_indexes(available_context_sets_and_indexes: dict, title: str = None) -> dict:
@@ -165,14 +967,30 @@ class SRUQueryer():
         return new_dict
 
     @staticmethod
-    def _retrieve_explain_response_xml(server_url: str, username: str | None, password: str | None) -> dict:
-        response_content = SRUQueryer._get_request_contents(server_url, username, password)
+    def _retrieve_explain_response_xml(server_url: str, username: str | None, password: str | None, send: Callable[[Request], requests.Response] | None = None) -> dict:
+        response_content = SRUQueryer._get_request_contents(server_url, username, password, send)
+        return SRUQueryer._convert_explain_response_to_dict(response_content)
+
+    @staticmethod
+    def _convert_explain_response_to_dict(response_content: bytes) -> dict:
         try:
             content = xmltodict.parse(response_content)
         except Exception as e:
             raise ExplainResponseContentTypeException(f'Couldn\'t convert the explainResponse to a dict: "{e.__str__()}". This is most likely due to receiving a format other than XML.', response_content)
         return content
 
+    @staticmethod
+    def _parse_explain_response_content(response_content: bytes, explain_parser: str = "xmltodict") -> SRUConfiguration:
+        """Parses the content of an explainResponse with the chosen explain parser."""
+        if explain_parser == "stream":
+            try:
+                return SRUExplainStreamParser(response_content).get_sru_configuration_from_explain_response()
+            except expat.ExpatError as e:
+                raise ExplainResponseContentTypeException(f'Couldn\'t parse the explainResponse: "{e.__str__()}". This is most likely due to receiving a format other than XML.', response_content)
+
+        explain_response_xml = SRUQueryer._convert_explain_response_to_dict(response_content)
+        return SRUQueryer._parse_explain_response_configuration(explain_response_xml)
+
     @staticmethod
     def _parse_explain_response_configuration(sru_explain_dict: dict) -> SRUConfiguration:
         """This function seems dumb, but is here for mocking purposes."""
@@ -180,19 +998,28 @@ class SRUQueryer():
         return sru_dict_parser.get_sru_configuration_from_explain_response()
     
     @staticmethod
-    def _get_request_contents(url: str, username, password):
-        """Sends a request and returns the contents - it's a seperate method so we can mock it."""
+    def _get_request_contents(url: str, username, password, send: Callable[[Request], requests.Response] | None = None):
+        """Sends a request and returns the contents - it's a seperate method so we can mock it.
 
+        If 'send' is provided (usually SRUQueryer._send), the request is sent with it so that it
+        can share the queryer's connection pool."""
+        return SRUQueryer._get_request_response(url, username, password, send).content
+
+    @staticmethod
+    def _get_request_response(url: str, username: str | None, password: str | None, send: Callable[[Request], requests.Response] | None = None, headers: dict | None = None) -> requests.Response:
+        """Sends a request (with any extra headers) and returns the response. Raises PermissionError if the server refuses access."""
+        request = Request("GET", url, headers=dict(headers or {}))
         if username and password:
-            response = requests.get(url, headers={
-                "Authorization": SRUAuxiliaryFormatter.format_basic_access_authentication_header_payload(username, password)
-            })
+            request.headers["Authorization"] = SRUAuxiliaryFormatter.format_basic_access_authentication_header_payload(username, password)
+
+        if send:
+            response = send(request)
         else:
-            response = requests.get(url)
+            response = requests.get(url, headers=request.headers)
 
         if response.status_code == 401 or response.status_code == 403:
             logging.exception(f"You are not authorized to access this SRU Explain server ({url})")
             raise PermissionError(
                 "You are not authorized to access this SRU Explain server")
 
-        return response.content
\ No newline at end of file
+        return response
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterator
+
+from ._explain_cache import ExplainCache
+from ._deadline import Deadline
+from ._sru_queryer import SRUQueryer
+from ._search_clause import SearchClause
+from ._raw_cql import RawCQL
+from ._cql_boolean_operators import CQLBooleanOperatorBase
+from ._sort_key import SortKey
+from ._search_retrieve_result import SearchRetrieveResult
+
+class SRURegistry():
+    """Holds an SRUQueryer for each of a list of SRU servers, and loads their configurations concurrently.
+
+    Each server is described by a dict with a unique "name" and the keyword arguments of the
+    SRUQueryer constructor, for instance:
+        {"name": "loc", "server_url": "http://lx2.loc.gov:210/LCDB", "default_records_returned": 25}
+
+    The queryers are created in lazy mode, so creating the registry never contacts a server.
+    warm_up() then requests and parses every explainResponse at once, with at most max_workers at
+    a time. A server whose explain request fails doesn't stop the others from loading: its
+    exception is recorded in 'failures', and its queryer retries the explain request the first
+    time it needs its configuration (or on the next warm_up()).
+
+    If explain_cache is set, it's used for every server that doesn't set its own."""
+
+    def __init__(self, servers: list[dict], max_workers: int = 8, explain_cache: ExplainCache | None = None, warm_up: bool = True):
+        """Raises ValueError if a server has no name, or two servers have the same name. If warm_up
+        is True (the default), warm_up() is called before returning."""
+        self.max_workers = max_workers
+        self.failures: dict[str, Exception] = {}
+        self._queryers: dict[str, SRUQueryer] = {}
+        self._lock = threading.Lock()
+
+        for server in servers:
+            settings = dict(server)
+            name = settings.pop("name", None)
+            if name is None:
+                raise ValueError(f"SRU server {server} has no name.")
+            if name in self._queryers:
+                raise ValueError(f"SRU server name '{name}' is used more than once.")
+            if explain_cache is not None:
+                settings.setdefault("explain_cache", explain_cache)
+            settings["lazy"] = True
+            self._queryers[name] = SRUQueryer(**settings)
+
+        if warm_up:
+            self.warm_up()
+
+    def warm_up(self) -> dict[str, Exception]:
+        """Loads the configuration of every server that hasn't been loaded yet, concurrently.
+
+        Returns the servers that failed (by name) with the exception each raised. Servers that
+        failed before and load this time are removed from 'failures'."""
+        names = [name for name, queryer in self._queryers.items() if not queryer.is_configuration_loaded()]
+        if names:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(names))) as executor:
+                futures = {name: executor.submit(self._queryers[name].load_configuration) for name in names}
+                for name, future in futures.items():
+                    exception = future.exception()
+                    with self._lock:
+                        if exception is None:
+                            self.failures.pop(name, None)
+                        else:
+                            logging.warning(f"Could not load the configuration of SRU server '{name}': {exception.__str__()}")
+                            self.failures[name] = exception
+        with self._lock:
+            return dict(self.failures)
+
+    def federated_search(self, cql_query: SearchClause | CQLBooleanOperatorBase | RawCQL | None = None, names: list[str] | None = None, timeout: float | dict[str, float] | None = None, start_record: int | None = None, maximum_records: int | None = None, record_schema: str | None = None, sort_queries: list[dict] | list[SortKey] | None = None, record_packing: str | None = None, validate: bool = True, from_dict: dict | None = None) -> Iterator[SearchRetrieveResult]:
+        """Sends the same searchRetrieve request to several servers at once, and yields each
+        server's SearchRetrieveResult as soon as it arrives.
+
+        names are the servers to search (by default, all of them). The query is validated
+        separately against each server's configuration, in the same thread that then sends its
+        request, so a server that doesn't support the query (or whose configuration can't be
+        loaded) only fails its own result. Each result's 'source' is the name of its server, and its
+        'index' is the server's position in names.
+
+        timeout is the number of seconds to wait for each server, either one value for all of them
+        or a dict of values by name (servers that aren't in it have no timeout). A server that
+        doesn't respond in time yields a result whose exception is a DeadlineExceededException (a
+        TimeoutError), and slow servers
+        never hold up the results of faster ones. Each server's requests go through its queryer as
+        usual (its result cache, coalescing, hedging, and retries), with the timeout as their
+        deadline.
+
+        Raises KeyError if a name isn't in the registry."""
+        if names is None:
+            names = self.names
+        for name in names:
+            if name not in self._queryers:
+                raise KeyError(name)
+        if not names:
+            return iter([])
+
+        search_arguments = {
+            "cql_query": cql_query,
+            "start_record": start_record,
+            "maximum_records": maximum_records,
+            "record_schema": record_schema,
+            "sort_queries": sort_queries,
+            "record_packing": record_packing,
+            "validate": validate,
+            "from_dict": from_dict
+        }
+        # Every server gets its own thread, so they're all searched at once
+        executor = ThreadPoolExecutor(max_workers=len(names))
+        # The URL of each server's request, once it has been built
+        request_urls: dict[int, str] = {}
+        futures: dict[Future, tuple[int, str, Deadline | None]] = {}
+        for index, name in enumerate(names):
+            target_timeout = timeout.get(name) if isinstance(timeout, dict) else timeout
+            deadline = Deadline(target_timeout) if target_timeout is not None else None
+            futures[executor.submit(self._search_target, index, name, deadline, search_arguments, request_urls)] = (index, name, deadline)
+        executor.shutdown(wait=False)
+
+        return self._collect_federated_results(futures, request_urls)
+
+    @staticmethod
+    def _collect_federated_results(futures: dict[Future, tuple[int, str, Deadline | None]], request_urls: dict[int, str]) -> Iterator[SearchRetrieveResult]:
+        pending = set(futures)
+        try:
+            while pending:
+                deadlines = [futures[future][2] for future in pending if futures[future][2] is not None]
+                wait_timeout = min(deadline.remaining() for deadline in deadlines) if deadlines else None
+                done, pending = concurrent.futures.wait(pending, timeout=wait_timeout, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+                for future in [future for future in pending if futures[future][2] is not None and futures[future][2].expired()]:
+                    pending.discard(future)
+                    future.cancel()
+                    index, name, deadline = futures[future]
+                    url = request_urls.get(index)
+                    logging.warning(f"SRU server '{name}' did not respond within {deadline.seconds} seconds.")
+                    # The same exception the server's own request raises when its deadline runs out
+                    yield SearchRetrieveResult(index, exception=deadline.exceeded(url), url=url, source=name)
+        finally:
+            # If the caller stops iterating early, don't send the requests that haven't started.
+            for future in pending:
+                future.cancel()
+
+    def _search_target(self, index: int, name: str, deadline: Deadline | None, search_arguments: dict, request_urls: dict[int, str]) -> SearchRetrieveResult:
+        queryer = self._queryers[name]
+        request = None
+        try:
+            request = queryer.construct_search_retrieve_request(**search_arguments)
+            request_urls[index] = request.url
+            # The deadline also stops the request itself from holding its thread once nobody is waiting for it
+            content = queryer._get_search_retrieve_content(request, deadline=deadline)
+        except Exception as e:
+            return SearchRetrieveResult(index, exception=e, url=request.url if request is not None else None, source=name)
+        return SearchRetrieveResult(index, content=content, url=request.url, source=name)
+
+    def get(self, name: str) -> SRUQueryer:
+        """Returns the SRUQueryer for a server. Raises KeyError if there's no server with that name.
+
+        If the server failed to load, its queryer sends the explain request again the first time
+        it needs its configuration, raising the explain exceptions if it fails again."""
+        return self._queryers[name]
+
+    def __getitem__(self, name: str) -> SRUQueryer:
+        return self.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._queryers
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._queryers)
+
+    def __len__(self) -> int:
+        return len(self._queryers)
+
+    @property
+    def names(self) -> list[str]:
+        """The names of the servers, in the order they were given."""
+        return list(self._queryers)
+
+    @property
+    def available(self) -> list[str]:
+        """The names of the servers whose configurations have been loaded."""
+        return [name for name, queryer in self._queryers.items() if queryer.is_configuration_loaded()]
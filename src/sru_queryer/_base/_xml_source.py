@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from typing import BinaryIO, Iterable, Iterator
+
+import requests
+
+def read_chunks(source: str | bytes | requests.Response | BinaryIO | Iterable[bytes], chunk_size: int = 65536) -> Iterator[bytes]:
+    """Yields an XML document in chunks of bytes, from a string, bytes, a streamed requests
+    Response, a binary file-like object, or an iterable of byte chunks."""
+    if isinstance(source, str):
+        yield source.encode("utf-8")
+    elif isinstance(source, (bytes, bytearray)):
+        yield source
+    elif hasattr(source, "iter_content"):
+        yield from source.iter_content(chunk_size)
+    elif hasattr(source, "read"):
+        while chunk := source.read(chunk_size):
+            yield chunk
+    else:
+        yield from source
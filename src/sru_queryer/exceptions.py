@@ -1,3 +1,3 @@
-from ._base._exceptions import ExplainResponseParserException, ExplainResponseContentTypeException, NoExplainResponseException
+from ._base._exceptions import ExplainResponseParserException, ExplainResponseContentTypeException, NoExplainResponseException, ConfigurationSnapshotException, CircuitOpenException, DeadlineExceededException
 
-__all__ = ["ExplainResponseParserException", "ExplainResponseContentTypeException", "NoExplainResponseException"]
\ No newline at end of file
+__all__ = ["ExplainResponseParserException", "ExplainResponseContentTypeException", "NoExplainResponseException", "ConfigurationSnapshotException", "CircuitOpenException", "DeadlineExceededException"]
\ No newline at end of file
@@ -1,5 +1,19 @@
 from ._base._sort_key import SortKey
 from ._base._sru_configuration import SRUConfiguration
+from ._base._index_catalog import IndexCatalog, IndexRecord
 from ._base._sru_queryer import SRUQueryer
+from ._base._explain_cache import ExplainCache
+from ._base._result_cache import ResultCache, ResultCacheBase
+from ._base._sqlite_result_cache import SQLiteResultCache
+from ._base._rate_limiter import RateLimiter
+from ._base._retry_policy import RetryPolicy
+from ._base._circuit_breaker import CircuitBreaker
+from ._base._endpoint_selector import EndpointSelector
+from ._base._hedging_policy import HedgingPolicy
+from ._base._sru_registry import SRURegistry
+from ._base._configuration_snapshot import ConfigurationBundle, ConfigurationSnapshot
+from ._base._async_sru_queryer import AsyncSRUQueryer
+from ._base._search_retrieve_result import SearchRetrieveResult
+from ._base._search_retrieve_response_parser import SearchRetrieveResponseParser, SRURecord, SRUDiagnostic
 
-__all__ = ["SortKey", "SRUConfiguration", "SRUQueryer"]
\ No newline at end of file
+__all__ = ["SortKey", "SRUConfiguration", "IndexCatalog", "IndexRecord", "SRUQueryer", "ExplainCache", "ResultCache", "ResultCacheBase", "SQLiteResultCache", "RateLimiter", "RetryPolicy", "CircuitBreaker", "EndpointSelector", "HedgingPolicy", "SRURegistry", "ConfigurationBundle", "ConfigurationSnapshot", "AsyncSRUQueryer", "SearchRetrieveResult", "SearchRetrieveResponseParser", "SRURecord", "SRUDiagnostic"]
\ No newline at end of file
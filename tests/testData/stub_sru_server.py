@@ -0,0 +1,122 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from tests.testData.test_data import TestFiles
+
+def search_retrieve_response(number_of_records: int = 1, start_record: int = 1, maximum_records: int = 10, include_next_record_position: bool = True) -> bytes:
+    """Builds a minimal searchRetrieveResponse, with one dc record per position."""
+    last_record = min(number_of_records, start_record + maximum_records - 1)
+    records = ""
+    for position in range(start_record, last_record + 1):
+        records += f"<record><recordSchema>dc</recordSchema><recordPacking>xml</recordPacking><recordData><dc xmlns=\"http://purl.org/dc/elements/1.1/\"><title>Record {position}</title></dc></recordData><recordPosition>{position}</recordPosition></record>"
+    next_record_position = ""
+    if last_record < number_of_records and include_next_record_position:
+        next_record_position = f"<nextRecordPosition>{last_record + 1}</nextRecordPosition>"
+    return (f"<?xml version=\"1.0\"?><searchRetrieveResponse xmlns=\"http://www.loc.gov/zing/srw/\"><version>1.2</version>"
+            f"<numberOfRecords>{number_of_records}</numberOfRecords><records>{records}</records>{next_record_position}</searchRetrieveResponse>").encode()
+
+class StubSRUServer():
+    """A local stand-in for an SRU server, for integration tests.
+
+    Explain requests return the contents of explain_response_path (after explain_delay seconds),
+    with any explain_headers. If those include an ETag or Last-Modified header, conditional explain
+    requests that match them get a 304 Not Modified response. searchRetrieve requests return
+    search_retrieve_content, unless responses have been queued with queue_response (used to inject
+    faults). If number_of_records is set, searchRetrieve responses are instead generated from the
+    startRecord and maximumRecords of the request. If trickle_delay is set, searchRetrieve bodies
+    are sent one byte at a time, trickle_delay seconds apart. Every request URL is recorded in 'requests'."""
+
+    def __init__(self, explain_response_path: str = TestFiles.explain_response_gapines):
+        with open(explain_response_path, "rb") as f:
+            self.explain_response = f.read()
+        self.explain_headers: dict = {}
+        self.explain_delay: float = 0
+        self.search_retrieve_content: bytes = search_retrieve_response()
+        self.number_of_records: int | None = None
+        self.include_next_record_position = True
+        self.delay: float = 0
+        self.trickle_delay: float = 0
+        self.requests: list[str] = []
+        self.request_headers: list[dict] = []
+        self._queued_responses: list[tuple[int, bytes, dict, float]] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._create_handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/sru"
+
+    def queue_response(self, status: int, content: bytes = b"", headers: dict | None = None, delay: float = 0):
+        """Queues a response for the next searchRetrieve request."""
+        with self._lock:
+            self._queued_responses.append((status, content, headers or {}, delay))
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def _next_response(self, path: str, headers: dict) -> tuple[int, bytes, dict, float]:
+        with self._lock:
+            self.requests.append(path)
+            self.request_headers.append(headers)
+            query = parse_qs(urlparse(path).query)
+            if query.get("operation") == ["explain"]:
+                etag = self.explain_headers.get("ETag")
+                last_modified = self.explain_headers.get("Last-Modified")
+                if (etag and headers.get("If-None-Match") == etag) or (last_modified and headers.get("If-Modified-Since") == last_modified):
+                    return 304, b"", dict(self.explain_headers), 0
+                return 200, self.explain_response, dict(self.explain_headers), self.explain_delay
+            if self._queued_responses:
+                return self._queued_responses.pop(0)
+            if self.number_of_records is not None:
+                start_record = int(query.get("startRecord", ["1"])[0])
+                maximum_records = int(query.get("maximumRecords", ["10"])[0])
+                return 200, search_retrieve_response(self.number_of_records, start_record, maximum_records, self.include_next_record_position), {}, self.delay
+            return 200, self.search_retrieve_content, {}, self.delay
+
+    def _create_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                status, content, headers, delay = stub._next_response(self.path, dict(self.headers))
+                if delay:
+                    time.sleep(delay)
+                self.send_response(status)
+                self.send_header("Content-Type", "text/xml")
+                self.send_header("Content-Length", str(len(content)))
+                for header, value in headers.items():
+                    self.send_header(header, value)
+                self.end_headers()
+                try:
+                    if stub.trickle_delay and "operation=searchRetrieve" in self.path:
+                        for i in range(len(content)):
+                            self.wfile.write(content[i:i + 1])
+                            self.wfile.flush()
+                            time.sleep(stub.trickle_delay)
+                    else:
+                        self.wfile.write(content)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
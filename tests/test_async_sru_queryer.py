@@ -0,0 +1,160 @@
+import asyncio
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from src.sru_queryer._base._async_sru_queryer import AsyncSRUQueryer, aiohttp
+from src.sru_queryer._base._explain_cache import ExplainCache
+from src.sru_queryer._base._rate_limiter import RateLimiter
+from src.sru_queryer._base._sru_queryer import SRUQueryer
+from src.sru_queryer._base._exceptions import ExplainResponseContentTypeException
+from src.sru_queryer.cql import SearchClause
+from tests.testData.stub_sru_server import StubSRUServer, search_retrieve_response
+from tests.testData.test_data import TestFiles, get_test_gapines_saved_sru_configuration
+
+@unittest.skipIf(aiohttp is None, "aiohttp is not installed")
+class TestAsyncSRUQueryer(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.server = StubSRUServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    async def test_create_loads_configuration_from_explain(self):
+        queryer = await AsyncSRUQueryer.create(self.server.url, default_records_returned=15)
+
+        self.assertEqual(queryer.sru_configuration.server_url, self.server.url)
+        self.assertEqual(queryer.sru_configuration.sru_version, "1.1")
+        self.assertEqual(queryer.sru_configuration.default_context_set, "eg")
+        self.assertEqual(queryer.sru_configuration.default_records_returned, 15)
+        await queryer.close()
+
+    async def test_concurrent_load_configuration_sends_one_explain_request(self):
+        self.server.explain_delay = 0.2
+
+        queryer = AsyncSRUQueryer(self.server.url)
+        configurations = await asyncio.gather(*[queryer.load_configuration() for _ in range(5)])
+        await queryer.close()
+
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertTrue(all(configuration is queryer.sru_configuration for configuration in configurations))
+
+    async def test_explain_response_is_parsed_off_the_event_loop(self):
+        parse = SRUQueryer._parse_explain_response_content
+
+        def slow_parse(*args):
+            time.sleep(0.3)
+            return parse(*args)
+
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        with patch.object(SRUQueryer, "_parse_explain_response_content", staticmethod(slow_parse)):
+            queryer = await AsyncSRUQueryer.create(self.server.url)
+        ticker.cancel()
+        await queryer.close()
+
+        self.assertGreater(ticks, 10)
+
+    async def test_search_retrieve_returns_content(self):
+        self.server.search_retrieve_content = search_retrieve_response(number_of_records=3)
+
+        async with AsyncSRUQueryer(self.server.url) as queryer:
+            content = await queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"))
+
+        self.assertEqual(content, self.server.search_retrieve_content)
+        self.assertIn("query=eg.title", self.server.requests[-1])
+
+    async def test_search_retrieve_validates_query(self):
+        async with AsyncSRUQueryer(self.server.url) as queryer:
+            with self.assertRaises(ValueError):
+                await queryer.search_retrieve(SearchClause("eg", "fake_index", "=", "Frog"))
+
+        self.assertEqual(len(self.server.requests), 1)
+
+    async def test_from_dict_does_not_send_explain_request(self):
+        saved_dict = get_test_gapines_saved_sru_configuration()
+        saved_dict["server_url"] = self.server.url
+
+        async with AsyncSRUQueryer(from_dict=saved_dict) as queryer:
+            await queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"), validate=False)
+
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertIn("operation=searchRetrieve", self.server.requests[0])
+
+    async def test_identical_concurrent_requests_are_coalesced(self):
+        self.server.delay = 0.2
+
+        async with AsyncSRUQueryer(self.server.url, coalesce_requests=True) as queryer:
+            responses = await asyncio.gather(*[queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog")) for _ in range(5)])
+
+        self.assertEqual(responses, [self.server.search_retrieve_content] * 5)
+        self.assertEqual(len([request for request in self.server.requests if "operation=searchRetrieve" in request]), 1)
+
+    async def test_concurrency_is_bounded(self):
+        self.server.delay = 0.2
+
+        async with AsyncSRUQueryer(self.server.url, max_concurrency=2) as queryer:
+            searches = [queryer.search_retrieve(SearchClause("eg", "title", "=", str(i))) for i in range(4)]
+            start = asyncio.get_running_loop().time()
+            await asyncio.gather(*searches)
+            elapsed = asyncio.get_running_loop().time() - start
+
+        # Four 0.2 second requests, two at a time
+        self.assertGreaterEqual(elapsed, 0.4)
+
+    async def test_cancelled_search_releases_concurrency_slot(self):
+        async with AsyncSRUQueryer(self.server.url, max_concurrency=1) as queryer:
+            self.server.queue_response(200, search_retrieve_response(), delay=1)
+            task = asyncio.create_task(queryer.search_retrieve(SearchClause("eg", "title", "=", "Slow")))
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+            content = await asyncio.wait_for(queryer.search_retrieve(SearchClause("eg", "title", "=", "Fast")), 0.5)
+
+        self.assertEqual(content, self.server.search_retrieve_content)
+
+    async def test_rate_limited_requests_do_not_hold_concurrency_slots(self):
+        saved_dict = get_test_gapines_saved_sru_configuration()
+        saved_dict["server_url"] = self.server.url
+
+        async with AsyncSRUQueryer(from_dict=saved_dict, max_concurrency=1, rate_limiter=RateLimiter(rate=2)) as queryer:
+            await queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"), validate=False)
+            task = asyncio.create_task(queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"), validate=False))
+            await asyncio.sleep(0.1)
+
+            # The second request is waiting for the rate limiter, not holding the only slot
+            self.assertFalse(queryer._semaphore.locked())
+            await task
+
+        self.assertEqual(len(self.server.requests), 2)
+
+    async def test_explain_cache_is_shared_with_sru_queryer(self):
+        with tempfile.TemporaryDirectory() as directory:
+            explain_cache = ExplainCache(directory)
+            SRUQueryer(self.server.url, explain_cache=explain_cache).close()
+
+            async with AsyncSRUQueryer(self.server.url, explain_cache=explain_cache) as queryer:
+                await queryer.load_configuration()
+
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(queryer.sru_configuration.server_url, self.server.url)
+
+    async def test_html_explain_response_raises_content_type_exception(self):
+        with open(TestFiles.gapines_html_response, "rb") as f:
+            self.server.explain_response = f.read()
+
+        queryer = AsyncSRUQueryer(self.server.url)
+        with self.assertRaises(ExplainResponseContentTypeException):
+            await queryer.load_configuration()
+        await queryer.close()
@@ -0,0 +1,101 @@
+import unittest
+from unittest.mock import patch
+
+from src.sru_queryer._base._circuit_breaker import CircuitBreaker
+from src.sru_queryer._base._exceptions import CircuitOpenException
+
+@patch("src.sru_queryer._base._circuit_breaker.time.monotonic")
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_opens_after_consecutive_failures(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        circuit_breaker = CircuitBreaker(failure_threshold=3)
+
+        for _ in range(3):
+            circuit_breaker.before_request("url")
+            circuit_breaker.record_failure()
+
+        self.assertEqual(circuit_breaker.state, "open")
+        self.assertEqual(circuit_breaker.opened, 1)
+        with self.assertRaises(CircuitOpenException) as context:
+            circuit_breaker.before_request("url")
+        self.assertEqual(context.exception.content, "url")
+        self.assertEqual(circuit_breaker.rejected, 1)
+
+    def test_success_resets_consecutive_failures(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        circuit_breaker = CircuitBreaker(failure_threshold=3)
+
+        circuit_breaker.record_failure()
+        circuit_breaker.record_failure()
+        circuit_breaker.record_response(200)
+        circuit_breaker.record_failure()
+        circuit_breaker.record_failure()
+
+        self.assertEqual(circuit_breaker.state, "closed")
+
+    def test_failure_status_codes_count_as_failures(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        circuit_breaker = CircuitBreaker(failure_threshold=2)
+
+        circuit_breaker.record_response(404)
+        circuit_breaker.record_response(503)
+        self.assertEqual(circuit_breaker.state, "closed")
+        circuit_breaker.record_response(500)
+
+        self.assertEqual(circuit_breaker.state, "open")
+
+    def test_half_open_after_recovery_timeout_allows_limited_trial_requests(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        circuit_breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+        circuit_breaker.record_failure()
+
+        mock_monotonic.return_value = 110
+        self.assertEqual(circuit_breaker.state, "half_open")
+        circuit_breaker.before_request("url")
+        with self.assertRaises(CircuitOpenException):
+            circuit_breaker.before_request("url")
+
+    def test_successful_trial_request_closes_breaker(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        circuit_breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+        circuit_breaker.record_failure()
+
+        mock_monotonic.return_value = 110
+        circuit_breaker.before_request("url")
+        circuit_breaker.record_success()
+
+        self.assertEqual(circuit_breaker.state, "closed")
+        circuit_breaker.before_request("url")
+        circuit_breaker.before_request("url")
+
+    def test_failed_trial_request_reopens_breaker(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        circuit_breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10)
+        for _ in range(3):
+            circuit_breaker.record_failure()
+
+        mock_monotonic.return_value = 110
+        circuit_breaker.before_request("url")
+        circuit_breaker.record_failure()
+
+        self.assertEqual(circuit_breaker.state, "open")
+        self.assertEqual(circuit_breaker.opened, 2)
+        mock_monotonic.return_value = 119
+        with self.assertRaises(CircuitOpenException):
+            circuit_breaker.before_request("url")
+
+    def test_reset_closes_breaker(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        circuit_breaker = CircuitBreaker(failure_threshold=1)
+        circuit_breaker.record_failure()
+
+        circuit_breaker.reset()
+
+        self.assertEqual(circuit_breaker.state, "closed")
+
+    def test_invalid_arguments_raise_value_error(self, *args):
+        with self.assertRaises(ValueError):
+            CircuitBreaker(failure_threshold=0)
+        with self.assertRaises(ValueError):
+            CircuitBreaker(half_open_max_calls=0)
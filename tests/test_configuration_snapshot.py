@@ -0,0 +1,188 @@
+import os
+import struct
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.sru_queryer import SRUQueryer
+from src.sru_queryer._base import _configuration_snapshot
+from src.sru_queryer._base._configuration_snapshot import ConfigurationBundle, ConfigurationSnapshot
+from src.sru_queryer._base._exceptions import ConfigurationSnapshotException
+from src.sru_queryer._base._index_catalog import IndexCatalog
+from tests.testData.test_data import get_alma_sru_configuration, get_gapines_sru_configuration, TestFiles
+
+class TestConfigurationSnapshot(unittest.TestCase):
+
+    def test_snapshot_round_trips(self):
+        configuration = get_gapines_sru_configuration()
+
+        loaded = ConfigurationSnapshot.loads(ConfigurationSnapshot.dumps(configuration))
+
+        self.assertDictEqual(loaded.__dict__, configuration.__dict__)
+
+    def test_compact_configuration_round_trips_as_dicts(self):
+        configuration = get_alma_sru_configuration()
+        expected = dict(configuration.__dict__)
+
+        loaded = ConfigurationSnapshot.loads(ConfigurationSnapshot.dumps(configuration.compact()))
+        loaded_compact = ConfigurationSnapshot.loads(ConfigurationSnapshot.dumps(configuration), compact=True)
+
+        self.assertDictEqual(loaded.__dict__, expected)
+        self.assertIsInstance(loaded_compact.available_context_sets_and_indexes, IndexCatalog)
+        self.assertDictEqual(loaded_compact.to_dict(), expected)
+
+    def test_save_and_load_file(self):
+        configuration = get_gapines_sru_configuration()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "gapines.snapshot")
+
+            ConfigurationSnapshot.save(path, configuration)
+
+            self.assertDictEqual(ConfigurationSnapshot.load(path).__dict__, configuration.__dict__)
+            self.assertEqual(os.listdir(directory), ["gapines.snapshot"])
+
+    def test_not_a_snapshot_raises_exception(self):
+        for snapshot in [b"", b"{\"available_context_sets_and_indexes\": {}}", b"SRUQCFG\x00"]:
+            with self.subTest(snapshot=snapshot):
+                with self.assertRaises(ConfigurationSnapshotException):
+                    ConfigurationSnapshot.loads(snapshot)
+
+    def test_other_schema_version_raises_exception(self):
+        snapshot = ConfigurationSnapshot.dumps(get_gapines_sru_configuration())
+
+        with patch.object(_configuration_snapshot, "SCHEMA_VERSION", 2):
+            with self.assertRaises(ConfigurationSnapshotException) as context:
+                ConfigurationSnapshot.loads(snapshot)
+
+        self.assertIn("schema version 1", context.exception.message)
+
+    def test_other_configuration_fields_raise_exception(self):
+        snapshot = ConfigurationSnapshot.dumps(get_gapines_sru_configuration())
+
+        with patch.object(_configuration_snapshot, "_FIELDS_CHECKSUM", 0):
+            with self.assertRaises(ConfigurationSnapshotException):
+                ConfigurationSnapshot.loads(snapshot)
+
+    def test_other_python_version_raises_exception(self):
+        snapshot = bytearray(ConfigurationSnapshot.dumps(get_gapines_sru_configuration()))
+        # The Python minor version is the byte after the magic, schema version, kind, marshal version, and major version
+        snapshot[13] = (snapshot[13] + 1) % 256
+
+        with self.assertRaises(ConfigurationSnapshotException):
+            ConfigurationSnapshot.loads(bytes(snapshot))
+
+    def test_corrupt_configuration_raises_exception(self):
+        snapshot = bytearray(ConfigurationSnapshot.dumps(get_gapines_sru_configuration()))
+        snapshot[-5] ^= 0xFF
+
+        with self.assertRaises(ConfigurationSnapshotException) as context:
+            ConfigurationSnapshot.loads(bytes(snapshot))
+
+        self.assertIn("corrupt", context.exception.message)
+
+    def test_truncated_snapshot_raises_exception(self):
+        snapshot = ConfigurationSnapshot.dumps(get_gapines_sru_configuration())
+
+        for length in [10, struct.calcsize("<8sHBBBBIIQI") + 5, len(snapshot) - 1]:
+            with self.subTest(length=length):
+                with self.assertRaises(ConfigurationSnapshotException):
+                    ConfigurationSnapshot.loads(snapshot[:length])
+
+    def test_bundle_is_not_a_snapshot(self):
+        bundle = ConfigurationBundle.dumps({"gapines": get_gapines_sru_configuration()})
+
+        with self.assertRaises(ConfigurationSnapshotException):
+            ConfigurationSnapshot.loads(bundle)
+
+class TestConfigurationBundle(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "configurations.bundle")
+        self.configurations = {"alma": get_alma_sru_configuration(), "gapines": get_gapines_sru_configuration()}
+        ConfigurationBundle.save(self.path, self.configurations)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_bundle_round_trips(self):
+        with ConfigurationBundle(self.path) as bundle:
+            self.assertEqual(len(bundle), 2)
+            self.assertEqual(list(bundle), ["alma", "gapines"])
+            for name, configuration in self.configurations.items():
+                self.assertDictEqual(bundle[name].__dict__, configuration.__dict__)
+
+    def test_load_all(self):
+        with ConfigurationBundle(self.path) as bundle:
+            configurations = bundle.load_all()
+
+        self.assertEqual(list(configurations), ["alma", "gapines"])
+        for name, configuration in self.configurations.items():
+            self.assertDictEqual(configurations[name].__dict__, configuration.__dict__)
+
+    def test_configurations_are_loaded_once(self):
+        with ConfigurationBundle(self.path) as bundle:
+            self.assertIs(bundle["alma"], bundle["alma"])
+
+    def test_missing_name_raises_key_error(self):
+        with ConfigurationBundle(self.path) as bundle:
+            with self.assertRaises(KeyError):
+                bundle["loc"]
+            self.assertIsNone(bundle.get("loc"))
+
+    def test_compact_bundle(self):
+        with ConfigurationBundle(self.path, compact=True) as bundle:
+            configuration = bundle["alma"]
+
+        self.assertIsInstance(configuration.available_context_sets_and_indexes, IndexCatalog)
+        self.assertDictEqual(configuration.to_dict(), self.configurations["alma"].__dict__)
+
+    def test_loaded_configurations_outlive_bundle(self):
+        bundle = ConfigurationBundle(self.path)
+        configuration = bundle["gapines"]
+        bundle.close()
+
+        self.assertEqual(configuration.default_context_set, self.configurations["gapines"].default_context_set)
+        with self.assertRaises(ValueError):
+            bundle["alma"]
+
+    def test_corrupt_entry_only_fails_that_entry(self):
+        with open(self.path, "r+b") as f:
+            f.seek(-5, os.SEEK_END)
+            byte = f.read(1)
+            f.seek(-5, os.SEEK_END)
+            f.write(bytes([byte[0] ^ 0xFF]))
+
+        with ConfigurationBundle(self.path) as bundle:
+            self.assertDictEqual(bundle["alma"].__dict__, self.configurations["alma"].__dict__)
+            with self.assertRaises(ConfigurationSnapshotException):
+                bundle["gapines"]
+
+    def test_empty_and_snapshot_files_raise_exception(self):
+        empty_path = os.path.join(self.directory.name, "empty.bundle")
+        open(empty_path, "wb").close()
+        snapshot_path = os.path.join(self.directory.name, "alma.snapshot")
+        ConfigurationSnapshot.save(snapshot_path, self.configurations["alma"])
+
+        for path in [empty_path, snapshot_path]:
+            with self.subTest(path=path):
+                with self.assertRaises(ConfigurationSnapshotException) as context:
+                    ConfigurationBundle(path)
+                self.assertEqual(context.exception.content, path)
+
+    def test_queryer_from_configuration_without_record_limits(self):
+        for explain_xml in [TestFiles.explain_response_loc, TestFiles.sru_no_schema]:
+            with self.subTest(explain_xml=explain_xml):
+                configuration = SRUQueryer.from_explain_xml(explain_xml, "https://example.com/sru").sru_configuration
+                self.assertIsNone(configuration.max_records_supported)
+
+                sru_queryer = SRUQueryer.from_configuration(ConfigurationSnapshot.loads(ConfigurationSnapshot.dumps(configuration)))
+
+                self.assertDictEqual(sru_queryer.get_configuration(), configuration.to_dict())
+
+    def test_queryer_from_bundle_configuration(self):
+        with ConfigurationBundle(self.path, compact=True) as bundle:
+            sru_queryer = SRUQueryer.from_configuration(bundle["gapines"])
+
+        self.assertIsInstance(sru_queryer.sru_configuration.available_context_sets_and_indexes, IndexCatalog)
+        self.assertDictEqual(sru_queryer.get_configuration(), self.configurations["gapines"].__dict__)
@@ -0,0 +1,50 @@
+import unittest
+from unittest.mock import patch
+
+from src.sru_queryer._base._deadline import Deadline
+from src.sru_queryer._base._exceptions import DeadlineExceededException
+
+@patch("src.sru_queryer._base._deadline.time.monotonic")
+class TestDeadline(unittest.TestCase):
+
+    def test_remaining_counts_down_to_zero(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        deadline = Deadline(5)
+
+        mock_monotonic.return_value = 102
+        self.assertEqual(deadline.remaining(), 3)
+        self.assertEqual(deadline.elapsed, 2)
+        self.assertFalse(deadline.expired())
+
+        mock_monotonic.return_value = 106
+        self.assertEqual(deadline.remaining(), 0)
+        self.assertTrue(deadline.expired())
+
+    def test_check_raises_with_elapsed_details(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        deadline = Deadline(5)
+        deadline.check("url")
+
+        mock_monotonic.return_value = 106
+        with self.assertRaises(DeadlineExceededException) as context:
+            deadline.check("url")
+
+        self.assertEqual(context.exception.content, "url")
+        self.assertEqual(context.exception.elapsed, 6)
+        self.assertEqual(context.exception.deadline, 5)
+        self.assertIsInstance(context.exception, TimeoutError)
+
+    def test_limit_timeout_cuts_timeouts_to_remaining_time(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        deadline = Deadline(5)
+
+        mock_monotonic.return_value = 102
+        self.assertEqual(deadline.limit_timeout(None), 3)
+        self.assertEqual(deadline.limit_timeout(10), 3)
+        self.assertEqual(deadline.limit_timeout(1), 1)
+        self.assertEqual(deadline.limit_timeout((1, None)), (1, 3))
+        self.assertEqual(deadline.limit_timeout((10, 2)), (3, 2))
+
+    def test_invalid_deadline_raises_value_error(self, *args):
+        with self.assertRaises(ValueError):
+            Deadline(0)
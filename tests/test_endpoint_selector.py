@@ -0,0 +1,119 @@
+import unittest
+from unittest.mock import patch
+
+from src.sru_queryer._base._endpoint_selector import EndpointSelector
+
+@patch("src.sru_queryer._base._endpoint_selector.time.monotonic")
+class TestEndpointSelector(unittest.TestCase):
+
+    def setUp(self):
+        self.urls = ["http://primary/sru", "http://mirror/sru"]
+
+    def test_unused_endpoints_are_tried_in_order(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        selector = EndpointSelector(self.urls)
+        primary, mirror = selector.endpoints
+
+        self.assertIs(selector.choose(), primary)
+        selector.record(primary, 0.1, failed=False)
+        self.assertIs(selector.choose(), mirror)
+
+    def test_fastest_endpoint_is_chosen(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        selector = EndpointSelector(self.urls)
+        primary, mirror = selector.endpoints
+
+        selector.record(primary, 0.5, failed=False)
+        selector.record(mirror, 0.1, failed=False)
+
+        self.assertIs(selector.choose(), mirror)
+
+    def test_latency_is_a_moving_average(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        selector = EndpointSelector(self.urls, smoothing=0.5)
+        primary, _ = selector.endpoints
+
+        selector.record(primary, 1.0, failed=False)
+        selector.record(primary, 0.2, failed=False)
+
+        self.assertAlmostEqual(primary.latency, 0.6)
+
+    def test_error_rate_outweighs_lower_latency(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        selector = EndpointSelector(self.urls, failure_threshold=10)
+        primary, mirror = selector.endpoints
+        selector.record(primary, 0.1, failed=False)
+        selector.record(mirror, 0.3, failed=False)
+
+        selector.record(primary, 0.1, failed=True)
+
+        self.assertAlmostEqual(primary.error_rate, 0.3)
+        self.assertIs(selector.choose(), mirror)
+
+    def test_errors_are_forgotten_over_time(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        selector = EndpointSelector(self.urls, failure_threshold=10, error_half_life=60)
+        primary, mirror = selector.endpoints
+        selector.record(primary, 0.1, failed=False)
+        selector.record(mirror, 0.3, failed=False)
+        selector.record(primary, 0.1, failed=True)
+
+        mock_monotonic.return_value = 700
+
+        self.assertIs(selector.choose(), primary)
+
+    def test_failed_endpoint_is_unhealthy_until_cooldown_passes(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        selector = EndpointSelector(self.urls, cooldown=30)
+        primary, mirror = selector.endpoints
+        selector.record(mirror, 5, failed=False)
+
+        selector.record(primary, 1, failed=True)
+        self.assertIs(selector.choose(), mirror)
+
+        mock_monotonic.return_value = 130
+        selector.record(mirror, 5, failed=False)
+        self.assertIs(selector.choose(), primary)
+
+    def test_least_recently_failed_endpoint_is_chosen_if_all_are_unhealthy(self, mock_monotonic):
+        selector = EndpointSelector(self.urls)
+        primary, mirror = selector.endpoints
+
+        mock_monotonic.return_value = 100
+        selector.record(mirror, 1, failed=True)
+        mock_monotonic.return_value = 101
+        selector.record(primary, 1, failed=True)
+
+        self.assertIs(selector.choose(), mirror)
+
+    def test_excluded_endpoints_are_not_chosen(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        selector = EndpointSelector(self.urls)
+        primary, mirror = selector.endpoints
+
+        self.assertIs(selector.choose(exclude=[primary]), mirror)
+        self.assertIsNone(selector.choose(exclude=[primary, mirror]))
+
+    def test_failure_status_codes_count_as_failures(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        selector = EndpointSelector(self.urls)
+        primary, _ = selector.endpoints
+
+        selector.record_response(primary, 0.1, 404)
+        self.assertEqual(primary.failures, 0)
+        selector.record_response(primary, 0.1, 503)
+        self.assertEqual(primary.failures, 1)
+
+    def test_urls_are_rewritten_to_other_endpoint(self, *args):
+        selector = EndpointSelector(self.urls)
+        _, mirror = selector.endpoints
+
+        self.assertEqual(selector.rewrite_url("http://primary/sru?version=1.2&operation=explain", mirror), "http://mirror/sru?version=1.2&operation=explain")
+        self.assertEqual(selector.rewrite_url("http://other/sru?version=1.2", mirror), "http://other/sru?version=1.2")
+        self.assertIsNone(selector.find("http://primary/sru2?version=1.2"))
+
+    def test_invalid_endpoints_raise_value_error(self, *args):
+        with self.assertRaises(ValueError):
+            EndpointSelector([])
+        with self.assertRaises(ValueError):
+            EndpointSelector(["http://primary/sru", "http://primary/sru"])
@@ -0,0 +1,87 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.sru_queryer._base._explain_cache import ExplainCache
+from tests.testData.test_data import get_gapines_sru_configuration
+
+class TestExplainCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.cache = ExplainCache(self.temporary_directory.name, ttl=60)
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def test_get_returns_stored_configuration(self):
+        configuration = get_gapines_sru_configuration()
+
+        self.cache.set("https://server.com", "1.1", configuration)
+        cached_configuration = self.cache.get("https://server.com", "1.1")
+
+        self.assertDictEqual(cached_configuration.__dict__, json.loads(json.dumps(configuration.__dict__)))
+        self.assertIsNot(cached_configuration, configuration)
+
+    def test_get_missing_entry_returns_none(self):
+        self.assertIsNone(self.cache.get("https://server.com", "1.1"))
+
+    def test_entries_are_keyed_by_server_url_and_version(self):
+        self.cache.set("https://server.com", "1.1", get_gapines_sru_configuration())
+
+        self.assertIsNone(self.cache.get("https://server.com", "1.2"))
+        self.assertIsNone(self.cache.get("https://other-server.com", "1.1"))
+
+    def test_expired_entry_returns_none(self):
+        with patch("src.sru_queryer._base._explain_cache.time.time", return_value=1000):
+            self.cache.set("https://server.com", "1.1", get_gapines_sru_configuration())
+        with patch("src.sru_queryer._base._explain_cache.time.time", return_value=1059):
+            self.assertIsNotNone(self.cache.get("https://server.com", "1.1"))
+        with patch("src.sru_queryer._base._explain_cache.time.time", return_value=1061):
+            self.assertIsNone(self.cache.get("https://server.com", "1.1"))
+
+    def test_corrupt_entry_returns_none(self):
+        self.cache.set("https://server.com", "1.1", get_gapines_sru_configuration())
+        with open(self.cache._get_path("https://server.com", "1.1"), "w") as f:
+            f.write("{not json")
+
+        self.assertIsNone(self.cache.get("https://server.com", "1.1"))
+
+    def test_set_leaves_no_temporary_files(self):
+        self.cache.set("https://server.com", "1.1", get_gapines_sru_configuration())
+        self.cache.set("https://server.com", "1.1", get_gapines_sru_configuration())
+
+        self.assertEqual(os.listdir(self.temporary_directory.name), [os.path.basename(self.cache._get_path("https://server.com", "1.1"))])
+
+    def test_failed_write_keeps_previous_entry(self):
+        self.cache.set("https://server.com", "1.1", get_gapines_sru_configuration())
+        unserializable_configuration = get_gapines_sru_configuration()
+        unserializable_configuration.default_index = object()
+
+        with self.assertRaises(TypeError):
+            self.cache.set("https://server.com", "1.1", unserializable_configuration)
+
+        self.assertEqual(self.cache.get("https://server.com", "1.1").default_index, get_gapines_sru_configuration().default_index)
+        self.assertEqual(len(os.listdir(self.temporary_directory.name)), 1)
+
+    def test_expired_entry_and_validators_can_be_read_for_revalidation(self):
+        with patch("src.sru_queryer._base._explain_cache.time.time", return_value=1000):
+            self.cache.set("https://server.com", "1.1", get_gapines_sru_configuration(), etag='"abc"', last_modified="Wed, 21 Oct 2015 07:28:00 GMT")
+
+        self.assertIsNone(self.cache.get("https://server.com", "1.1"))
+        self.assertIsNotNone(self.cache.get("https://server.com", "1.1", allow_expired=True))
+        self.assertEqual(self.cache.get_validators("https://server.com", "1.1"), ('"abc"', "Wed, 21 Oct 2015 07:28:00 GMT"))
+        self.assertEqual(self.cache.get_validators("https://server.com", "1.2"), (None, None))
+
+    def test_invalidate_and_clear(self):
+        self.cache.set("https://server.com", "1.1", get_gapines_sru_configuration())
+        self.cache.set("https://server.com", "1.2", get_gapines_sru_configuration())
+
+        self.cache.invalidate("https://server.com", "1.1")
+        self.assertIsNone(self.cache.get("https://server.com", "1.1"))
+        self.assertIsNotNone(self.cache.get("https://server.com", "1.2"))
+
+        self.cache.clear()
+        self.assertIsNone(self.cache.get("https://server.com", "1.2"))
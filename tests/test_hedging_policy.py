@@ -0,0 +1,69 @@
+import math
+import random
+import unittest
+
+from src.sru_queryer._base._hedging_policy import HedgingPolicy
+
+class TestHedgingPolicy(unittest.TestCase):
+
+    def test_no_delay_until_enough_samples(self):
+        hedging_policy = HedgingPolicy(min_samples=3)
+        hedging_policy.record_latency(0.1)
+        hedging_policy.record_latency(0.2)
+
+        self.assertIsNone(hedging_policy.get_delay())
+
+    def test_delay_is_latency_percentile(self):
+        hedging_policy = HedgingPolicy(percentile=90, min_samples=10)
+        for latency in range(1, 101):
+            hedging_policy.record_latency(latency / 100)
+
+        self.assertEqual(hedging_policy.get_delay(), 0.9)
+
+    def test_only_recent_latencies_are_used(self):
+        hedging_policy = HedgingPolicy(percentile=50, min_samples=1, window=3)
+        for latency in [5, 5, 5, 0.1, 0.1, 0.1]:
+            hedging_policy.record_latency(latency)
+
+        self.assertEqual(hedging_policy.get_delay(), 0.1)
+
+    def test_delay_matches_sorted_window(self):
+        hedging_policy = HedgingPolicy(percentile=95, min_samples=1, window=50)
+        generator = random.Random(1)
+        latencies = [generator.random() for _ in range(200)]
+
+        for i, latency in enumerate(latencies):
+            hedging_policy.record_latency(latency)
+            window = sorted(latencies[max(i - 49, 0):i + 1])
+            self.assertEqual(hedging_policy.get_delay(), window[min(math.ceil(len(window) * 0.95) - 1, len(window) - 1)])
+
+    def test_fixed_delay_is_used_without_samples(self):
+        hedging_policy = HedgingPolicy(delay=0.25)
+
+        self.assertEqual(hedging_policy.get_delay(), 0.25)
+
+    def test_hedges_are_limited_to_extra_load(self):
+        hedging_policy = HedgingPolicy(max_extra_load=0.1, delay=0.1)
+
+        hedges = 0
+        for _ in range(100):
+            hedging_policy.get_delay()
+            if hedging_policy.try_hedge():
+                hedges += 1
+
+        self.assertEqual(hedges, 10)
+        self.assertEqual(hedging_policy.hedged, 10)
+        self.assertEqual(hedging_policy.requests, 100)
+
+    def test_budget_is_capped(self):
+        hedging_policy = HedgingPolicy(max_extra_load=1, delay=0.1, max_budget=2)
+        for _ in range(10):
+            hedging_policy.get_delay()
+
+        self.assertEqual([hedging_policy.try_hedge() for _ in range(3)], [True, True, False])
+
+    def test_invalid_arguments_raise_value_error(self):
+        with self.assertRaises(ValueError):
+            HedgingPolicy(percentile=100)
+        with self.assertRaises(ValueError):
+            HedgingPolicy(max_extra_load=-1)
@@ -0,0 +1,132 @@
+import json
+import unittest
+from types import MappingProxyType
+
+from src.sru_queryer import SRUQueryer
+from src.sru_queryer._base._index_catalog import IndexCatalog, IndexRecord
+from src.sru_queryer._base._sru_configuration import SRUConfiguration
+from src.sru_queryer._base._sru_validator import SRUValidator
+from tests.testData.test_data import TestFiles, get_alma_sru_configuration, get_gapines_sru_configuration
+
+def load_available_context_sets_and_indexes(path: str) -> dict:
+    with open(path, "r") as f:
+        return json.load(f)
+
+class TestIndexCatalog(unittest.TestCase):
+
+    def test_to_dict_round_trips(self):
+        for path in [TestFiles.alma_available_context_sets_and_indexes, TestFiles.loc_available_context_sets_and_indexes, TestFiles.gapines_available_context_sets_and_indexes]:
+            with self.subTest(path=path):
+                available_context_sets_and_indexes = load_available_context_sets_and_indexes(path)
+
+                catalog = IndexCatalog(available_context_sets_and_indexes)
+
+                self.assertDictEqual(catalog.to_dict(), available_context_sets_and_indexes)
+
+    def test_lookups_match_dict(self):
+        available_context_sets_and_indexes = load_available_context_sets_and_indexes(TestFiles.alma_available_context_sets_and_indexes)
+
+        catalog = IndexCatalog(available_context_sets_and_indexes)
+
+        self.assertEqual(set(catalog), set(available_context_sets_and_indexes))
+        self.assertIn("alma", catalog)
+        self.assertIn("title", catalog["alma"])
+        self.assertNotIn("not_an_index", catalog["alma"])
+        record = catalog["alma"]["title"]
+        self.assertEqual(record["title"], available_context_sets_and_indexes["alma"]["title"]["title"])
+        self.assertEqual(record["sort"], available_context_sets_and_indexes["alma"]["title"]["sort"])
+        self.assertEqual(record["supported_relations"], frozenset(available_context_sets_and_indexes["alma"]["title"]["supported_relations"]))
+        self.assertEqual(record.relation_order, tuple(available_context_sets_and_indexes["alma"]["title"]["supported_relations"]))
+
+    def test_indexes_with_same_relations_share_frozenset(self):
+        catalog = IndexCatalog({
+            "alma": {
+                "title": {"id": None, "title": "Title", "sort": True, "supported_relations": ["all", "=", "=="], "empty_term_supported": True},
+                "creator": {"id": None, "title": "Creator", "sort": True, "supported_relations": ["all", "=", "=="], "empty_term_supported": True},
+                "date": {"id": None, "title": "Date", "sort": False, "supported_relations": ["<", ">"], "empty_term_supported": None}
+            },
+            "other": {
+                "title": {"id": None, "title": "Title", "sort": None, "supported_relations": ["all", "=", "=="], "empty_term_supported": None}
+            }
+        })
+
+        self.assertIs(catalog["alma"]["title"].supported_relations, catalog["alma"]["creator"].supported_relations)
+        self.assertIs(catalog["alma"]["title"].supported_relations, catalog["other"]["title"].supported_relations)
+        self.assertIsNot(catalog["alma"]["title"].supported_relations, catalog["alma"]["date"].supported_relations)
+
+    def test_names_are_interned(self):
+        # Build the names at runtime so they aren't already interned as constants
+        context_set_name = "".join(["al", "ma"])
+        index_name = "".join(["ti", "tle"])
+
+        catalog = IndexCatalog({context_set_name: {index_name: {"id": None, "title": "Title", "sort": None, "supported_relations": None, "empty_term_supported": None}}})
+
+        self.assertIs(next(iter(catalog)), "alma")
+        self.assertIs(next(iter(catalog["alma"])), "title")
+
+    def test_missing_relations_stay_none(self):
+        catalog = IndexCatalog({"alma": {"title": {"id": None, "title": "Title", "sort": None, "supported_relations": None, "empty_term_supported": None}}})
+
+        self.assertIsNone(catalog["alma"]["title"]["supported_relations"])
+        self.assertIsNone(catalog.to_dict()["alma"]["title"]["supported_relations"])
+
+    def test_catalog_and_records_are_read_only(self):
+        catalog = IndexCatalog(load_available_context_sets_and_indexes(TestFiles.alma_available_context_sets_and_indexes))
+
+        self.assertIsInstance(catalog["alma"], MappingProxyType)
+        with self.assertRaises(TypeError):
+            catalog["alma"]["title"] = None
+        with self.assertRaises(AttributeError):
+            catalog["alma"]["title"].sort = False
+        with self.assertRaises(KeyError):
+            catalog["alma"]["title"]["relation_order"]
+
+    def test_records_have_no_instance_dict(self):
+        record = IndexRecord(None, "Title", None, None, None, None)
+
+        self.assertFalse(hasattr(record, "__dict__"))
+
+    def test_equal_records_have_equal_hashes(self):
+        record = IndexRecord(None, "Title", True, frozenset(["=", "all"]), ("=", "all"), None)
+        same_record = IndexRecord(None, "Title", True, frozenset(["=", "all"]), ("=", "all"), None)
+
+        self.assertEqual(record, same_record)
+        self.assertEqual(hash(record), hash(same_record))
+        self.assertEqual(len({record, same_record}), 1)
+
+        # Titles with attributes (or several titles) are dicts or lists
+        configuration = SRUQueryer.from_explain_xml(TestFiles.explain_response_namespaced, server_url="https://server.com", compact_configuration=True).sru_configuration
+        records = [record for indexes in configuration.available_context_sets_and_indexes.values() for record in indexes.values()]
+
+        self.assertTrue(any(not isinstance(record.title, str) for record in records))
+        for record in records:
+            same_record = IndexRecord(record.id, record.title, record.sort, record.supported_relations, record.relation_order, record.empty_term_supported)
+            self.assertEqual(hash(record), hash(same_record))
+
+class TestCompactSRUConfiguration(unittest.TestCase):
+
+    def test_compact_configuration_to_dict_matches_original(self):
+        configuration = get_gapines_sru_configuration()
+        original = dict(configuration.__dict__)
+
+        configuration.compact()
+
+        self.assertIsInstance(configuration.available_context_sets_and_indexes, IndexCatalog)
+        self.assertDictEqual(configuration.to_dict(), original)
+        self.assertDictEqual(SRUConfiguration(configuration.to_dict()).__dict__, original)
+
+    def test_compact_is_idempotent(self):
+        configuration = get_alma_sru_configuration().compact()
+        catalog = configuration.available_context_sets_and_indexes
+
+        self.assertIs(configuration.compact().available_context_sets_and_indexes, catalog)
+
+    def test_validation_with_compact_configuration(self):
+        configuration = get_alma_sru_configuration().compact()
+
+        SRUValidator.validate_cql(configuration, "alma", "title", "=", "Harry Potter")
+
+        with self.assertRaises(ValueError):
+            SRUValidator.validate_cql(configuration, "alma", "title", "not_a_relation", "Harry Potter")
+        with self.assertRaises(ValueError):
+            SRUValidator.validate_cql(configuration, "alma", "not_an_index", "=", "Harry Potter")
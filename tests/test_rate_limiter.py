@@ -0,0 +1,144 @@
+import unittest
+from unittest.mock import patch
+import email.utils
+import time
+
+from src.sru_queryer._base._rate_limiter import RateLimiter
+
+@patch("src.sru_queryer._base._rate_limiter.time.monotonic")
+class TestRateLimiter(unittest.TestCase):
+
+    def test_burst_is_let_through_at_once(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        rate_limiter = RateLimiter(rate=2, burst=3)
+
+        delays = [rate_limiter.reserve() for _ in range(5)]
+
+        self.assertEqual(delays, [0, 0, 0, 0.5, 1])
+
+    def test_requests_after_burst_are_spaced_by_rate(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        rate_limiter = RateLimiter(rate=4)
+
+        delays = [rate_limiter.reserve() for _ in range(3)]
+
+        self.assertEqual(delays, [0, 0.25, 0.5])
+
+    def test_bucket_refills_over_time(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        rate_limiter = RateLimiter(rate=1, burst=2)
+        rate_limiter.reserve()
+        rate_limiter.reserve()
+
+        mock_monotonic.return_value = 102
+
+        self.assertEqual([rate_limiter.reserve(), rate_limiter.reserve(), rate_limiter.reserve()], [0, 0, 1])
+
+    def test_throttled_response_decreases_rate(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        rate_limiter = RateLimiter(rate=10)
+
+        rate_limiter.record_response(429)
+
+        self.assertEqual(rate_limiter.rate, 5)
+        self.assertEqual(rate_limiter.throttled, 1)
+
+    def test_rate_decreases_at_most_once_per_second(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        rate_limiter = RateLimiter(rate=10)
+
+        rate_limiter.record_response(503)
+        rate_limiter.record_response(429)
+        mock_monotonic.return_value = 101
+        rate_limiter.record_response(429)
+
+        self.assertEqual(rate_limiter.rate, 2.5)
+        self.assertEqual(rate_limiter.throttled, 3)
+
+    def test_rate_does_not_go_below_min_rate(self, mock_monotonic):
+        rate_limiter = RateLimiter(rate=10, min_rate=4)
+
+        for second in range(5):
+            mock_monotonic.return_value = 100 + second
+            rate_limiter.record_response(429)
+
+        self.assertEqual(rate_limiter.rate, 4)
+
+    def test_rate_recovers_up_to_max_rate(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        rate_limiter = RateLimiter(rate=10, increase_step=2)
+        rate_limiter.record_response(429)
+
+        rate_limiter.record_response(200)
+        self.assertEqual(rate_limiter.rate, 7)
+
+        for _ in range(5):
+            rate_limiter.record_response(200)
+        self.assertEqual(rate_limiter.rate, 10)
+
+    def test_other_error_statuses_are_not_throttling(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        rate_limiter = RateLimiter(rate=10)
+
+        rate_limiter.record_response(500)
+
+        self.assertEqual(rate_limiter.rate, 10)
+        self.assertEqual(rate_limiter.throttled, 0)
+
+    def test_retry_after_seconds_pauses_requests(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        rate_limiter = RateLimiter(rate=10, burst=5)
+
+        rate_limiter.record_response(429, "3")
+
+        self.assertEqual(rate_limiter.reserve(), 3)
+
+    def test_retry_after_date_pauses_requests(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        rate_limiter = RateLimiter(rate=10, burst=5)
+
+        rate_limiter.record_response(503, email.utils.formatdate(time.time() + 30, usegmt=True))
+
+        self.assertAlmostEqual(rate_limiter.reserve(), 30, delta=1.5)
+
+    def test_retry_after_is_capped(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        rate_limiter = RateLimiter(rate=10, max_retry_after=60)
+
+        rate_limiter.record_response(429, "3600")
+
+        self.assertEqual(rate_limiter.reserve(), 60)
+
+    def test_invalid_retry_after_is_ignored(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        rate_limiter = RateLimiter(rate=10)
+
+        rate_limiter.record_response(429, "soon")
+
+        self.assertEqual(rate_limiter.reserve(), 0)
+
+    def test_reserve_does_not_take_token_if_wait_is_too_long(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        rate_limiter = RateLimiter(rate=2)
+        rate_limiter.reserve()
+
+        self.assertIsNone(rate_limiter.reserve(max_wait=0.1))
+        self.assertEqual(rate_limiter.reserve(max_wait=1), 0.5)
+
+    def test_invalid_arguments_raise_value_error(self, *args):
+        with self.assertRaises(ValueError):
+            RateLimiter(rate=0)
+        with self.assertRaises(ValueError):
+            RateLimiter(rate=1, burst=0)
+
+class TestRateLimiterAcquire(unittest.TestCase):
+
+    def test_acquire_blocks_until_token_is_available(self):
+        rate_limiter = RateLimiter(rate=10)
+
+        start = time.monotonic()
+        for _ in range(4):
+            rate_limiter.acquire()
+        elapsed = time.monotonic() - start
+
+        self.assertGreaterEqual(elapsed, 0.29)
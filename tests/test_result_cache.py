@@ -0,0 +1,88 @@
+import time
+import unittest
+from unittest.mock import patch
+
+from src.sru_queryer._base._result_cache import ResultCache, ResultCacheBase
+
+class TestResultCache(unittest.TestCase):
+
+    def test_get_returns_stored_content(self):
+        result_cache = ResultCache()
+
+        result_cache.set("https://server.com/sru?query=1", b"response")
+
+        self.assertEqual(result_cache.get("https://server.com/sru?query=1"), b"response")
+        self.assertIsNone(result_cache.get("https://server.com/sru?query=2"))
+        self.assertEqual((result_cache.hits, result_cache.misses), (1, 1))
+
+    def test_incomplete_backends_cannot_be_created(self):
+        class IncompleteResultCache(ResultCacheBase):
+
+            def get(self, url: str) -> bytes | None:
+                return None
+
+            def set(self, url: str, content: bytes):
+                pass
+
+        with self.assertRaises(TypeError):
+            IncompleteResultCache()
+
+    def test_expired_entries_are_misses(self):
+        result_cache = ResultCache(ttl=10)
+        result_cache.set("a", b"response")
+
+        with patch("src.sru_queryer._base._result_cache.time.monotonic", return_value=time.monotonic() + 11):
+            self.assertIsNone(result_cache.get("a"))
+
+        self.assertEqual(len(result_cache), 0)
+        self.assertEqual(result_cache.current_bytes, 0)
+        self.assertEqual(result_cache.misses, 1)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        # Each entry takes 1 byte of URL and 9 of content
+        result_cache = ResultCache(max_bytes=30)
+        result_cache.set("a", b"123456789")
+        result_cache.set("b", b"123456789")
+        result_cache.set("c", b"123456789")
+        result_cache.get("a")
+
+        result_cache.set("d", b"123456789")
+
+        self.assertIsNone(result_cache.get("b"))
+        self.assertIsNotNone(result_cache.get("a"))
+        self.assertIsNotNone(result_cache.get("c"))
+        self.assertIsNotNone(result_cache.get("d"))
+        self.assertEqual(result_cache.evictions, 1)
+        self.assertEqual(result_cache.current_bytes, 30)
+
+    def test_content_larger_than_cache_is_not_stored(self):
+        result_cache = ResultCache(max_bytes=10)
+        result_cache.set("a", b"123")
+
+        result_cache.set("b", b"12345678901")
+
+        self.assertIsNone(result_cache.get("b"))
+        self.assertEqual(result_cache.get("a"), b"123")
+        self.assertEqual(result_cache.evictions, 0)
+
+    def test_replacing_an_entry_updates_size(self):
+        result_cache = ResultCache()
+        result_cache.set("a", b"123456789")
+
+        result_cache.set("a", b"12")
+
+        self.assertEqual(result_cache.get("a"), b"12")
+        self.assertEqual(result_cache.current_bytes, 3)
+
+    def test_invalidate_and_clear(self):
+        result_cache = ResultCache()
+        result_cache.set("a", b"1")
+        result_cache.set("b", b"2")
+
+        result_cache.invalidate("a")
+        self.assertIsNone(result_cache.get("a"))
+        self.assertEqual(len(result_cache), 1)
+
+        result_cache.clear()
+        self.assertEqual(len(result_cache), 0)
+        self.assertEqual(result_cache.current_bytes, 0)
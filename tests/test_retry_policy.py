@@ -0,0 +1,55 @@
+import unittest
+from unittest.mock import patch
+import requests
+
+from src.sru_queryer._base._retry_policy import RetryPolicy
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_retries_retryable_status_codes(self):
+        retry_policy = RetryPolicy(max_attempts=3)
+
+        self.assertTrue(retry_policy.should_retry("GET", 1, status_code=503))
+        self.assertTrue(retry_policy.should_retry("GET", 2, status_code=429))
+        self.assertFalse(retry_policy.should_retry("GET", 1, status_code=200))
+        self.assertFalse(retry_policy.should_retry("GET", 1, status_code=404))
+
+    def test_does_not_retry_after_max_attempts(self):
+        retry_policy = RetryPolicy(max_attempts=3)
+
+        self.assertFalse(retry_policy.should_retry("GET", 3, status_code=503))
+
+    def test_retries_connection_errors_and_timeouts_only(self):
+        retry_policy = RetryPolicy()
+
+        self.assertTrue(retry_policy.should_retry("GET", 1, exception=requests.ConnectionError()))
+        self.assertTrue(retry_policy.should_retry("GET", 1, exception=requests.ReadTimeout()))
+        self.assertFalse(retry_policy.should_retry("GET", 1, exception=ValueError()))
+
+    def test_does_not_retry_non_idempotent_methods(self):
+        retry_policy = RetryPolicy()
+
+        self.assertFalse(retry_policy.should_retry("POST", 1, status_code=503))
+
+    @patch("src.sru_queryer._base._retry_policy.random.uniform")
+    def test_backoff_grows_exponentially_with_full_jitter(self, mock_uniform):
+        mock_uniform.side_effect = lambda low, high: high
+        retry_policy = RetryPolicy(backoff=0.5, max_backoff=3)
+
+        delays = [retry_policy.get_delay(attempt) for attempt in range(1, 5)]
+
+        self.assertEqual(delays, [0.5, 1, 2, 3])
+        self.assertEqual(mock_uniform.call_args_list[0].args, (0, 0.5))
+
+    def test_delay_honours_retry_after(self):
+        retry_policy = RetryPolicy(backoff=0.1, max_backoff=10)
+
+        self.assertEqual(retry_policy.get_delay(1, "4"), 4)
+        self.assertEqual(retry_policy.get_delay(1, "60"), 10)
+        self.assertLessEqual(RetryPolicy(backoff=0.1, respect_retry_after=False).get_delay(1, "4"), 0.1)
+
+    def test_invalid_arguments_raise_value_error(self):
+        with self.assertRaises(ValueError):
+            RetryPolicy(max_attempts=0)
+        with self.assertRaises(ValueError):
+            RetryPolicy(backoff=-1)
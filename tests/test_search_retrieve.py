@@ -258,7 +258,7 @@ class TestSearchRetrieve(unittest.TestCase):
         self.assertIn("'fake_index'", ve.exception.__str__())
                 
 class TestQueryWithXMLData(unittest.TestCase):
-    @patch("src.sru_queryer._base._sru_queryer.requests.get")
+    @patch("src.sru_queryer._base._sru_queryer.requests.Session.send")
     def test_construct_request_gapines_data_default_schema_returned_by_explain(self, mock_get):
         """Integration"""
         with open(TestFiles.explain_response_gapines, "rb") as f:
@@ -275,7 +275,7 @@ class TestQueryWithXMLData(unittest.TestCase):
             self.assertEqual(
                 constructed_search_retrieve_request.url, expected_request.url)
             
-    @patch("src.sru_queryer._base._sru_queryer.requests.get")
+    @patch("src.sru_queryer._base._sru_queryer.requests.Session.send")
     def test_initialize_1_2_query_with_invalid_sort_type_raises_error(self, mock_get):
          with open(TestFiles.explain_response_alma, "rb") as f:
             mock_get.return_value.content = f.read()
@@ -287,7 +287,7 @@ class TestQueryWithXMLData(unittest.TestCase):
             self.assertIn("SortKeys", ve.exception.__str__())
             self.assertIn("1.2", ve.exception.__str__())
 
-    @patch("src.sru_queryer._base._sru_queryer.requests.get")
+    @patch("src.sru_queryer._base._sru_queryer.requests.Session.send")
     def test_initialize_1_1_query_with_invalid_sort_type_raises_error(self, mock_get):
         with open(TestFiles.explain_response_gapines, "rb") as f:
             mock_get.return_value.content = f.read()
@@ -299,7 +299,7 @@ class TestQueryWithXMLData(unittest.TestCase):
             self.assertIn("SortKeys", ve.exception.__str__())
             self.assertIn("1.1", ve.exception.__str__())
 
-    @patch('src.sru_queryer._base._sru_queryer.requests.get')
+    @patch('src.sru_queryer._base._sru_queryer.requests.Session.send')
     def test_initialize_and_format_base_query_no_schema_no_error(self, mock_get):
         """Integration"""
         with open(TestFiles.explain_response_loc, "rb") as f:
@@ -309,7 +309,7 @@ class TestQueryWithXMLData(unittest.TestCase):
 
             SearchRetrieve(sru_configuration, RawCQL("pass")).validate()
     
-    @patch('src.sru_queryer._base._sru_queryer.requests.get')
+    @patch('src.sru_queryer._base._sru_queryer.requests.Session.send')
     def test_initialize_query_default_schema_raises_no_error(self, mock_get):
         """Integration"""
         with open(TestFiles.explain_response_gapines, "rb") as f:
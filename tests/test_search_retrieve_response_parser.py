@@ -0,0 +1,114 @@
+import gc
+import io
+import unittest
+import weakref
+from xml.etree import ElementTree
+
+from src.sru_queryer._base._search_retrieve_response_parser import SearchRetrieveResponseParser
+from tests.testData.stub_sru_server import search_retrieve_response
+
+class TestParsePaginationInfo(unittest.TestCase):
+
+    def test_parse_number_of_records_and_next_record_position(self):
+        content = search_retrieve_response(number_of_records=25, start_record=1, maximum_records=10)
+
+        self.assertEqual(SearchRetrieveResponseParser.parse_pagination_info(content), (25, 11))
+
+    def test_last_page_has_no_next_record_position(self):
+        content = search_retrieve_response(number_of_records=25, start_record=21, maximum_records=10)
+
+        self.assertEqual(SearchRetrieveResponseParser.parse_pagination_info(content), (25, None))
+
+    def test_namespace_prefixes_are_ignored(self):
+        content = b'<zs:searchRetrieveResponse xmlns:zs="http://docs.oasis-open.org/ns/search-ws/sruResponse"><zs:version>2.0</zs:version><zs:numberOfRecords>3</zs:numberOfRecords><zs:nextRecordPosition>2</zs:nextRecordPosition></zs:searchRetrieveResponse>'
+
+        self.assertEqual(SearchRetrieveResponseParser.parse_pagination_info(content), (3, 2))
+
+    def test_elements_inside_records_are_ignored(self):
+        content = b"<searchRetrieveResponse><numberOfRecords>1</numberOfRecords><records><record><recordData><numberOfRecords>99</numberOfRecords></recordData></record></records></searchRetrieveResponse>"
+
+        self.assertEqual(SearchRetrieveResponseParser.parse_pagination_info(content), (1, None))
+
+    def test_diagnostic_response_has_no_pagination_info(self):
+        content = b"<searchRetrieveResponse><diagnostics><diagnostic><uri>info:srw/diagnostic/1/10</uri></diagnostic></diagnostics></searchRetrieveResponse>"
+
+        self.assertEqual(SearchRetrieveResponseParser.parse_pagination_info(content), (None, None))
+
+    def test_invalid_xml_raises_parse_error(self):
+        with self.assertRaises(ElementTree.ParseError):
+            SearchRetrieveResponseParser.parse_pagination_info(b"<html><body>Server Error</html>")
+
+
+class TestSearchRetrieveResponseParser(unittest.TestCase):
+
+    def test_iter_records_yields_each_record(self):
+        parser = SearchRetrieveResponseParser(search_retrieve_response(number_of_records=25, start_record=1, maximum_records=10))
+
+        records = [(record.record_schema, record.record_packing, record.record_position, record.element.findtext("{http://purl.org/dc/elements/1.1/}title")) for record in parser]
+
+        self.assertEqual(len(records), 10)
+        self.assertEqual(records[0], ("dc", "xml", 1, "Record 1"))
+        self.assertEqual(records[9], ("dc", "xml", 10, "Record 10"))
+        self.assertEqual(parser.version, "1.2")
+        self.assertEqual(parser.number_of_records, 25)
+        self.assertEqual(parser.next_record_position, 11)
+
+    def test_string_packed_records(self):
+        content = b"<searchRetrieveResponse><numberOfRecords>1</numberOfRecords><records><record><recordSchema>dc</recordSchema><recordPacking>string</recordPacking><recordData>&lt;dc&gt;&lt;title&gt;Frog&lt;/title&gt;&lt;/dc&gt;</recordData><recordPosition>1</recordPosition></record></records></searchRetrieveResponse>"
+
+        records = SearchRetrieveResponseParser(content).read_all()
+
+        self.assertIsNone(records[0].element)
+        self.assertEqual(records[0].text, "<dc><title>Frog</title></dc>")
+        self.assertEqual(records[0].to_xml(), b"<dc><title>Frog</title></dc>")
+
+    def test_to_xml_serializes_record(self):
+        record = SearchRetrieveResponseParser(search_retrieve_response()).read_all()[0]
+
+        self.assertIn(b"Record 1</", record.to_xml())
+
+    def test_diagnostics_are_parsed(self):
+        content = b'<zs:searchRetrieveResponse xmlns:zs="http://www.loc.gov/zing/srw/"><zs:version>1.2</zs:version><zs:numberOfRecords>0</zs:numberOfRecords><zs:diagnostics><diag:diagnostic xmlns:diag="http://www.loc.gov/zing/srw/diagnostic/"><diag:uri>info:srw/diagnostic/1/16</diag:uri><diag:details>fake_index</diag:details><diag:message>Unsupported index</diag:message></diag:diagnostic></zs:diagnostics></zs:searchRetrieveResponse>'
+
+        parser = SearchRetrieveResponseParser(content)
+        records = parser.read_all()
+
+        self.assertEqual(records, [])
+        self.assertEqual(len(parser.diagnostics), 1)
+        self.assertEqual(parser.diagnostics[0].uri, "info:srw/diagnostic/1/16")
+        self.assertEqual(parser.diagnostics[0].details, "fake_index")
+        self.assertEqual(parser.diagnostics[0].message, "Unsupported index")
+
+    def test_records_are_yielded_before_response_is_read(self):
+        content = search_retrieve_response(number_of_records=10)
+        chunks_read = []
+
+        def chunks():
+            for i in range(0, len(content), 64):
+                chunks_read.append(i)
+                yield content[i:i + 64]
+
+        records = iter(SearchRetrieveResponseParser(chunks()))
+        next(records)
+
+        self.assertLess(len(chunks_read) * 64, len(content) / 2)
+
+    def test_number_of_records_is_available_before_first_record(self):
+        parser = SearchRetrieveResponseParser(io.BytesIO(search_retrieve_response(number_of_records=10)), chunk_size=16)
+
+        records = iter(parser)
+        next(records)
+
+        self.assertEqual(parser.number_of_records, 10)
+        self.assertIsNone(parser.next_record_position)
+
+    def test_records_are_freed_after_they_are_yielded(self):
+        records = iter(SearchRetrieveResponseParser(search_retrieve_response(number_of_records=3)))
+        record = next(records)
+        element_reference = weakref.ref(record.element)
+
+        del record
+        next(records)
+        gc.collect()
+
+        self.assertIsNone(element_reference())
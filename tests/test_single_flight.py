@@ -0,0 +1,148 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from src.sru_queryer._base._single_flight import AsyncSingleFlight, SingleFlight
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_concurrent_callers_share_one_call(self):
+        single_flight = SingleFlight()
+        calls = []
+
+        def function():
+            calls.append(1)
+            time.sleep(0.2)
+            return b"response"
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: single_flight.do("url", function), range(8)))
+
+        self.assertEqual(results, [b"response"] * 8)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(single_flight.shared, 7)
+
+    def test_concurrent_callers_share_exception(self):
+        single_flight = SingleFlight()
+        calls = []
+
+        def function():
+            calls.append(1)
+            time.sleep(0.2)
+            raise ConnectionError("Connection reset")
+
+        def call():
+            try:
+                single_flight.do("url", function)
+            except ConnectionError as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            exceptions = list(executor.map(lambda _: call(), range(4)))
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(isinstance(exception, ConnectionError) for exception in exceptions))
+
+    def test_different_keys_are_not_shared(self):
+        single_flight = SingleFlight()
+        barrier = threading.Barrier(2)
+
+        def function(key):
+            barrier.wait(timeout=5)
+            return key
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(lambda key: single_flight.do(key, lambda: function(key)), ["a", "b"]))
+
+        self.assertEqual(results, ["a", "b"])
+        self.assertEqual(single_flight.shared, 0)
+
+    def test_finished_calls_are_not_reused(self):
+        single_flight = SingleFlight()
+        calls = []
+
+        single_flight.do("url", lambda: calls.append(1))
+        single_flight.do("url", lambda: calls.append(1))
+
+        self.assertEqual(len(calls), 2)
+
+    def test_waiting_caller_times_out(self):
+        single_flight = SingleFlight()
+        leader = threading.Thread(target=single_flight.do, args=("url", lambda: time.sleep(0.5)))
+        leader.start()
+        time.sleep(0.05)
+
+        start = time.monotonic()
+        with self.assertRaises(TimeoutError):
+            single_flight.do("url", lambda: None, timeout=0.1)
+        elapsed = time.monotonic() - start
+        leader.join()
+
+        self.assertLess(elapsed, 0.4)
+
+class TestAsyncSingleFlight(unittest.IsolatedAsyncioTestCase):
+
+    async def test_concurrent_callers_share_one_call(self):
+        single_flight = AsyncSingleFlight()
+        calls = []
+
+        async def function():
+            calls.append(1)
+            await asyncio.sleep(0.1)
+            return b"response"
+
+        results = await asyncio.gather(*[single_flight.do("url", function) for _ in range(5)])
+
+        self.assertEqual(results, [b"response"] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(single_flight.shared, 4)
+
+    async def test_concurrent_callers_share_exception(self):
+        single_flight = AsyncSingleFlight()
+
+        async def function():
+            await asyncio.sleep(0.1)
+            raise ConnectionError("Connection reset")
+
+        results = await asyncio.gather(*[single_flight.do("url", function) for _ in range(3)], return_exceptions=True)
+
+        self.assertTrue(all(isinstance(result, ConnectionError) for result in results))
+
+    async def test_cancelling_one_caller_does_not_cancel_the_others(self):
+        single_flight = AsyncSingleFlight()
+        started = []
+
+        async def function():
+            started.append(1)
+            await asyncio.sleep(0.2)
+            return b"response"
+
+        first = asyncio.ensure_future(single_flight.do("url", function))
+        second = asyncio.ensure_future(single_flight.do("url", function))
+        await asyncio.sleep(0.05)
+        first.cancel()
+
+        self.assertEqual(await second, b"response")
+        self.assertTrue(first.cancelled())
+        self.assertEqual(len(started), 1)
+
+    async def test_call_is_cancelled_once_every_caller_is(self):
+        single_flight = AsyncSingleFlight()
+        finished = []
+
+        async def function():
+            await asyncio.sleep(0.2)
+            finished.append(1)
+
+        callers = [asyncio.ensure_future(single_flight.do("url", function)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.sleep(0.3)
+
+        self.assertEqual(finished, [])
+        # The next caller starts a new call
+        self.assertIsNone(await single_flight.do("url", function))
+        self.assertEqual(finished, [1])
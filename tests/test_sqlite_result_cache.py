@@ -0,0 +1,170 @@
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from src.sru_queryer import SRUQueryer
+from src.sru_queryer._base._sqlite_result_cache import SQLiteResultCache
+from src.sru_queryer.cql import SearchClause
+from tests.testData.stub_sru_server import StubSRUServer
+
+def write_entries(path: str, worker: int, count: int):
+    result_cache = SQLiteResultCache(path, timeout=30)
+    for i in range(count):
+        result_cache.set(f"https://server.com/sru?worker={worker}&query={i}", f"response {worker} {i}".encode() * 100)
+
+class TestSQLiteResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temporary_directory.name, "responses.sqlite")
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def test_get_returns_stored_content(self):
+        result_cache = SQLiteResultCache(self.path)
+
+        result_cache.set("https://server.com/sru?query=1", b"response")
+
+        self.assertEqual(result_cache.get("https://server.com/sru?query=1"), b"response")
+        self.assertIsNone(result_cache.get("https://server.com/sru?query=2"))
+        self.assertEqual((result_cache.hits, result_cache.misses), (1, 1))
+
+    def test_entries_survive_a_new_instance(self):
+        SQLiteResultCache(self.path).set("a", b"response")
+
+        self.assertEqual(SQLiteResultCache(self.path).get("a"), b"response")
+
+    def test_responses_are_compressed(self):
+        result_cache = SQLiteResultCache(self.path)
+        content = b"<record>Harry Potter</record>" * 1000
+
+        result_cache.set("a", content)
+
+        stored_content = sqlite3.connect(self.path).execute("SELECT content FROM responses WHERE url = 'a'").fetchone()[0]
+        self.assertLess(len(stored_content), len(content) / 10)
+        self.assertEqual(result_cache.current_bytes, len(stored_content))
+        self.assertEqual(result_cache.get("a"), content)
+
+    def test_expired_entries_are_misses(self):
+        result_cache = SQLiteResultCache(self.path, ttl=10)
+        result_cache.set("a", b"response")
+
+        with patch("src.sru_queryer._base._sqlite_result_cache.time.time", return_value=time.time() + 11):
+            self.assertIsNone(result_cache.get("a"))
+            self.assertEqual(len(result_cache), 0)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        # Level 0 stores the responses uncompressed (plus a few bytes of zlib framing)
+        entry_size = len(zlib.compress(b"1" * 100, 0))
+        result_cache = SQLiteResultCache(self.path, max_bytes=entry_size * 3, compression_level=0)
+        with patch("src.sru_queryer._base._sqlite_result_cache.time.time", side_effect=[time.time() + i for i in range(10)]):
+            result_cache.set("a", b"1" * 100)
+            result_cache.set("b", b"1" * 100)
+            result_cache.set("c", b"1" * 100)
+            result_cache.get("a")
+            result_cache.set("d", b"1" * 100)
+
+        self.assertEqual(result_cache.evictions, 1)
+        self.assertEqual(result_cache.current_bytes, entry_size * 3)
+        self.assertIsNone(result_cache.get("b"))
+        self.assertIsNotNone(result_cache.get("a"))
+        self.assertIsNotNone(result_cache.get("d"))
+
+    def test_get_does_not_need_the_write_lock(self):
+        result_cache = SQLiteResultCache(self.path, timeout=0.1)
+        result_cache.set("a", b"response")
+        used_at = time.time() + 1
+        writer = sqlite3.connect(self.path, isolation_level=None)
+        writer.execute("BEGIN IMMEDIATE")
+        try:
+            with self.assertNoLogs(level="WARNING"), patch("src.sru_queryer._base._sqlite_result_cache.time.time", return_value=used_at):
+                self.assertEqual(result_cache.get("a"), b"response")
+        finally:
+            writer.execute("ROLLBACK")
+            writer.close()
+
+        # The use is written once the database is free again
+        result_cache.flush()
+        last_used = sqlite3.connect(self.path).execute("SELECT last_used FROM responses WHERE url = 'a'").fetchone()[0]
+        self.assertEqual(last_used, used_at)
+
+    def test_total_size_follows_changes(self):
+        result_cache = SQLiteResultCache(self.path, ttl=10, compression_level=0)
+        result_cache.set("a", b"1" * 100)
+        result_cache.set("b", b"1" * 200)
+        result_cache.set("a", b"1" * 300)
+        result_cache.invalidate("b")
+        with patch("src.sru_queryer._base._sqlite_result_cache.time.time", return_value=time.time() + 11):
+            result_cache.set("c", b"1" * 50)
+
+        stored_size = sqlite3.connect(self.path).execute("SELECT SUM(size) FROM responses").fetchone()[0]
+        self.assertEqual(stored_size, len(zlib.compress(b"1" * 50, 0)))
+        self.assertEqual(result_cache.current_bytes, stored_size)
+
+    def test_invalidate_and_clear(self):
+        result_cache = SQLiteResultCache(self.path)
+        result_cache.set("a", b"1")
+        result_cache.set("b", b"2")
+
+        result_cache.invalidate("a")
+        self.assertIsNone(result_cache.get("a"))
+        self.assertEqual(len(result_cache), 1)
+
+        result_cache.clear()
+        self.assertEqual(len(result_cache), 0)
+
+    def test_database_errors_are_misses(self):
+        result_cache = SQLiteResultCache(self.path)
+        result_cache.set("a", b"response")
+
+        with patch.object(result_cache, "_get_connection", side_effect=sqlite3.OperationalError("database is locked")):
+            with self.assertLogs(level="WARNING"):
+                self.assertIsNone(result_cache.get("a"))
+                result_cache.set("b", b"response")
+
+        self.assertEqual(result_cache.misses, 1)
+
+    def test_concurrent_threads(self):
+        result_cache = SQLiteResultCache(self.path)
+
+        def set_and_get(i: int) -> bytes | None:
+            result_cache.set(f"url{i}", f"response {i}".encode())
+            return result_cache.get(f"url{i}")
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(set_and_get, range(100)))
+
+        self.assertEqual(results, [f"response {i}".encode() for i in range(100)])
+        self.assertEqual(len(result_cache), 100)
+
+    def test_concurrent_processes(self):
+        context = multiprocessing.get_context("spawn")
+        processes = [context.Process(target=write_entries, args=(self.path, worker, 25)) for worker in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(60)
+            self.assertEqual(process.exitcode, 0)
+
+        result_cache = SQLiteResultCache(self.path)
+        self.assertEqual(len(result_cache), 100)
+        self.assertEqual(result_cache.get("https://server.com/sru?worker=3&query=24"), b"response 3 24" * 100)
+
+    def test_queryer_uses_sqlite_cache(self):
+        with StubSRUServer() as server:
+            sru_queryer = SRUQueryer(server.url, result_cache=SQLiteResultCache(self.path))
+            first_response = sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Harry Potter"))
+
+            # A new queryer (as in another worker) uses the same cache
+            other_queryer = SRUQueryer(server.url, result_cache=SQLiteResultCache(self.path))
+            second_response = other_queryer.search_retrieve(SearchClause("eg", "title", "=", "Harry Potter"))
+
+            self.assertEqual(second_response, first_response)
+            self.assertEqual(len([request for request in server.requests if "operation=searchRetrieve" in request]), 1)
@@ -3,7 +3,7 @@ import xmltodict
 import json
 
 from src.sru_queryer._base._exceptions import NoExplainResponseException
-from src.sru_queryer._base._sru_explain_auto_parser import SRUExplainAutoParser
+from src.sru_queryer._base._sru_explain_auto_parser import SRUExplainAutoParser, PropertyPathResolver, generic_driver
 from tests.testData.test_data import TestFiles, test_available_record_schemas
 
 gapines_test_parsed_config_info = {
@@ -264,3 +264,53 @@ class TestSRUExplainAutoParser(unittest.TestCase):
             self.assertIsNone(sru_configuration.available_record_schemas)
 
 
+
+    def test_sort_info_on_later_index_marks_earlier_indexes_unsortable(self):
+        explain_response = """<explainResponse><version>1.2</version><record><recordData><explain><indexInfo>
+            <index><title>Title</title><map><name set="dc">title</name></map></index>
+            <index sort="true"><title>Creator</title><map><name set="dc">creator</name></map></index>
+        </indexInfo></explain></recordData></record></explainResponse>"""
+
+        configuration = SRUExplainAutoParser(xmltodict.parse(explain_response)).get_sru_configuration_from_explain_response()
+
+        self.assertEqual(configuration.available_context_sets_and_indexes["dc"]["title"]["sort"], False)
+        self.assertEqual(configuration.available_context_sets_and_indexes["dc"]["creator"]["sort"], True)
+
+    def test_single_index_without_sort_info(self):
+        explain_response = """<explainResponse><version>1.2</version><record><recordData><explain><indexInfo>
+            <index><title>Title</title><map><name set="dc">title</name></map><map><name set="bath">title</name></map></index>
+        </indexInfo></explain></recordData></record></explainResponse>"""
+
+        configuration = SRUExplainAutoParser(xmltodict.parse(explain_response)).get_sru_configuration_from_explain_response()
+
+        self.assertEqual(configuration.available_context_sets_and_indexes["dc"]["title"]["sort"], None)
+        self.assertEqual(configuration.available_context_sets_and_indexes["bath"]["title"]["sort"], None)
+
+
+class TestPropertyPathResolver(unittest.TestCase):
+
+    def test_matches_find_property_value_on_explain_responses(self):
+        for explain_response in [TestFiles.explain_response_alma, TestFiles.explain_response_loc, TestFiles.explain_response_gapines, TestFiles.explain_response_namespaced]:
+            with open(explain_response, "rb") as f:
+                explain_dict = xmltodict.parse(f.read())
+
+            resolver = PropertyPathResolver()
+            indexes = SRUExplainAutoParser._find_property_value(explain_dict, generic_driver["index"]["location"])
+            self.assertEqual(resolver.find_property_value(explain_dict, generic_driver["index"]["location"]), indexes)
+            for index in indexes:
+                for location in [["@id"], ["@sort"], ["title"], ["configInfo", "supports"], ["map"]]:
+                    self.assertEqual(resolver.find_property_value(index, location), SRUExplainAutoParser._find_property_value(index, location))
+
+    def test_falls_back_to_scanning_when_compiled_path_is_missing(self):
+        resolver = PropertyPathResolver()
+
+        self.assertEqual(resolver.find_property_value({"zs:record": {"zs:version": "1.1"}}, ["record", "version"]), "1.1")
+        self.assertEqual(resolver.find_property_value({"srw:record": {"srw:version": "1.2"}}, ["record", "version"]), "1.2")
+        self.assertIsNone(resolver.find_property_value({"srw:record": {}}, ["record", "version"]))
+
+    def test_ambiguous_paths_are_not_compiled(self):
+        resolver = PropertyPathResolver()
+
+        self.assertEqual(resolver.find_property_value({"index": 1, "indexInfo": 2}, ["index"]), 2)
+        self.assertEqual(resolver.find_property_value({"index": 1, "indexInfo": 2}, ["index"]), 2)
+        self.assertDictEqual(resolver._compiled_paths, {})
@@ -0,0 +1,90 @@
+import io
+import unittest
+import xmltodict
+from xml.parsers.expat import ExpatError
+
+from src.sru_queryer._base._exceptions import NoExplainResponseException, ExplainResponseParserException
+from src.sru_queryer._base._sru_explain_auto_parser import SRUExplainAutoParser
+from src.sru_queryer._base._sru_explain_stream_parser import SRUExplainStreamParser
+from tests.testData.test_data import TestFiles
+
+explain_responses = [
+    TestFiles.explain_response_alma,
+    TestFiles.explain_response_loc,
+    TestFiles.explain_response_gapines,
+    TestFiles.explain_response_namespaced,
+    TestFiles.sru_no_schema
+]
+
+def read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+def parse_with_dict_parser(content: bytes) -> dict:
+    return SRUExplainAutoParser(xmltodict.parse(content)).get_sru_configuration_from_explain_response().__dict__
+
+class TestSRUExplainStreamParser(unittest.TestCase):
+
+    def test_configuration_matches_dict_parser(self):
+        for path in explain_responses:
+            with self.subTest(path=path):
+                content = read_file(path)
+
+                configuration = SRUExplainStreamParser(content).get_sru_configuration_from_explain_response()
+
+                self.assertDictEqual(configuration.__dict__, parse_with_dict_parser(content))
+
+    def test_chunked_and_file_sources_match_bytes(self):
+        content = read_file(TestFiles.explain_response_namespaced)
+        expected = parse_with_dict_parser(content)
+
+        chunks = [content[i:i + 100] for i in range(0, len(content), 100)]
+        from_chunks = SRUExplainStreamParser(chunks).get_sru_configuration_from_explain_response()
+        from_file = SRUExplainStreamParser(io.BytesIO(content), chunk_size=100).get_sru_configuration_from_explain_response()
+
+        self.assertDictEqual(from_chunks.__dict__, expected)
+        self.assertDictEqual(from_file.__dict__, expected)
+
+    def test_bad_explain_responses_raise_no_explain_response_exception(self):
+        for path in [TestFiles.alma_bad_explain_response, TestFiles.loc_bad_explain_response]:
+            with self.subTest(path=path):
+                with self.assertRaises(NoExplainResponseException):
+                    SRUExplainStreamParser(read_file(path)).get_sru_configuration_from_explain_response()
+
+    def test_html_raises_expat_error(self):
+        with self.assertRaises(ExpatError):
+            SRUExplainStreamParser(read_file(TestFiles.gapines_html_response)).get_sru_configuration_from_explain_response()
+
+    def test_malformed_index_fails_like_dict_parser(self):
+        content = b"<explainResponse><record><recordData><explain><indexInfo><index id='1'><title>Title</title></index></indexInfo></explain></recordData></record></explainResponse>"
+
+        with self.assertRaises(TypeError):
+            parse_with_dict_parser(content)
+        with self.assertRaises(TypeError):
+            SRUExplainStreamParser(content).get_sru_configuration_from_explain_response()
+
+    def test_explain_response_without_indexes_raises_parser_exception(self):
+        for content in [b"<explainResponse><version>1.2</version></explainResponse>", b"<explainResponse><diagnostics><diagnostic/></diagnostics></explainResponse>"]:
+            with self.subTest(content=content):
+                with self.assertRaises(ExplainResponseParserException):
+                    parse_with_dict_parser(content)
+                with self.assertRaises(ExplainResponseParserException):
+                    SRUExplainStreamParser(content).get_sru_configuration_from_explain_response()
+
+    def test_empty_explain_response_raises_no_explain_response_exception(self):
+        content = b"<explainResponse></explainResponse>"
+
+        with self.assertRaises(NoExplainResponseException):
+            parse_with_dict_parser(content)
+        with self.assertRaises(NoExplainResponseException):
+            SRUExplainStreamParser(content).get_sru_configuration_from_explain_response()
+
+    def test_single_index_with_attributes_on_title(self):
+        content = b"""<explainResponse><version>1.2</version><record><recordData><explain><indexInfo>
+            <index id="1"><title lang="en">Title</title><title lang="de">Titel</title><map><name set="dc">dc.title</name></map></index>
+            </indexInfo></explain></recordData></record></explainResponse>"""
+
+        configuration = SRUExplainStreamParser(content).get_sru_configuration_from_explain_response()
+
+        self.assertDictEqual(configuration.__dict__, parse_with_dict_parser(content))
+        self.assertEqual(configuration.available_context_sets_and_indexes["dc"]["title"]["title"], [{"@lang": "en", "#text": "Title"}, {"@lang": "de", "#text": "Titel"}])
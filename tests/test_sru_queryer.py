@@ -1,12 +1,18 @@
 import unittest
-from unittest.mock import patch
+from unittest.mock import patch, MagicMock
 import json
+import time
+import requests
 from requests import Request
 import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 from src.sru_queryer import SRUQueryer
-from src.sru_queryer._base._exceptions import ExplainResponseContentTypeException
+from src.sru_queryer.sru import ExplainCache, IndexCatalog, ResultCache, RateLimiter, RetryPolicy, CircuitBreaker, HedgingPolicy, SearchRetrieveResponseParser
+from src.sru_queryer._base._exceptions import ExplainResponseContentTypeException, CircuitOpenException, DeadlineExceededException
 from src.sru_queryer.cql import SearchClause
+from tests.testData.stub_sru_server import StubSRUServer, search_retrieve_response
 from tests.testData.test_data import get_alma_sru_configuration, get_gapines_sru_configuration, mock_searchable_indexes_and_descriptions, TestFiles, get_test_gapines_saved_sru_configuration
 
 @patch("src.sru_queryer.SRUQueryer._retrieve_explain_response_xml")
@@ -237,4 +243,1015 @@ class TestInitializeSRUQueryerIntegration(unittest.TestCase):
 
         sc = SRUQueryer("https://server.com")
         request: Request = sc.construct_search_retrieve_request(from_dict=query_dict)
-        self.assertIn("Frog", request.url)
\ No newline at end of file
+        self.assertIn("Frog", request.url)
+
+class TestSRUQueryerSession(unittest.TestCase):
+
+    def test_session_configures_connection_pool(self):
+        sru_queryer = SRUQueryer(from_dict=get_test_gapines_saved_sru_configuration(), pool_connections=3, pool_maxsize=25, pool_block=True)
+
+        adapter = sru_queryer._session.get_adapter("https://server.com")
+        self.assertEqual(adapter._pool_connections, 3)
+        self.assertEqual(adapter._pool_maxsize, 25)
+        self.assertEqual(adapter._pool_block, True)
+
+    def test_session_disable_keep_alive_sets_connection_header(self):
+        sru_queryer = SRUQueryer(from_dict=get_test_gapines_saved_sru_configuration(), keep_alive=False)
+
+        request = sru_queryer._session.prepare_request(Request("GET", "https://server.com"))
+        self.assertEqual(request.headers["Connection"], "close")
+
+    @patch("src.sru_queryer._base._sru_queryer.requests.Session.send", autospec=True)
+    def test_search_retrieve_reuses_session(self, mock_send):
+        saved_dict = get_test_gapines_saved_sru_configuration()
+        saved_dict["server_url"] = "https://server.com"
+        sru_queryer = SRUQueryer(from_dict=saved_dict)
+
+        sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"), validate=False)
+        sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Toad"), validate=False)
+
+        self.assertEqual(mock_send.call_count, 2)
+        self.assertIs(mock_send.call_args_list[0].args[0], sru_queryer._session)
+        self.assertIs(mock_send.call_args_list[1].args[0], sru_queryer._session)
+
+    @patch("src.sru_queryer._base._sru_queryer.requests.Session.send", autospec=True)
+    def test_explain_request_uses_session(self, mock_send):
+        with open(TestFiles.explain_response_alma, "rb") as f:
+            mock_send.return_value.status_code = 200
+            mock_send.return_value.content = f.read()
+
+        sru_queryer = SRUQueryer("https://server.com")
+
+        self.assertIs(mock_send.call_args.args[0], sru_queryer._session)
+        self.assertIn("operation=explain", mock_send.call_args.args[1].url)
+        self.assertEqual(sru_queryer.sru_configuration.sru_version, "1.2")
+
+    @patch("src.sru_queryer._base._sru_queryer.requests.Session.close")
+    def test_context_manager_closes_session(self, mock_close):
+        with SRUQueryer(from_dict=get_test_gapines_saved_sru_configuration()) as sru_queryer:
+            self.assertIsInstance(sru_queryer, SRUQueryer)
+
+        mock_close.assert_called_once()
+
+
+class TestSRUQueryerExplainCache(unittest.TestCase):
+
+    def setUp(self):
+        self.server = StubSRUServer().start()
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.explain_cache = ExplainCache(self.temporary_directory.name)
+
+    def tearDown(self):
+        self.server.stop()
+        self.temporary_directory.cleanup()
+
+    def test_explain_request_is_only_sent_on_cache_miss(self):
+        first_queryer = SRUQueryer(self.server.url, explain_cache=self.explain_cache)
+        second_queryer = SRUQueryer(self.server.url, explain_cache=self.explain_cache)
+
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertDictEqual(second_queryer.get_configuration(), first_queryer.get_configuration())
+
+    def test_user_settings_are_applied_to_cached_configuration(self):
+        SRUQueryer(self.server.url, username="user", password="pass", default_records_returned=15, explain_cache=self.explain_cache)
+        sru_queryer = SRUQueryer(self.server.url, default_records_returned=30, explain_cache=self.explain_cache)
+
+        self.assertEqual(sru_queryer.sru_configuration.default_records_returned, 30)
+        self.assertEqual(sru_queryer.sru_configuration.server_url, self.server.url)
+        self.assertIsNone(sru_queryer.sru_configuration.username)
+        self.assertIsNone(self.explain_cache.get(self.server.url, "1.2").username)
+
+    def test_expired_entry_is_refreshed(self):
+        SRUQueryer(self.server.url, explain_cache=self.explain_cache)
+        self.explain_cache.ttl = 0
+        with patch("src.sru_queryer._base._explain_cache.time.time", return_value=time.time() + 1):
+            SRUQueryer(self.server.url, explain_cache=self.explain_cache)
+
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_expired_entry_is_revalidated_with_etag(self):
+        self.server.explain_headers = {"ETag": '"v1"'}
+        SRUQueryer(self.server.url, explain_cache=self.explain_cache)
+        self.explain_cache.ttl = -1
+
+        with patch("src.sru_queryer.SRUQueryer._parse_explain_response_configuration") as mock_parse:
+            sru_queryer = SRUQueryer(self.server.url, default_records_returned=15, explain_cache=self.explain_cache)
+
+        mock_parse.assert_not_called()
+        self.assertEqual(self.server.request_headers[1]["If-None-Match"], '"v1"')
+        self.assertEqual(sru_queryer.sru_configuration.default_context_set, "eg")
+        self.assertEqual(sru_queryer.sru_configuration.default_records_returned, 15)
+
+    def test_revalidated_entry_is_renewed(self):
+        self.server.explain_headers = {"Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"}
+        SRUQueryer(self.server.url, explain_cache=self.explain_cache)
+        self.explain_cache.ttl = -1
+        SRUQueryer(self.server.url, explain_cache=self.explain_cache)
+        self.explain_cache.ttl = 60
+        SRUQueryer(self.server.url, explain_cache=self.explain_cache)
+
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(self.server.request_headers[1]["If-Modified-Since"], "Wed, 21 Oct 2015 07:28:00 GMT")
+
+    def test_changed_explain_response_is_parsed_again(self):
+        self.server.explain_headers = {"ETag": '"v1"'}
+        SRUQueryer(self.server.url, explain_cache=self.explain_cache)
+        self.server.explain_headers = {"ETag": '"v2"'}
+        self.explain_cache.ttl = -1
+
+        with patch("src.sru_queryer.SRUQueryer._parse_explain_response_configuration", wraps=SRUQueryer._parse_explain_response_configuration) as mock_parse:
+            SRUQueryer(self.server.url, explain_cache=self.explain_cache)
+
+        mock_parse.assert_called_once()
+        self.assertEqual(self.explain_cache.get_validators(self.server.url, "1.2"), ('"v2"', None))
+
+    def test_stream_explain_parser_with_and_without_cache(self):
+        default_queryer = SRUQueryer(self.server.url)
+        stream_queryer = SRUQueryer(self.server.url, explain_parser="stream")
+        cached_stream_queryer = SRUQueryer(self.server.url, explain_parser="stream", explain_cache=self.explain_cache)
+
+        self.assertDictEqual(stream_queryer.get_configuration(), default_queryer.get_configuration())
+        self.assertDictEqual(cached_stream_queryer.get_configuration(), default_queryer.get_configuration())
+
+    @patch("src.sru_queryer._base._explain_cache.ExplainCache.set", side_effect=PermissionError("read-only"))
+    def test_cache_write_failure_does_not_raise(self, *args):
+        sru_queryer = SRUQueryer(self.server.url, explain_cache=self.explain_cache)
+
+        self.assertEqual(sru_queryer.sru_configuration.default_context_set, "eg")
+
+
+class TestSRUQueryerLazyLoading(unittest.TestCase):
+
+    def setUp(self):
+        self.server = StubSRUServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_lazy_queryer_does_not_send_explain_request(self):
+        sru_queryer = SRUQueryer(self.server.url, lazy=True)
+
+        self.assertEqual(len(self.server.requests), 0)
+        sru_queryer.close()
+
+    def test_configuration_is_loaded_on_first_use(self):
+        with SRUQueryer(self.server.url, default_records_returned=15, lazy=True) as sru_queryer:
+            sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"))
+            sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Toad"))
+
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertIn("operation=explain", self.server.requests[0])
+        self.assertEqual(sru_queryer.sru_configuration.default_records_returned, 15)
+        self.assertEqual(sru_queryer.sru_configuration.default_context_set, "eg")
+
+    def test_unvalidated_request_does_not_load_configuration(self):
+        with SRUQueryer(self.server.url, sru_version="1.1", username="user", password="pass", default_records_returned=15, lazy=True) as sru_queryer:
+            request = sru_queryer.construct_search_retrieve_request(SearchClause("eg", "title", "=", "Frog"), validate=False)
+            sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"), validate=False)
+
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertIn("operation=searchRetrieve", self.server.requests[0])
+        self.assertTrue(request.url.startswith(f"{self.server.url}?version=1.1&operation=searchRetrieve"))
+        self.assertIn("maximumRecords=15", request.url)
+        self.assertIn("Authorization", request.headers)
+
+    def test_concurrent_first_calls_load_configuration_once(self):
+        def slow_load(*args):
+            time.sleep(0.1)
+            return get_gapines_sru_configuration()
+
+        sru_queryer = SRUQueryer(self.server.url, lazy=True)
+        with patch("src.sru_queryer.SRUQueryer._load_explain_configuration", side_effect=slow_load) as mock_load:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                configurations = list(executor.map(lambda _: sru_queryer.sru_configuration, range(8)))
+
+        mock_load.assert_called_once()
+        for configuration in configurations:
+            self.assertIs(configuration, configurations[0])
+
+    def test_failed_load_is_retried_on_next_call(self):
+        with open(TestFiles.gapines_html_response, "rb") as f:
+            self.server.explain_response, explain_response = f.read(), self.server.explain_response
+
+        sru_queryer = SRUQueryer(self.server.url, lazy=True)
+        with self.assertRaises(ExplainResponseContentTypeException):
+            sru_queryer.get_configuration()
+
+        self.server.explain_response = explain_response
+        self.assertEqual(sru_queryer.get_configuration()["default_context_set"], "eg")
+
+
+class TestSRUQueryerFromExplainXML(unittest.TestCase):
+
+    @patch("src.sru_queryer._base._sru_queryer.requests.Session.send")
+    def test_from_explain_xml_path_does_not_contact_server(self, mock_send):
+        sru_queryer = SRUQueryer.from_explain_xml(TestFiles.explain_response_gapines, server_url="https://server.com")
+
+        mock_send.assert_not_called()
+        self.assertEqual(sru_queryer.sru_configuration.server_url, "https://server.com")
+        self.assertEqual(sru_queryer.sru_configuration.default_context_set, "eg")
+        self.assertDictEqual(sru_queryer.sru_configuration.available_context_sets_and_indexes, get_gapines_sru_configuration().available_context_sets_and_indexes)
+
+    def test_from_explain_xml_bytes_and_string_match_path(self):
+        with open(TestFiles.explain_response_loc, "rb") as f:
+            explain_xml = f.read()
+
+        from_path = SRUQueryer.from_explain_xml(TestFiles.explain_response_loc, server_url="https://server.com")
+        from_bytes = SRUQueryer.from_explain_xml(explain_xml, server_url="https://server.com")
+        from_string = SRUQueryer.from_explain_xml(explain_xml.decode("utf-8"), server_url="https://server.com")
+
+        self.assertDictEqual(from_bytes.get_configuration(), from_path.get_configuration())
+        self.assertDictEqual(from_string.get_configuration(), from_path.get_configuration())
+
+    def test_from_explain_xml_applies_user_settings(self):
+        sru_queryer = SRUQueryer.from_explain_xml(TestFiles.explain_response_alma, server_url="https://server.com", username="user", password="pass", default_records_returned=15, default_cql_context_set="alma")
+
+        self.assertEqual(sru_queryer.sru_configuration.default_records_returned, 15)
+        self.assertEqual(sru_queryer.sru_configuration.default_context_set, "alma")
+        self.assertEqual(sru_queryer.sru_configuration.username, "user")
+
+    def test_stream_explain_parser_matches_default(self):
+        for path in [TestFiles.explain_response_alma, TestFiles.explain_response_loc, TestFiles.explain_response_gapines]:
+            with self.subTest(path=path):
+                default_queryer = SRUQueryer.from_explain_xml(path, server_url="https://server.com")
+                stream_queryer = SRUQueryer.from_explain_xml(path, server_url="https://server.com", explain_parser="stream")
+
+                self.assertDictEqual(stream_queryer.get_configuration(), default_queryer.get_configuration())
+
+    def test_stream_explain_parser_html_raises_content_type_exception(self):
+        with self.assertRaises(ExplainResponseContentTypeException):
+            SRUQueryer.from_explain_xml(TestFiles.gapines_html_response, server_url="https://server.com", explain_parser="stream")
+
+    def test_unknown_explain_parser_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            SRUQueryer.from_explain_xml(TestFiles.explain_response_gapines, server_url="https://server.com", explain_parser="lxml")
+
+    def test_from_explain_xml_html_raises_content_type_exception(self):
+        with self.assertRaises(ExplainResponseContentTypeException):
+            SRUQueryer.from_explain_xml(TestFiles.gapines_html_response, server_url="https://server.com")
+
+    def test_from_explain_xml_missing_file_raises_os_error(self):
+        with self.assertRaises(FileNotFoundError):
+            SRUQueryer.from_explain_xml("does_not_exist.xml", server_url="https://server.com")
+
+    def test_compact_configuration_get_configuration_matches_default(self):
+        default_queryer = SRUQueryer.from_explain_xml(TestFiles.explain_response_alma, server_url="https://server.com")
+        compact_queryer = SRUQueryer.from_explain_xml(TestFiles.explain_response_alma, server_url="https://server.com", compact_configuration=True)
+
+        self.assertIsInstance(compact_queryer.sru_configuration.available_context_sets_and_indexes, IndexCatalog)
+        self.assertDictEqual(compact_queryer.get_configuration(), default_queryer.get_configuration())
+        self.assertEqual(json.loads(json.dumps(compact_queryer.get_configuration())), default_queryer.get_configuration())
+
+    def test_get_configuration_returns_live_dict_unless_compact(self):
+        default_queryer = SRUQueryer.from_explain_xml(TestFiles.explain_response_alma, server_url="https://server.com")
+        compact_queryer = SRUQueryer.from_explain_xml(TestFiles.explain_response_alma, server_url="https://server.com", compact_configuration=True)
+
+        self.assertIs(default_queryer.get_configuration(), default_queryer.sru_configuration.__dict__)
+        self.assertIsNot(compact_queryer.get_configuration(), compact_queryer.sru_configuration.__dict__)
+
+    def test_compact_configuration_from_dict_validates_queries(self):
+        saved_configuration = SRUQueryer.from_explain_xml(TestFiles.explain_response_alma, server_url="https://server.com").get_configuration()
+
+        sru_queryer = SRUQueryer(from_dict=saved_configuration, compact_configuration=True)
+        request = sru_queryer.construct_search_retrieve_request(SearchClause("alma", "title", "=", "Harry Potter"))
+
+        self.assertIsInstance(sru_queryer.sru_configuration.available_context_sets_and_indexes, IndexCatalog)
+        self.assertIn("alma.title", request.url)
+        with self.assertRaises(ValueError):
+            sru_queryer.construct_search_retrieve_request(SearchClause("alma", "title", "not_a_relation", "Harry Potter"))
+
+
+class TestSRUQueryerResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.server = StubSRUServer().start()
+        self.result_cache = ResultCache()
+        self.sru_queryer = SRUQueryer(self.server.url, result_cache=self.result_cache)
+
+    def tearDown(self):
+        self.sru_queryer.close()
+        self.server.stop()
+
+    def count_search_retrieve_requests(self) -> int:
+        return len([request for request in self.server.requests if "operation=searchRetrieve" in request])
+
+    def test_repeated_request_is_answered_from_cache(self):
+        first_response = self.sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Harry Potter"))
+        second_response = self.sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Harry Potter"))
+
+        self.assertEqual(second_response, first_response)
+        self.assertEqual(self.count_search_retrieve_requests(), 1)
+        self.assertEqual((self.result_cache.hits, self.result_cache.misses), (1, 1))
+
+    def test_different_requests_are_not_shared(self):
+        self.sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Harry Potter"))
+        self.sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Harry Potter"), maximum_records=5)
+
+        self.assertEqual(self.count_search_retrieve_requests(), 2)
+
+    def test_queryers_with_different_credentials_do_not_share_entries(self):
+        queryers = [SRUQueryer(self.server.url, username=username, password=password, result_cache=self.result_cache) for username, password in [("a", "1"), ("b", "2"), ("a", "1")]]
+
+        for sru_queryer in queryers:
+            sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Harry Potter"))
+            sru_queryer.close()
+
+        self.assertEqual(self.count_search_retrieve_requests(), 2)
+        search_retrieve_headers = [headers for request, headers in zip(self.server.requests, self.server.request_headers) if "operation=searchRetrieve" in request]
+        self.assertNotEqual(search_retrieve_headers[0]["Authorization"], search_retrieve_headers[1]["Authorization"])
+        self.assertEqual(self.result_cache.hits, 1)
+
+    def test_use_cache_false_bypasses_cache(self):
+        self.sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Harry Potter"))
+        self.server.search_retrieve_content = search_retrieve_response(2)
+
+        response = self.sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Harry Potter"), use_cache=False)
+
+        self.assertIn(b"<numberOfRecords>2</numberOfRecords>", response)
+        self.assertEqual(self.count_search_retrieve_requests(), 2)
+        self.assertEqual((self.result_cache.hits, self.result_cache.misses), (0, 1))
+
+    def test_error_responses_are_not_cached(self):
+        self.server.queue_response(503, b"Service Unavailable")
+
+        self.assertEqual(self.sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Harry Potter")), b"Service Unavailable")
+        self.assertIn(b"numberOfRecords", self.sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Harry Potter")))
+        self.assertEqual(self.count_search_retrieve_requests(), 2)
+
+    def test_batches_and_pages_use_cache(self):
+        self.server.number_of_records = 4
+        pages = list(self.sru_queryer.iter_pages(SearchClause("eg", "title", "=", "Harry Potter"), page_size=2))
+
+        results = self.sru_queryer.search_retrieve_many([SearchClause("eg", "title", "=", "Harry Potter")], start_record=1, maximum_records=2)
+        cached_pages = list(self.sru_queryer.iter_pages(SearchClause("eg", "title", "=", "Harry Potter"), page_size=2, prefetch=1))
+
+        self.assertEqual(results[0].content, pages[0])
+        self.assertEqual(cached_pages, pages)
+        self.assertEqual(self.count_search_retrieve_requests(), 2)
+
+    def test_queryer_without_cache_always_sends(self):
+        sru_queryer = SRUQueryer(self.server.url)
+
+        sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Harry Potter"))
+        sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Harry Potter"))
+
+        self.assertEqual(self.count_search_retrieve_requests(), 2)
+
+
+class TestSRUQueryerRateLimiting(unittest.TestCase):
+
+    def setUp(self):
+        self.server = StubSRUServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_requests_are_spaced_by_rate_limiter(self):
+        start = time.monotonic()
+        sru_queryer = SRUQueryer(self.server.url, rate_limiter=RateLimiter(rate=10))
+        for _ in range(4):
+            sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"))
+        elapsed = time.monotonic() - start
+
+        # The explain request and four searchRetrieve requests
+        self.assertGreaterEqual(elapsed, 0.39)
+
+    def test_throttled_response_slows_down_and_honours_retry_after(self):
+        rate_limiter = RateLimiter(rate=100)
+        sru_queryer = SRUQueryer(self.server.url, rate_limiter=rate_limiter)
+        self.server.queue_response(429, b"", {"Retry-After": "1"})
+
+        sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"))
+        start = time.monotonic()
+        content = sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"))
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(content, self.server.search_retrieve_content)
+        self.assertEqual(rate_limiter.throttled, 1)
+        self.assertLess(rate_limiter.rate, 100)
+        self.assertGreaterEqual(elapsed, 0.9)
+
+class TestSRUQueryerRetries(unittest.TestCase):
+
+    def setUp(self):
+        self.server = StubSRUServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def count_search_retrieve_requests(self) -> int:
+        return len([request for request in self.server.requests if "operation=searchRetrieve" in request])
+
+    def test_retryable_status_is_retried(self):
+        sru_queryer = SRUQueryer(self.server.url, retry_policy=RetryPolicy(max_attempts=3, backoff=0.01))
+        self.server.queue_response(503)
+        self.server.queue_response(502)
+
+        content = sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"))
+
+        self.assertEqual(content, self.server.search_retrieve_content)
+        self.assertEqual(self.count_search_retrieve_requests(), 3)
+
+    def test_last_response_is_returned_after_max_attempts(self):
+        sru_queryer = SRUQueryer(self.server.url, retry_policy=RetryPolicy(max_attempts=2, backoff=0.01))
+        self.server.queue_response(503, b"first")
+        self.server.queue_response(503, b"second")
+
+        content = sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"))
+
+        self.assertEqual(content, b"second")
+        self.assertEqual(self.count_search_retrieve_requests(), 2)
+
+    def test_other_statuses_are_not_retried(self):
+        sru_queryer = SRUQueryer(self.server.url, retry_policy=RetryPolicy(max_attempts=3, backoff=0.01))
+        self.server.queue_response(404, b"not found")
+
+        content = sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"))
+
+        self.assertEqual(content, b"not found")
+        self.assertEqual(self.count_search_retrieve_requests(), 1)
+
+    def test_retry_after_is_honoured(self):
+        sru_queryer = SRUQueryer(self.server.url, retry_policy=RetryPolicy(max_attempts=2, backoff=0.01))
+        self.server.queue_response(429, b"", {"Retry-After": "1"})
+
+        start = time.monotonic()
+        sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"))
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.9)
+
+    def test_connection_errors_are_retried_and_raised_after_max_attempts(self):
+        self.server.stop()
+        sru_queryer = SRUQueryer(self.server.url, lazy=True, retry_policy=RetryPolicy(max_attempts=3, backoff=0.01))
+
+        with patch.object(sru_queryer._session, "send", wraps=sru_queryer._session.send) as mock_send:
+            with self.assertRaises(requests.ConnectionError):
+                sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"), validate=False)
+
+        self.assertEqual(mock_send.call_count, 3)
+        self.server = StubSRUServer().start()
+
+    def test_circuit_breaker_fails_fast_while_server_is_down(self):
+        circuit_breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+        sru_queryer = SRUQueryer(self.server.url, circuit_breaker=circuit_breaker)
+        self.server.queue_response(500)
+        self.server.queue_response(500)
+
+        sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"))
+        sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"))
+        with self.assertRaises(CircuitOpenException):
+            sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"))
+
+        self.assertEqual(self.count_search_retrieve_requests(), 2)
+
+    def test_circuit_breaker_stops_retries(self):
+        circuit_breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+        sru_queryer = SRUQueryer(self.server.url, retry_policy=RetryPolicy(max_attempts=5, backoff=0.01), circuit_breaker=circuit_breaker)
+        for _ in range(5):
+            self.server.queue_response(503)
+
+        with self.assertRaises(CircuitOpenException):
+            sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"))
+
+        self.assertEqual(self.count_search_retrieve_requests(), 2)
+
+class TestSRUQueryerTimeouts(unittest.TestCase):
+
+    def setUp(self):
+        self.server = StubSRUServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_read_timeout_is_applied(self):
+        sru_queryer = SRUQueryer(self.server.url, connect_timeout=1, read_timeout=0.2)
+        self.server.delay = 1
+
+        with self.assertRaises(requests.ReadTimeout):
+            sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"))
+
+    def test_deadline_exceeded_raises_with_elapsed_details(self):
+        sru_queryer = SRUQueryer(self.server.url)
+        self.server.delay = 1
+
+        start = time.monotonic()
+        with self.assertRaises(DeadlineExceededException) as context:
+            sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"), deadline=0.3)
+
+        self.assertLess(time.monotonic() - start, 0.8)
+        self.assertGreaterEqual(context.exception.elapsed, 0.3)
+        self.assertEqual(context.exception.deadline, 0.3)
+        self.assertIn("operation=searchRetrieve", context.exception.content)
+
+    def test_deadline_covers_reading_the_body(self):
+        sru_queryer = SRUQueryer(self.server.url, read_timeout=1)
+        self.server.search_retrieve_content = b"<searchRetrieveResponse>" + b" " * 50 + b"</searchRetrieveResponse>"
+        self.server.trickle_delay = 0.02
+
+        start = time.monotonic()
+        with self.assertRaises(DeadlineExceededException):
+            sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"), deadline=0.5)
+
+        self.assertLess(time.monotonic() - start, 0.8)
+        # The closed connection isn't reused
+        self.server.trickle_delay = 0
+        self.assertEqual(sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"), deadline=1), self.server.search_retrieve_content)
+
+    def test_body_read_within_deadline_is_returned(self):
+        sru_queryer = SRUQueryer(self.server.url)
+        self.server.trickle_delay = 0.001
+
+        content = sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"), deadline=5)
+
+        self.assertEqual(content, self.server.search_retrieve_content)
+
+    def test_deadline_covers_retries(self):
+        sru_queryer = SRUQueryer(self.server.url, retry_policy=RetryPolicy(max_attempts=5, backoff=0.01))
+        self.server.queue_response(503, b"", delay=0.2)
+        self.server.queue_response(503, b"", delay=0.2)
+        self.server.queue_response(503, b"", delay=0.2)
+
+        with self.assertRaises(DeadlineExceededException):
+            sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"), deadline=0.5)
+
+    def test_retry_is_not_attempted_if_backoff_would_exceed_deadline(self):
+        sru_queryer = SRUQueryer(self.server.url, retry_policy=RetryPolicy(max_attempts=3, backoff=0.01))
+        self.server.queue_response(429, b"throttled", {"Retry-After": "5"})
+
+        start = time.monotonic()
+        content = sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"), deadline=1)
+
+        self.assertEqual(content, b"throttled")
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_deadline_limits_rate_limiter_wait(self):
+        sru_queryer = SRUQueryer(self.server.url, rate_limiter=RateLimiter(rate=100))
+        self.server.queue_response(429, b"", {"Retry-After": "3"})
+        sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"))
+
+        start = time.monotonic()
+        with self.assertRaises(DeadlineExceededException):
+            sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"), deadline=0.5)
+
+        self.assertLess(time.monotonic() - start, 0.3)
+
+    def test_deadline_does_not_take_half_open_circuit_breaker_trial(self):
+        circuit_breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.2)
+        sru_queryer = SRUQueryer(self.server.url, rate_limiter=RateLimiter(rate=2), circuit_breaker=circuit_breaker)
+        self.server.queue_response(503)
+        sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"))
+        time.sleep(0.2)
+
+        with self.assertRaises(DeadlineExceededException):
+            sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"), deadline=0.1)
+        content = sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"))
+
+        self.assertEqual(content, self.server.search_retrieve_content)
+        self.assertEqual(circuit_breaker.state, "closed")
+
+    def test_deadline_covers_every_page(self):
+        sru_queryer = SRUQueryer(self.server.url)
+        self.server.number_of_records = 100
+        self.server.delay = 0.15
+
+        pages = []
+        with self.assertRaises(DeadlineExceededException):
+            for page in sru_queryer.iter_pages(SearchClause("eg", "title", "=", "Frog"), page_size=10, deadline=0.4):
+                pages.append(page)
+
+        self.assertIn(len(pages), [2, 3])
+
+    def test_deadline_covers_prefetched_pages(self):
+        sru_queryer = SRUQueryer(self.server.url)
+        self.server.number_of_records = 100
+        self.server.delay = 0.15
+
+        with self.assertRaises(DeadlineExceededException):
+            for _ in sru_queryer.iter_pages(SearchClause("eg", "title", "=", "Frog"), page_size=10, prefetch=2, deadline=0.4):
+                pass
+
+    def test_deadline_covers_whole_batch(self):
+        sru_queryer = SRUQueryer(self.server.url)
+        self.server.delay = 0.2
+
+        start = time.monotonic()
+        results = sru_queryer.search_retrieve_many([SearchClause("eg", "title", "=", f"Frog {index}") for index in range(6)], max_workers=2, deadline=0.3)
+
+        self.assertLess(time.monotonic() - start, 0.7)
+        self.assertEqual([result.index for result in results], list(range(6)))
+        self.assertTrue(any(result.ok for result in results))
+        self.assertTrue(any(isinstance(result.exception, DeadlineExceededException) for result in results))
+
+class TestSRUQueryerMirrors(unittest.TestCase):
+
+    def setUp(self):
+        self.primary = StubSRUServer().start()
+        self.mirror = StubSRUServer().start()
+
+    def tearDown(self):
+        self.primary.stop()
+        self.mirror.stop()
+
+    @staticmethod
+    def count_search_retrieve_requests(server: StubSRUServer) -> int:
+        return len([request for request in server.requests if "operation=searchRetrieve" in request])
+
+    def test_requests_go_to_fastest_endpoint(self):
+        self.primary.delay = 0.2
+        sru_queryer = SRUQueryer(self.primary.url, mirrors=[self.mirror.url])
+
+        for _ in range(6):
+            sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"))
+
+        self.assertEqual(self.count_search_retrieve_requests(self.primary), 1)
+        self.assertEqual(self.count_search_retrieve_requests(self.mirror), 5)
+
+    def test_fails_over_when_endpoint_is_down(self):
+        sru_queryer = SRUQueryer(self.primary.url, lazy=True, mirrors=[self.mirror.url])
+        self.primary.stop()
+
+        content = sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"))
+
+        self.assertEqual(content, self.mirror.search_retrieve_content)
+        self.assertEqual(len([request for request in self.mirror.requests if "operation=explain" in request]), 1)
+        self.primary = StubSRUServer().start()
+
+    def test_fails_over_on_failure_status(self):
+        sru_queryer = SRUQueryer(self.primary.url, mirrors=[self.mirror.url])
+        self.primary.queue_response(503)
+        self.mirror.queue_response(200, b"mirror")
+        # The mirror hasn't been used yet, so it would be chosen first
+        sru_queryer.endpoint_selector.endpoints[1].latency = 10
+
+        content = sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"))
+
+        self.assertEqual(content, b"mirror")
+        self.assertEqual(sru_queryer.endpoint_selector.endpoints[0].failures, 1)
+
+    def test_last_failure_is_returned_when_every_endpoint_fails(self):
+        sru_queryer = SRUQueryer(self.primary.url, mirrors=[self.mirror.url])
+        self.primary.queue_response(503, b"primary")
+        self.mirror.queue_response(503, b"mirror")
+
+        content = sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"))
+
+        self.assertIn(content, [b"primary", b"mirror"])
+        self.assertEqual(self.count_search_retrieve_requests(self.primary) + self.count_search_retrieve_requests(self.mirror), 2)
+
+    def test_failed_circuit_breaker_trial_fails_over_to_mirror(self):
+        circuit_breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.1)
+        sru_queryer = SRUQueryer(self.primary.url, mirrors=[self.mirror.url], circuit_breaker=circuit_breaker)
+        self.primary.queue_response(503)
+        self.mirror.queue_response(200, b"mirror")
+        sru_queryer.endpoint_selector.endpoints[1].latency = 10
+        circuit_breaker.record_failure()
+        time.sleep(0.15)
+
+        content = sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"))
+
+        self.assertEqual(content, b"mirror")
+        self.assertEqual(circuit_breaker.state, "closed")
+
+    def test_failing_over_counts_as_one_circuit_breaker_failure(self):
+        circuit_breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+        sru_queryer = SRUQueryer(self.primary.url, mirrors=[self.mirror.url], circuit_breaker=circuit_breaker)
+        self.primary.queue_response(503)
+        self.mirror.queue_response(503)
+
+        sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"))
+
+        self.assertEqual(circuit_breaker.state, "closed")
+
+    def test_mirrors_require_server_url(self):
+        with self.assertRaises(ValueError):
+            SRUQueryer(from_dict=get_alma_sru_configuration().__dict__ | {"server_url": None}, mirrors=[self.mirror.url])
+
+class TestSRUQueryerHedging(unittest.TestCase):
+
+    def setUp(self):
+        self.server = StubSRUServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_slow_request_is_hedged(self):
+        hedging_policy = HedgingPolicy(delay=0.1, max_extra_load=1)
+        sru_queryer = SRUQueryer(self.server.url, hedging_policy=hedging_policy)
+        self.server.queue_response(200, b"slow", delay=1)
+
+        start = time.monotonic()
+        content = sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"))
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(content, self.server.search_retrieve_content)
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual(hedging_policy.hedged, 1)
+        self.assertEqual(hedging_policy.hedges_won, 1)
+        sru_queryer.close()
+
+    def test_fast_request_is_not_hedged(self):
+        hedging_policy = HedgingPolicy(delay=0.5, max_extra_load=1)
+        sru_queryer = SRUQueryer(self.server.url, hedging_policy=hedging_policy)
+
+        sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"))
+
+        self.assertEqual(hedging_policy.hedged, 0)
+        self.assertEqual(len([request for request in self.server.requests if "operation=searchRetrieve" in request]), 1)
+        sru_queryer.close()
+
+    def test_hedges_are_not_sent_beyond_budget(self):
+        hedging_policy = HedgingPolicy(delay=0.1, max_extra_load=0.5)
+        sru_queryer = SRUQueryer(self.server.url, hedging_policy=hedging_policy)
+        self.server.queue_response(200, b"slow", delay=0.3)
+
+        content = sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"))
+
+        self.assertEqual(content, b"slow")
+        self.assertEqual(hedging_policy.hedged, 0)
+        sru_queryer.close()
+
+    def test_hedge_goes_to_mirror(self):
+        mirror = StubSRUServer().start()
+        self.addCleanup(mirror.stop)
+        self.server.delay = 1
+        sru_queryer = SRUQueryer(self.server.url, mirrors=[mirror.url], hedging_policy=HedgingPolicy(delay=0.1, max_extra_load=1))
+        # Send the original request to the primary
+        sru_queryer.endpoint_selector.endpoints[1].latency = 10
+        mirror.queue_response(200, b"mirror")
+
+        start = time.monotonic()
+        content = sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Frog"))
+
+        self.assertEqual(content, b"mirror")
+        self.assertLess(time.monotonic() - start, 0.6)
+        sru_queryer.close()
+
+class TestSRUQueryerCoalescing(unittest.TestCase):
+
+    def setUp(self):
+        self.server = StubSRUServer().start()
+        self.server.delay = 0.3
+
+    def tearDown(self):
+        self.server.stop()
+
+    def count_search_retrieve_requests(self) -> int:
+        return len([request for request in self.server.requests if "operation=searchRetrieve" in request])
+
+    def test_identical_concurrent_requests_share_one_upstream_request(self):
+        sru_queryer = SRUQueryer(self.server.url, coalesce_requests=True)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(executor.map(lambda _: sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Harry Potter")), range(8)))
+
+        self.assertEqual(responses, [self.server.search_retrieve_content] * 8)
+        self.assertEqual(self.count_search_retrieve_requests(), 1)
+
+    def test_callers_only_time_out_on_their_own_deadline(self):
+        sru_queryer = SRUQueryer(self.server.url, coalesce_requests=True)
+        self.server.delay = 0.5
+        query = SearchClause("eg", "title", "=", "Harry Potter")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            short_deadline = executor.submit(sru_queryer.search_retrieve, query, deadline=0.2)
+            time.sleep(0.05)
+            no_deadline = executor.submit(sru_queryer.search_retrieve, query)
+
+            with self.assertRaises(DeadlineExceededException):
+                short_deadline.result()
+            self.assertEqual(no_deadline.result(), self.server.search_retrieve_content)
+
+        self.assertEqual(self.count_search_retrieve_requests(), 2)
+
+    def test_different_requests_are_not_coalesced(self):
+        sru_queryer = SRUQueryer(self.server.url, coalesce_requests=True)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(lambda term: sru_queryer.search_retrieve(SearchClause("eg", "title", "=", term)), ["Harry", "Potter"]))
+
+        self.assertEqual(self.count_search_retrieve_requests(), 2)
+
+    def test_concurrent_callers_share_exception(self):
+        sru_queryer = SRUQueryer(self.server.url, coalesce_requests=True)
+
+        def send(request, stream=False, timeout=None, deadline=None):
+            time.sleep(0.2)
+            raise ConnectionError("Connection reset")
+
+        def search():
+            try:
+                sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Harry Potter"))
+            except ConnectionError as e:
+                return e
+
+        with patch.object(sru_queryer, "_send", side_effect=send) as mock_send:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                exceptions = list(executor.map(lambda _: search(), range(4)))
+
+        self.assertEqual(mock_send.call_count, 1)
+        self.assertTrue(all(isinstance(exception, ConnectionError) for exception in exceptions))
+
+    def test_requests_are_not_coalesced_by_default(self):
+        sru_queryer = SRUQueryer(self.server.url)
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            list(executor.map(lambda _: sru_queryer.search_retrieve(SearchClause("eg", "title", "=", "Harry Potter")), range(3)))
+
+        self.assertEqual(self.count_search_retrieve_requests(), 3)
+
+
+class TestSRUQueryerSearchRetrieveMany(unittest.TestCase):
+
+    def setUp(self):
+        saved_dict = get_test_gapines_saved_sru_configuration()
+        saved_dict["server_url"] = "https://server.com"
+        self.sru_queryer = SRUQueryer(from_dict=saved_dict)
+
+    @staticmethod
+    def mock_send(request, deadline=None):
+        if "Slow" in request.url:
+            time.sleep(0.2)
+        if "Broken" in request.url:
+            raise ConnectionError("Connection reset")
+        response = MagicMock()
+        response.content = request.url.encode()
+        return response
+
+    def test_results_are_returned_in_order(self):
+        with patch.object(self.sru_queryer, "_send", side_effect=self.mock_send):
+            results = self.sru_queryer.search_retrieve_many([SearchClause("eg", "title", "=", "Slow"), SearchClause("eg", "title", "=", "Fast")], validate=False)
+
+        self.assertEqual([result.index for result in results], [0, 1])
+        self.assertIn(b"Slow", results[0].content)
+        self.assertIn(b"Fast", results[1].content)
+
+    def test_as_completed_yields_fast_results_first(self):
+        with patch.object(self.sru_queryer, "_send", side_effect=self.mock_send):
+            results = list(self.sru_queryer.search_retrieve_many([SearchClause("eg", "title", "=", "Slow"), SearchClause("eg", "title", "=", "Fast")], validate=False, as_completed=True))
+
+        self.assertEqual([result.index for result in results], [1, 0])
+
+    def test_failures_do_not_abort_batch(self):
+        queries = [SearchClause("eg", "fake_index", "=", "Frog"), SearchClause("eg", "title", "=", "Broken"), SearchClause("eg", "title", "=", "Frog")]
+        with patch.object(self.sru_queryer, "_send", side_effect=self.mock_send) as mock_send:
+            results = self.sru_queryer.search_retrieve_many(queries)
+
+        # The invalid query is never sent
+        self.assertEqual(mock_send.call_count, 2)
+        self.assertIsInstance(results[0].exception, ValueError)
+        self.assertIsInstance(results[1].exception, ConnectionError)
+        self.assertTrue(results[2].ok)
+
+    def test_query_dicts_are_accepted(self):
+        with open(os.path.join("tests", "testData", "1_1_query_dict.json"), "r") as f:
+            query_dict = json.loads(f.read())
+
+        with patch.object(self.sru_queryer, "_send", side_effect=self.mock_send):
+            results = self.sru_queryer.search_retrieve_many([query_dict], validate=False)
+
+        self.assertTrue(results[0].ok)
+        self.assertEqual(results[0].content, results[0].url.encode())
+
+    def test_search_retrieve_many_against_server(self):
+        with StubSRUServer() as server:
+            saved_dict = get_test_gapines_saved_sru_configuration()
+            saved_dict["server_url"] = server.url
+            with SRUQueryer(from_dict=saved_dict) as sru_queryer:
+                results = sru_queryer.search_retrieve_many([SearchClause("eg", "title", "=", str(i)) for i in range(20)], max_workers=5)
+
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(len(server.requests), 20)
+
+
+class TestSRUQueryerIterPages(unittest.TestCase):
+
+    def setUp(self):
+        self.server = StubSRUServer().start()
+        saved_dict = get_test_gapines_saved_sru_configuration()
+        saved_dict["server_url"] = self.server.url
+        self.sru_queryer = SRUQueryer(from_dict=saved_dict)
+
+    def tearDown(self):
+        self.sru_queryer.close()
+        self.server.stop()
+
+    def test_iter_pages_follows_next_record_position(self):
+        self.server.number_of_records = 25
+
+        pages = list(self.sru_queryer.iter_pages(SearchClause("eg", "title", "=", "Frog"), page_size=10))
+
+        self.assertEqual(len(pages), 3)
+        self.assertIn(b"Record 21", pages[2])
+        self.assertIn("startRecord=11", self.server.requests[1])
+        self.assertIn("startRecord=21", self.server.requests[2])
+
+    def test_iter_pages_is_lazy(self):
+        self.server.number_of_records = 25
+
+        pages = self.sru_queryer.iter_pages(SearchClause("eg", "title", "=", "Frog"), page_size=10)
+        self.assertEqual(len(self.server.requests), 0)
+        next(pages)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_iter_pages_clamps_page_size_to_max_records_supported(self):
+        self.server.number_of_records = 120
+
+        pages = list(self.sru_queryer.iter_pages(SearchClause("eg", "title", "=", "Frog"), page_size=500))
+
+        self.assertEqual(len(pages), 3)
+        self.assertIn("maximumRecords=50", self.server.requests[0])
+
+    def test_iter_pages_without_next_record_position_counts_records(self):
+        self.server.number_of_records = 25
+        self.server.include_next_record_position = False
+
+        pages = list(self.sru_queryer.iter_pages(SearchClause("eg", "title", "=", "Frog"), page_size=10))
+
+        self.assertEqual(len(pages), 3)
+
+    def test_iter_pages_stops_at_max_records(self):
+        self.server.number_of_records = 100
+
+        pages = list(self.sru_queryer.iter_pages(SearchClause("eg", "title", "=", "Frog"), page_size=10, max_records=25))
+
+        self.assertEqual(len(pages), 3)
+        self.assertIn("maximumRecords=5", self.server.requests[2])
+
+    def test_iter_pages_stops_on_diagnostic_response(self):
+        self.server.search_retrieve_content = b"<searchRetrieveResponse><diagnostics><diagnostic><uri>info:srw/diagnostic/1/10</uri></diagnostic></diagnostics></searchRetrieveResponse>"
+
+        pages = list(self.sru_queryer.iter_pages(SearchClause("eg", "title", "=", "Frog")))
+
+        self.assertEqual(len(pages), 1)
+
+    def test_iter_pages_validates_query(self):
+        with self.assertRaises(ValueError):
+            next(self.sru_queryer.iter_pages(SearchClause("eg", "fake_index", "=", "Frog")))
+
+    def test_iter_pages_with_prefetch_returns_same_pages(self):
+        self.server.number_of_records = 95
+
+        pages = list(self.sru_queryer.iter_pages(SearchClause("eg", "title", "=", "Frog"), page_size=10))
+        prefetched_pages = list(self.sru_queryer.iter_pages(SearchClause("eg", "title", "=", "Frog"), page_size=10, prefetch=3))
+
+        self.assertEqual(pages, prefetched_pages)
+
+    def test_iter_pages_with_prefetch_stops_at_max_records(self):
+        self.server.number_of_records = 100
+
+        pages = list(self.sru_queryer.iter_pages(SearchClause("eg", "title", "=", "Frog"), page_size=10, max_records=25, prefetch=2))
+
+        self.assertEqual(len(pages), 3)
+        self.assertIn("maximumRecords=5", self.server.requests[-1])
+
+    def test_iter_pages_prefetch_is_bounded(self):
+        self.server.number_of_records = 100
+
+        pages = self.sru_queryer.iter_pages(SearchClause("eg", "title", "=", "Frog"), page_size=10, prefetch=2)
+        next(pages)
+        next(pages)
+        time.sleep(0.2)
+
+        # The first two pages, plus two pages in the buffer
+        self.assertEqual(len(self.server.requests), 4)
+        pages.close()
+
+    def test_iter_pages_prefetch_starts_before_first_page_is_yielded(self):
+        self.server.number_of_records = 100
+
+        pages = self.sru_queryer.iter_pages(SearchClause("eg", "title", "=", "Frog"), page_size=10, prefetch=2)
+        next(pages)
+        time.sleep(0.2)
+
+        # The first page, plus two pages in the buffer
+        self.assertEqual(len(self.server.requests), 3)
+        pages.close()
+
+    def test_iter_pages_prefetch_overlaps_requests_with_processing(self):
+        self.server.number_of_records = 50
+        self.server.delay = 0.1
+
+        start = time.monotonic()
+        for _ in self.sru_queryer.iter_pages(SearchClause("eg", "title", "=", "Frog"), page_size=10, prefetch=2):
+            time.sleep(0.1)
+        elapsed = time.monotonic() - start
+
+        # Without prefetching, 5 pages take at least 5 * (0.1 + 0.1) seconds
+        self.assertLess(elapsed, 0.9)
+
+    def test_stream_search_retrieve_yields_records(self):
+        self.server.number_of_records = 25
+
+        parser = self.sru_queryer.stream_search_retrieve(SearchClause("eg", "title", "=", "Frog"), maximum_records=10)
+        positions = [record.record_position for record in parser]
+
+        self.assertEqual(positions, list(range(1, 11)))
+        self.assertEqual(parser.number_of_records, 25)
+        self.assertEqual(parser.next_record_position, 11)
+
+    def test_unread_stream_releases_connection_when_closed(self):
+        with self.sru_queryer.stream_search_retrieve(SearchClause("eg", "title", "=", "Frog")) as parser:
+            self.assertIsInstance(parser, SearchRetrieveResponseParser)
+            self.assertFalse(parser.source.raw.closed)
+
+        self.assertTrue(parser.source.raw.closed)
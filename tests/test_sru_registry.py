@@ -0,0 +1,230 @@
+import tempfile
+import time
+import unittest
+
+import requests
+
+from src.sru_queryer._base._explain_cache import ExplainCache
+from src.sru_queryer._base._exceptions import ExplainResponseContentTypeException, DeadlineExceededException
+from src.sru_queryer._base._result_cache import ResultCache
+from src.sru_queryer._base._sru_registry import SRURegistry
+from src.sru_queryer.cql import SearchClause
+from tests.testData.stub_sru_server import StubSRUServer, search_retrieve_response
+from tests.testData.test_data import TestFiles
+
+def count_explain_requests(server: StubSRUServer) -> int:
+    return len([request for request in server.requests if "operation=explain" in request])
+
+class TestSRURegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.gapines_server = StubSRUServer(TestFiles.explain_response_gapines).start()
+        self.alma_server = StubSRUServer(TestFiles.explain_response_alma).start()
+        self.html_server = StubSRUServer(TestFiles.gapines_html_response).start()
+
+    def tearDown(self):
+        self.gapines_server.stop()
+        self.alma_server.stop()
+        self.html_server.stop()
+
+    def test_warm_up_loads_every_server(self):
+        registry = SRURegistry([
+            {"name": "gapines", "server_url": self.gapines_server.url},
+            {"name": "alma", "server_url": self.alma_server.url, "default_records_returned": 25}
+        ])
+
+        self.assertEqual(registry.failures, {})
+        self.assertEqual(registry.available, ["gapines", "alma"])
+        self.assertEqual(registry["gapines"].sru_configuration.default_context_set, "eg")
+        self.assertEqual(registry.get("alma").sru_configuration.default_records_returned, 25)
+        self.assertEqual(count_explain_requests(self.gapines_server), 1)
+        self.assertEqual(count_explain_requests(self.alma_server), 1)
+
+    def test_explain_requests_are_sent_concurrently(self):
+        self.gapines_server.explain_delay = 0.4
+        self.alma_server.explain_delay = 0.4
+
+        start = time.perf_counter()
+        registry = SRURegistry([
+            {"name": "gapines", "server_url": self.gapines_server.url},
+            {"name": "alma", "server_url": self.alma_server.url}
+        ])
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(registry.failures, {})
+        self.assertLess(elapsed, 0.75)
+
+    def test_failed_server_does_not_fail_the_rest(self):
+        registry = SRURegistry([
+            {"name": "gapines", "server_url": self.gapines_server.url},
+            {"name": "broken", "server_url": self.html_server.url}
+        ])
+
+        self.assertEqual(list(registry.failures), ["broken"])
+        self.assertIsInstance(registry.failures["broken"], ExplainResponseContentTypeException)
+        self.assertEqual(registry.available, ["gapines"])
+        self.assertIn(b"Record 1", registry["gapines"].search_retrieve(SearchClause("eg", "title", "=", "Harry Potter")))
+
+        # The failed queryer retries the explain request when it needs its configuration
+        with self.assertRaises(ExplainResponseContentTypeException):
+            registry["broken"].get_configuration()
+
+    def test_warm_up_retries_failed_servers(self):
+        registry = SRURegistry([
+            {"name": "gapines", "server_url": self.gapines_server.url},
+            {"name": "broken", "server_url": self.html_server.url}
+        ])
+        with open(TestFiles.explain_response_gapines, "rb") as f:
+            self.html_server.explain_response = f.read()
+
+        failures = registry.warm_up()
+
+        self.assertEqual(failures, {})
+        self.assertEqual(registry.failures, {})
+        self.assertEqual(registry.available, ["gapines", "broken"])
+        self.assertEqual(count_explain_requests(self.gapines_server), 1)
+
+    def test_without_warm_up_no_server_is_contacted(self):
+        registry = SRURegistry([{"name": "gapines", "server_url": self.gapines_server.url}], warm_up=False)
+
+        self.assertEqual(registry.available, [])
+        self.assertEqual(self.gapines_server.requests, [])
+        self.assertEqual(registry["gapines"].sru_configuration.default_context_set, "eg")
+
+    def test_shared_explain_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            servers = [{"name": "gapines", "server_url": self.gapines_server.url}, {"name": "alma", "server_url": self.alma_server.url}]
+            SRURegistry(servers, explain_cache=ExplainCache(directory))
+
+            registry = SRURegistry(servers, explain_cache=ExplainCache(directory))
+
+            self.assertEqual(registry.available, ["gapines", "alma"])
+            self.assertEqual(count_explain_requests(self.gapines_server), 1)
+            self.assertEqual(count_explain_requests(self.alma_server), 1)
+
+    def test_invalid_server_lists_raise_value_error(self):
+        for servers in [[{"server_url": self.gapines_server.url}], [{"name": "gapines", "server_url": self.gapines_server.url}, {"name": "gapines", "server_url": self.alma_server.url}]]:
+            with self.subTest(servers=servers):
+                with self.assertRaises(ValueError):
+                    SRURegistry(servers, warm_up=False)
+
+    def test_federated_search_uses_result_cache(self):
+        registry = SRURegistry([{"name": "gapines", "server_url": self.gapines_server.url, "result_cache": ResultCache()}])
+
+        for _ in range(2):
+            results = list(registry.federated_search(SearchClause("eg", "title", "=", "Harry Potter"), timeout=5))
+            self.assertTrue(results[0].ok)
+
+        self.assertEqual(len([request for request in self.gapines_server.requests if "searchRetrieve" in request]), 1)
+
+    def test_federated_search_keeps_queryer_timeouts(self):
+        self.gapines_server.delay = 0.5
+        registry = SRURegistry([{"name": "gapines", "server_url": self.gapines_server.url, "read_timeout": 0.1}])
+
+        results = list(registry.federated_search(SearchClause("eg", "title", "=", "Harry Potter"), timeout=5))
+
+        self.assertIsInstance(results[0].exception, requests.ReadTimeout)
+
+    def test_unknown_name_raises_key_error(self):
+        registry = SRURegistry([{"name": "gapines", "server_url": self.gapines_server.url}], warm_up=False)
+
+        self.assertNotIn("loc", registry)
+        with self.assertRaises(KeyError):
+            registry["loc"]
+
+
+class TestSRURegistryFederatedSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.gapines_server = StubSRUServer(TestFiles.explain_response_gapines).start()
+        self.other_gapines_server = StubSRUServer(TestFiles.explain_response_gapines).start()
+        self.alma_server = StubSRUServer(TestFiles.explain_response_alma).start()
+        self.other_gapines_server.search_retrieve_content = search_retrieve_response(3)
+        self.registry = SRURegistry([
+            {"name": "gapines", "server_url": self.gapines_server.url},
+            {"name": "other_gapines", "server_url": self.other_gapines_server.url},
+            {"name": "alma", "server_url": self.alma_server.url}
+        ])
+
+    def tearDown(self):
+        self.gapines_server.stop()
+        self.other_gapines_server.stop()
+        self.alma_server.stop()
+
+    def test_results_are_tagged_with_their_source(self):
+        results = list(self.registry.federated_search(SearchClause("eg", "title", "=", "Harry Potter"), names=["gapines", "other_gapines"]))
+
+        self.assertEqual(sorted(result.source for result in results), ["gapines", "other_gapines"])
+        results_by_source = {result.source: result for result in results}
+        self.assertTrue(results_by_source["gapines"].ok)
+        self.assertEqual(results_by_source["gapines"].index, 0)
+        self.assertIn(self.gapines_server.url, results_by_source["gapines"].url)
+        self.assertIn(b"<numberOfRecords>3</numberOfRecords>", results_by_source["other_gapines"].content)
+
+    def test_query_is_validated_against_each_server(self):
+        results = {result.source: result for result in self.registry.federated_search(SearchClause("eg", "title", "=", "Harry Potter"))}
+
+        self.assertTrue(results["gapines"].ok)
+        self.assertTrue(results["other_gapines"].ok)
+        # Alma doesn't have the 'eg' context set, so only its result fails, without a request being sent
+        self.assertIsInstance(results["alma"].exception, ValueError)
+        self.assertIsNone(results["alma"].url)
+        self.assertEqual([request for request in self.alma_server.requests if "searchRetrieve" in request], [])
+
+    def test_fast_servers_are_not_held_up_by_slow_ones(self):
+        self.gapines_server.delay = 0.5
+
+        start = time.perf_counter()
+        results = self.registry.federated_search(SearchClause("eg", "title", "=", "Harry Potter"), names=["gapines", "other_gapines"])
+        first_result = next(results)
+        first_result_time = time.perf_counter() - start
+        second_result = next(results)
+
+        self.assertEqual(first_result.source, "other_gapines")
+        self.assertLess(first_result_time, 0.4)
+        self.assertEqual(second_result.source, "gapines")
+        self.assertTrue(second_result.ok)
+
+    def test_servers_that_time_out_fail_their_result(self):
+        self.gapines_server.delay = 1
+
+        start = time.perf_counter()
+        results = {result.source: result for result in self.registry.federated_search(SearchClause("eg", "title", "=", "Harry Potter"), names=["gapines", "other_gapines"], timeout=0.3)}
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 0.8)
+        self.assertTrue(results["other_gapines"].ok)
+        self.assertIsInstance(results["gapines"].exception, DeadlineExceededException)
+        self.assertEqual(results["gapines"].exception.deadline, 0.3)
+        self.assertGreaterEqual(results["gapines"].exception.elapsed, 0.3)
+        self.assertIn("operation=searchRetrieve", results["gapines"].url)
+
+    def test_per_server_timeouts(self):
+        self.gapines_server.delay = 0.5
+        self.other_gapines_server.delay = 0.5
+
+        results = {result.source: result for result in self.registry.federated_search(SearchClause("eg", "title", "=", "Harry Potter"), names=["gapines", "other_gapines"], timeout={"gapines": 0.2})}
+
+        self.assertIsInstance(results["gapines"].exception, DeadlineExceededException)
+        self.assertTrue(results["other_gapines"].ok)
+
+    def test_federated_search_uses_result_cache(self):
+        registry = SRURegistry([{"name": "gapines", "server_url": self.gapines_server.url, "result_cache": ResultCache()}])
+
+        for _ in range(2):
+            results = list(registry.federated_search(SearchClause("eg", "title", "=", "Harry Potter"), timeout=5))
+            self.assertTrue(results[0].ok)
+
+        self.assertEqual(len([request for request in self.gapines_server.requests if "searchRetrieve" in request]), 1)
+
+    def test_federated_search_keeps_queryer_timeouts(self):
+        self.gapines_server.delay = 0.5
+        registry = SRURegistry([{"name": "gapines", "server_url": self.gapines_server.url, "read_timeout": 0.1}])
+
+        results = list(registry.federated_search(SearchClause("eg", "title", "=", "Harry Potter"), timeout=5))
+
+        self.assertIsInstance(results[0].exception, requests.ReadTimeout)
+
+    def test_unknown_name_raises_key_error(self):
+        with self.assertRaises(KeyError):
+            self.registry.federated_search(SearchClause("eg", "title", "=", "Harry Potter"), names=["gapines", "loc"])